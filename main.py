@@ -1,8 +1,38 @@
-from queue import Queue
-from queue import PriorityQueue
+import argparse
+import csv
+import importlib.util
+import json
+import math
 import random
 import os
+import time
 import pygame as pg
+from solver import ALGORITHMS
+from solver import ClusterAbstraction
+from solver import Grid
+from solver import Landmarks
+from solver import LPAStar
+from solver import PathCache
+from solver import Search
+from solver import SearchArrays
+from solver import Trace
+from solver import TracePlayer
+from solver import record_trace
+from solver import path_cost
+from solver.grid import CLOSED
+from solver.grid import END
+from solver.grid import IN_QUEUE
+from solver.grid import IN_PATH
+from solver.grid import START
+from solver.grid import STATES
+from solver.maps import load_template
+from solver.maps import make_random
+
+# WITH NUMPY THE IMAGE OF CELLS IS UPDATED THROUGH pygame.surfarray, WITHOUT IT THROUGH 8-BIT IMAGES WITH PALETTES:
+if importlib.util.find_spec('numpy') is not None:
+	import numpy as np
+else:
+	np = None
 
 os.environ['SDL_VIDEO_WINDOW_POS'] = "%d,%d" % (0, 30)
 pg.init()
@@ -34,15 +64,69 @@ GREEN_AQUA = (0, 255, 200)
 # Some constants:
 BACKGROUND_COLOR = GREY240
 FPS = 60
+# While nothing is going on, the main loop sleeps until an event comes, but wakes up at least this often (milliseconds):
+IDLE_TIMEOUT = 500
 LEFT_MARGIN = 16
 TOP_MARGIN = 16
-WIDTH = 944
+WIDTH = 1120
 HEIGHT = 768
 TITLE = "Pathfinding Visualizer"
 
+# Reset clears states of cells touched by the search one by one, but only while there are at most TOUCHED_CELLS_LIMIT
+# of them, then it clears the whole grid at once (so big searches don't keep a set of millions of cells):
+TOUCHED_CELLS_LIMIT = 1 << 16
+
+# Camera: all cells are kept in an image with one pixel per cell, which is scaled to the view (below one pixel per cell
+# it is downsampled, so every pixel shows the average color of the cells it covers). Cells smaller than LOD_NODE_SIZE
+# pixels are drawn without outlines:
+MIN_NODE_SIZE = 1 / 64
+MAX_NODE_SIZE = 64
+LOD_NODE_SIZE = 8
+ZOOM_FACTOR = 1.25
+
+# Reports of JPS, ALT, LPA* and HPA* compare them with A* run from scratch, which on big graphs takes much longer than
+# the compared search (LPA* and HPA* would run it after every edit). On graphs with more cells the comparison is off
+# until it's turned on (with the A key):
+REFERENCE_MAX_CELLS = 100 * 100
+
+# Stepping modes: (steps per frame, time budget per frame in milliseconds), None means no limit.
+# 'MAX' runs the search as fast as possible, but still paints a frame after every 1 / FPS of a second:
+SPEEDS = {
+	'x1': (1, None),
+	'x10': (10, None),
+	'x100': (100, None),
+	'8 MS': (None, 8),
+	'MAX': (None, 1000 / FPS)
+}
+
 window = pg.display.set_mode((WIDTH, HEIGHT))
 pg.display.set_caption(TITLE)
 
+fontsCache = {}
+textSurfacesCache = {}
+TEXT_SURFACES_CACHE_SIZE = 512
+
+
+def get_font(name, size):
+	"""
+	RETURNS A FONT FROM THE CACHE SHARED BY ALL WIDGETS (pg.font.SysFont LOOKUP IS EXPENSIVE)
+	"""
+	if (name, size) not in fontsCache:
+		fontsCache[name, size] = pg.font.SysFont(name, size)
+	return fontsCache[name, size]
+
+
+def render_text(text, font_name, char_size, color):
+	"""
+	RETURNS A SURFACE WITH THE RENDERED TEXT FROM THE CACHE SHARED BY ALL WIDGETS
+	"""
+	key = text, font_name, char_size, color
+	if key not in textSurfacesCache:
+		if len(textSurfacesCache) >= TEXT_SURFACES_CACHE_SIZE:
+			textSurfacesCache.clear()
+		textSurfacesCache[key] = get_font(font_name, char_size).render(text, 1, color)
+	return textSurfacesCache[key]
+
 
 class Button:
 	def __init__(
@@ -69,6 +153,10 @@ class Button:
 		self.lightOutlineColor = WHITE
 		self.darkOutlineColor = BLACK
 
+		# pre-baked surfaces for every look of the button ('IDLE', 'HOVER', 'PRESSED'):
+		self.surfaces = {}
+		self.renderedLook = None
+
 	def update(self, mouse_pos):
 		"""
 		CALL THE FUNCTION EVERY FRAME, BEFORE:
@@ -105,43 +193,75 @@ class Button:
 		"""
 		return self.text
 
-	def render(self):
+	def get_rect(self):
+		"""
+		RETURNS THE SCREEN RECTANGLE COVERED BY THE BUTTON
+		"""
+		return pg.Rect(self.xPos, self.yPos, self.width, self.height)
+
+	def set_text(self, text):
+		"""
+		CHANGES THE TEXT OF THE BUTTON
+		"""
+		if self.text != text:
+			self.text = text
+			self.surfaces = {}
+			self.renderedLook = None
+
+	def get_look(self):
 		"""
-		CALL THE FUNCTION AT THE END OF EVERY FRAME
+		RETURNS 'PRESSED', 'HOVER' OR 'IDLE'
 		"""
+		if self.pressed:
+			return 'PRESSED'
+		if self.over:
+			return 'HOVER'
+		return 'IDLE'
+
+	def bake(self, look):
+		"""
+		RETURNS A SURFACE WITH THE BUTTON DRAWN IN THE GIVEN LOOK
+		"""
+		surface = pg.Surface((self.width, self.height))
 
 		# DRAWING TOP-LEFT OUTLINE AS A RECTANGLE WHICH WILL BE ALMOST COMPLETELY COVERED:
-		pg.draw.rect(window, self.lightOutlineColor, (self.xPos, self.yPos, self.width, self.height))
+		surface.fill(self.lightOutlineColor)
 
 		# DRAWING BOTTOM-RIGHT OUTLINE AS RECTANGLE WHICH COVERS THE PREVIOUS ONE:
 		t = self.outlineThickness
-		pg.draw.rect(window, self.darkOutlineColor, (self.xPos + t, self.yPos + t, self.width - t, self.height - t))
+		pg.draw.rect(surface, self.darkOutlineColor, (t, t, self.width - t, self.height - t))
 
 		# DRAWING CENTER OF THE CHECK-BOX:
-		if self.pressed:
-			pg.draw.rect(
-				window, self.pressedColor, (self.xPos + t, self.yPos + t, self.width - 2 * t, self.height - 2 * t)
-			)
-		elif self.over:
-			pg.draw.rect(
-				window, self.hoverColor, (self.xPos + t, self.yPos + t, self.width - 2 * t, self.height - 2 * t)
-			)
+		if look == 'PRESSED':
+			pg.draw.rect(surface, self.pressedColor, (t, t, self.width - 2 * t, self.height - 2 * t))
+		elif look == 'HOVER':
+			pg.draw.rect(surface, self.hoverColor, (t, t, self.width - 2 * t, self.height - 2 * t))
 		else:
-			pg.draw.rect(
-				window, self.idleColor, (self.xPos + t, self.yPos + t, self.width - 2 * t, self.height - 2 * t)
-			)
+			pg.draw.rect(surface, self.idleColor, (t, t, self.width - 2 * t, self.height - 2 * t))
 
 		# DRAWING TEXT:
 		if self.text != '':
-			font = pg.font.SysFont(self.font, self.charSize)
-			text = font.render(self.text, 1, self.textColor)
-			window.blit(
-				text,
-				(
-					(self.xPos + (self.width - text.get_width()) // 2),
-					(self.yPos + (self.height - text.get_height()) // 2)
-				)
-			)
+			text = render_text(self.text, self.font, self.charSize, self.textColor)
+			surface.blit(text, ((self.width - text.get_width()) // 2, (self.height - text.get_height()) // 2))
+
+		return surface
+
+	def render(self, force=False):
+		"""
+		CALL THE FUNCTION AT THE END OF EVERY FRAME.
+		THE BUTTON IS BLITTED ONLY IF ITS LOOK HAS CHANGED SINCE THE LAST CALL (OR IF force IS TRUE).
+		RETURNS TRUE IF THE BUTTON HAS BEEN BLITTED
+		"""
+
+		look = self.get_look()
+		if not force and look == self.renderedLook:
+			return False
+
+		if look not in self.surfaces:
+			self.surfaces[look] = self.bake(look)
+		window.blit(self.surfaces[look], (self.xPos, self.yPos))
+		self.renderedLook = look
+		return True
 
 
 class ChoiceBox:
@@ -161,11 +281,15 @@ class ChoiceBox:
 		self.currentOption = default_option
 		self.title = title
 		self.textColor = text_color
-		self.font = pg.font.SysFont(font, self.optionWidth)
+		self.fontName = font
 		self.backgroundOutlineThickness = 1
 		self.boxOutlineThickness = 1
 		self.stateHasChanged = False
 
+		# pre-baked surfaces for every selected option:
+		self.surfaces = {}
+		self.renderedOption = None
+
 	def update(self, mouse_pos):
 		"""
 		CALL THE FUNCTION EVERY FRAME, BEFORE:
@@ -217,85 +341,77 @@ class ChoiceBox:
 		"""
 		return self.stateHasChanged
 
-	def render(self):
+	def get_rect(self):
 		"""
-		CALL THE FUNCTION AT THE END OF EVERY FRAME
+		RETURNS THE SCREEN RECTANGLE COVERED BY THE CHOICE BOX
 		"""
+		return pg.Rect(
+			self.xPos,
+			self.yPos,
+			self.backgroundWidth,
+			(2 + len(self.options)) * self.spaceBetweenOptions + (1 + len(self.options)) * self.optionWidth
+		)
+
+	def bake(self, current_option):
+		"""
+		RETURNS A SURFACE WITH THE CHOICE BOX DRAWN WITH THE GIVEN OPTION SELECTED
+		"""
+		rect = self.get_rect()
+		surface = pg.Surface(rect.size)
 
 		# DRAWING TITLE AND BACKGROUND:
-		text = self.font.render(self.title, 1, self.textColor)
+		text = render_text(self.title, self.fontName, self.optionWidth, self.textColor)
 		t = self.backgroundOutlineThickness
-		pg.draw.rect(
-			window, self.backgroundOutlineColor,
-			(
-				self.xPos,
-				self.yPos,
-				self.backgroundWidth,
-				(2 + len(self.options)) * self.spaceBetweenOptions + (1 + len(self.options)) * self.optionWidth
-			)
-		)
-		pg.draw.rect(
-			window, self.backgroundColor,
-			(
-				self.xPos + t,
-				self.yPos + t,
-				self.backgroundWidth - 2 * t,
-				(2 + len(self.options)) * self.spaceBetweenOptions + (1 + len(self.options)) * self.optionWidth - 2 * t
-			)
-		)
-		window.blit(text, (self.xPos + self.spaceBetweenOptions, self.yPos + self.spaceBetweenOptions - 2))
+		surface.fill(self.backgroundOutlineColor)
+		pg.draw.rect(surface, self.backgroundColor, (t, t, rect.width - 2 * t, rect.height - 2 * t))
+		surface.blit(text, (self.spaceBetweenOptions, self.spaceBetweenOptions - 2))
 
 		# DRAWING OPTIONS:
 		for i in range(len(self.options)):
+			y = self.spaceBetweenOptions * (2 + i) + self.optionWidth * (1 + i)
+
 			# DRAWING TOP-LEFT OUTLINE AS A RECTANGLE WHICH WILL BE ALMOST COMPLETELY COVERED:
-			pg.draw.rect(
-				window, GREY64,
-				(
-					self.xPos + self.spaceBetweenOptions,
-					self.yPos + self.spaceBetweenOptions * (2 + i) + self.optionWidth * (1 + i),
-					self.optionWidth,
-					self.optionWidth
-				)
-			)
+			pg.draw.rect(surface, GREY64, (self.spaceBetweenOptions, y, self.optionWidth, self.optionWidth))
 
 			# DRAWING BOTTOM-RIGHT OUTLINE AS RECTANGLE WHICH COVERS THE PREVIOUS ONE:
 			t = self.boxOutlineThickness
 			pg.draw.rect(
-				window, GREY192,
-				(
-					self.xPos + self.spaceBetweenOptions + t,
-					self.yPos + self.spaceBetweenOptions * (2 + i) + self.optionWidth * (1 + i) + t,
-					self.optionWidth - t,
-					self.optionWidth - t
-				)
+				surface, GREY192, (self.spaceBetweenOptions + t, y + t, self.optionWidth - t, self.optionWidth - t)
 			)
 
 			# DRAWING CENTER OF THE CHECK BOX (COLOR DEPENDS ON STATE)
-			color = GREY128 if self.options[i] == self.currentOption else WHITE
+			color = GREY128 if self.options[i] == current_option else WHITE
 			pg.draw.rect(
-				window, color,
-				(
-					self.xPos + self.spaceBetweenOptions + t,
-					self.yPos + self.spaceBetweenOptions * (2 + i) + self.optionWidth * (1 + i) + t,
-					self.optionWidth - 2 * t,
-					self.optionWidth - 2 * t
-				)
+				surface, color, (self.spaceBetweenOptions + t, y + t, self.optionWidth - 2 * t, self.optionWidth - 2 * t)
 			)
 
 			# DRAWING TEXT:
-			text = self.font.render(self.options[i], 1, self.textColor)
-			window.blit(
-				text,
-				(
-					self.xPos + self.optionWidth + 2 * self.spaceBetweenOptions,
-					self.yPos + self.spaceBetweenOptions * (2 + i) + self.optionWidth * (1 + i) - 2
-				)
-			)
+			text = render_text(self.options[i], self.fontName, self.optionWidth, self.textColor)
+			surface.blit(text, (self.optionWidth + 2 * self.spaceBetweenOptions, y - 2))
+
+		return surface
+
+	def render(self, force=False):
+		"""
+		CALL THE FUNCTION AT THE END OF EVERY FRAME.
+		THE CHOICE BOX IS BLITTED ONLY IF THE SELECTED OPTION HAS CHANGED SINCE THE LAST CALL (OR IF force IS TRUE).
+		RETURNS TRUE IF THE CHOICE BOX HAS BEEN BLITTED
+		"""
+
+		if not force and self.currentOption == self.renderedOption:
+			return False
+
+		if self.currentOption not in self.surfaces:
+			self.surfaces[self.currentOption] = self.bake(self.currentOption)
+		window.blit(self.surfaces[self.currentOption], (self.xPos, self.yPos))
+		self.renderedOption = self.currentOption
+		return True
 
 
 class Node:
 	"""
-	THE NODE CLASS IS ADAPTED TO UDE IN GRAPHS IN THE FORM OF A RECTANGULAR GRID, WHERE EACH VERTEX HAS 4 NEIGHBORS
+	A THIN VIEW OF A SINGLE NODE OF THE GRAPH. IT DOESN'T STORE ANYTHING BUT ITS POSITION,
+	ALL WEIGHTS AND STATES ARE KEPT IN THE GRAPH'S solver.Grid.
 	"""
 
 	statesColors = {
@@ -307,23 +423,12 @@ class Node:
 		'IN_PATH': YELLOW
 	}
 
-	def __init__(self, x_pos, y_pos, col, row, size, outline_color, outline_thickness, min_weight, max_weight, weight):
-		self.xPos = x_pos
-		self.yPos = y_pos
+	__slots__ = ('graph', 'col', 'row')
+
+	def __init__(self, graph, col, row):
+		self.graph = graph
 		self.col = col
 		self.row = row
-		self.size = size
-		self.outlineColor = outline_color
-		self.outlineThickness = outline_thickness
-		self.neighbors = list()
-		self.visited = False
-		self.state = None
-		self.minWeight = min_weight
-		self.maxWeight = max_weight
-		self.__weight = weight
-		info = "ERROR: class Node: __init__ function: following condition isn't met: min_weight <= weight <= max_weight"
-		info += " (" + str(min_weight) + " <= " + str(weight) + " <= " + str(max_weight) + ")"
-		assert min_weight <= weight <= max_weight, info
 
 	# Accessors:
 	def get_coordinates(self):
@@ -334,403 +439,498 @@ class Node:
 
 	def get_neighbors(self):
 		"""
-		RETURNS ALL NEIGHBORS OF THE NODE
-		"""
-		return self.neighbors
-
-	def has_been_visited(self):
-		"""
-		IF THE NODE IS MARKED AS VISITED RETURNS TRUE, OTHERWISE FALSE
+		RETURNS ALL NEIGHBORS OF THE NODE WHICH ARE NOT BARRIERS
 		"""
-		return self.visited
+		grid = self.graph.grid
+		return [self.graph.get_node(*grid.get_position(cell)) for cell in grid.get_neighbors(grid.get_id(self.col, self.row))]
 
 	def get_state(self):
 		"""
 		RETURNS CURRENT NODE STATE AS A STRING, BUT IF THE NODE HASN'T GOT ANY STATE, FUNCTION RETURNS PYTHONIC None
 		"""
-		return self.state
+		return self.graph.grid.get_state(self.col, self.row)
 
 	def get_weight(self):
 		"""
 		RETURNS THE NODE WEIGHT, WHICH IS A NUMBER IN RANGE 1-255
 		"""
-		return self.__weight
+		return self.graph.grid.get_weight(self.col, self.row)
 
 	# Mutators:
-	def set_visited(self, visited):
-		"""
-		MARKS THE NODE AS VISITED OR UNVISITED, TAKES AS THE ARGUMENT PYTHONIC True OR False
-		"""
-		self.visited = visited
-
 	def change_state(self, state):
 		"""
 		TAKES AS THE ARGUMENT STRING OR PYTHONIC None
 		"""
-		self.state = state
+		self.graph.grid.set_state(self.col, self.row, state)
 
 	def set_weight(self, weight):
 		"""
 		TAKES AS THE ARGUMENT WEIGHT, WHICH IS A NUMBER IN RANGE 1-255
 		"""
+		self.graph.grid.set_weight(self.col, self.row, weight)
 
-		info = "ERROR: class Node: __init__ function: following condition isn't met: min_weight <= weight <= max_weight"
-		info += " (" + str(self.minWeight) + " <= " + str(weight) + " <= " + str(self.maxWeight) + ")"
-		assert self.minWeight <= weight <= self.maxWeight, info
-		self.__weight = weight
 
-	# Others:
-	def update_neighbors(self, graph):
-		"""
-		CALL THE FUNCTION AFTER ALL CHANGES OF ANY NODES OF THE GRAPH IN A FRAME
-		"""
-		self.neighbors = []
-
-		# UP:
-		if self.row > 0 and not graph.get_node(self.col, self.row - 1).get_weight() == self.maxWeight:
-			self.neighbors.append(graph.get_node(self.col, self.row - 1))
+class Graph:
+	"""
+	THE GRAPH IS SHOWN THROUGH A CAMERA: A VIEW OF view_width x view_height PIXELS (BY DEFAULT AS BIG AS ALL NODES
+	OF node_size PIXELS) AT (x_pos, y_pos), WHICH SHOWS THE NODES FROM COLUMN cameraCol AND ROW cameraRow ON,
+	EACH nodeSize PIXELS BIG. ONLY NODES INTERSECTING THE VIEW ARE RENDERED.
+	IF grid (A solver.Grid, E.G. A BIG MAP LOADED FROM A FILE) IS GIVEN, IT IS SHOWN INSTEAD OF A NEW GRID
+	AND ITS SIZE AND WEIGHT RANGE ARE USED.
+	"""
 
-		# LEFT:
-		if self.col > 0 and not graph.get_node(self.col - 1, self.row).get_weight() == self.maxWeight:
-			self.neighbors.append(graph.get_node(self.col - 1, self.row))
+	def __init__(
+			self, x_pos, y_pos, columns_count, rows_count,
+			node_size, node_outline_color, node_outline_thickness,
+			min_nodes_weight, max_node_weight, default_nodes_weights, view_width=None, view_height=None, grid=None
+	):
+		if grid is not None:
+			columns_count, rows_count = grid.columnsCount, grid.rowsCount
+			min_nodes_weight, max_node_weight = grid.minWeight, grid.maxWeight
+		self.xPos = x_pos
+		self.yPos = y_pos
+		self.columnsCount = columns_count
+		self.rowsCount = rows_count
+		self.nodeOutlineColor = node_outline_color
+		self.nodeOutlineThickness = node_outline_thickness
+		self.minNodeWeight = min_nodes_weight
+		self.maxNodeWeight = max_node_weight
 
-		# DOWN:
-		if self.row < graph.rowsCount - 1 and not graph.get_node(self.col, self.row + 1).get_weight() == self.maxWeight:
-			self.neighbors.append(graph.get_node(self.col, self.row + 1))
+		# camera (the view is at most as big as needed to show all nodes of node_size pixels):
+		self.viewWidth = view_width if view_width is not None else columns_count * node_size
+		self.viewHeight = view_height if view_height is not None else rows_count * node_size
+		t = node_outline_thickness
+		self.viewRect = pg.Rect(x_pos, y_pos, self.viewWidth + t, self.viewHeight + t)
+		self.nodeSize = min(node_size, self.get_fitting_node_size())
+		self.cameraCol = 0
+		self.cameraRow = 0
+
+		# all weights and states are kept in a compact grid (a new one starts with the start template):
+		new_grid = grid is None
+		if new_grid:
+			grid = Grid(columns_count, rows_count, min_nodes_weight, max_node_weight, default_nodes_weights)
+		self.grid = grid
+
+		# results of reference A* runs (compared with JPS, ALT, LPA* and HPA*), dropped by any weight change:
+		self.pathCache = PathCache(self.grid)
+
+		# arrays reused by all searches of the graph, so starting a new search doesn't allocate or clear anything
+		# of the size of the grid (they only start a new generation):
+		self.searchArrays = SearchArrays(self.grid.get_cells_count())
+
+		if self.startPos is None or self.endPos is None:
+			# making random start position:
+			x1_temp = random.randint(0, columns_count - 1)
+			y1_temp = random.randint(0, rows_count - 1)
+			self.grid.set_state(x1_temp, y1_temp, 'START')
+
+			# making random end position:
+			x2_temp = random.randint(0, columns_count - 1)
+			y2_temp = random.randint(0, rows_count - 1)
+			while x1_temp == x2_temp and y1_temp == y2_temp:
+				x2_temp = random.randint(0, columns_count - 1)
+				y2_temp = random.randint(0, rows_count - 1)
+			self.grid.set_state(x2_temp, y2_temp, 'END')
 
-		# RIGHT:
-		if self.col < graph.columnsCount - 1 and not graph.get_node(self.col + 1, self.row).get_weight() == self.maxWeight:
-			self.neighbors.append(graph.get_node(self.col + 1, self.row))
+		self.algorithm = 'BFS'
+		self.search = None
+		self.searchReport = None
+		self.relinkedCount = 0
+
+		# search counters (queued nodes are counted by their states, re-pushes are pushes of already queued or closed nodes):
+		self.queueSize = 0
+		self.repushesCount = 0
+		self.pathCost = None
+
+		# planner kept between searches and updated after edits (LPA* g/rhs values, the HPA* cluster abstraction
+		# or the ALT landmarks), so work done by earlier searches isn't repeated:
+		self.planner = None
+		self.showClusters = True
+
+		# reports compare the search with A* run from scratch (only on small graphs, unless it's turned on):
+		self.compareWithAStar = self.grid.get_cells_count() <= REFERENCE_MAX_CELLS
+
+		# solve-then-replay mode:
+		self.replay = False
+		self.replayBackwards = False
+		self.trace = None
+		self.player = None
+
+		# cells which have changed since the last render call and cells which have got states from the search
+		# (or the replay) since the last reset, the only ones which reset has to clear (None if there are more
+		# than TOUCHED_CELLS_LIMIT of them, then all cells are cleared and repainted):
+		self.dirtyCells = set()
+		self.touchedCells = set()
+		self.fullRepaint = True
+		self.renderedDone = False
+
+		# edits ask for a reset, which is done at most once per frame:
+		self.resetScheduled = False
+
+		# image with one pixel per cell (None until the first render), the palette of weights and the table of colors
+		# of the image (mapped colors of weights followed by colors of states):
+		self.cellsImage = None
+		self.weightsPalette = [self.get_weight_color(weight) for weight in range(256)]
+		self.colorsTable = None
+
+		# the whole view has to be drawn again (after the camera has moved or the window has been exposed):
+		self.viewOutdated = False
+
+		# outlines of visible cells, drawn once per position of the camera:
+		self.outlinesImage = None
+		self.outlinesCamera = None
+
+		if new_grid:
+			self.load_from_file('Graph templates/start.txt')
 
-	def render_with_state(self):
+	# "PRIVATE" METHODS (ARE USED ONLY BY OTHER METHODS OF THIS CLASS):
+	def set_cell_state(self, cell, state):
+		previous_state = self.grid.states[cell]
+		if state == IN_QUEUE:
+			if previous_state == IN_QUEUE or previous_state == CLOSED:
+				self.repushesCount += 1
+			if previous_state != IN_QUEUE:
+				self.queueSize += 1
+		elif previous_state == IN_QUEUE:
+			self.queueSize -= 1
+		self.grid.states[cell] = state
+		self.touch_cell(cell)
+
+	def touch_cell(self, cell):
+		self.dirtyCells.add(cell)
+		touched_cells = self.touchedCells
+		if touched_cells is not None:
+			touched_cells.add(cell)
+			if len(touched_cells) > TOUCHED_CELLS_LIMIT:
+				self.touchedCells = None
+
+	def mark_dirty(self, column, row):
+		self.dirtyCells.add(self.grid.get_id(column, row))
+
+	def get_screen_x(self, col):
 		"""
-		RENDER THE NODE IN A COLOR DEPENDING ON ITS STATE
-		IF THE NODE HAS NO STATE, IT IS RENDERED AS IN THE FUNCTION render_without_state
+		RETURNS THE SCREEN X OF THE LEFT EDGE OF THE COLUMN (SEEN THROUGH THE CAMERA)
 		"""
+		return self.xPos + math.floor((col - self.cameraCol) * self.nodeSize)
 
-		if self.outlineThickness > 0:
-			pg.draw.rect(
-				window, self.outlineColor,
-				(
-					self.xPos,
-					self.yPos,
-					self.size + self.outlineThickness,
-					self.size + self.outlineThickness
-				)
-			)
-
-		if self.state is None:
-			color_component = int(255 * (1 - (self.__weight - self.minWeight) / (self.maxWeight - self.minWeight)))
-			pg.draw.rect(
-				window, (color_component, color_component, color_component),
-				(
-					self.xPos + self.outlineThickness,
-					self.yPos + self.outlineThickness,
-					self.size - self.outlineThickness,
-					self.size - self.outlineThickness
-				)
-			)
-		else:
-			pg.draw.rect(
-				window, Node.statesColors[self.state],
-				(
-					self.xPos + self.outlineThickness,
-					self.yPos + self.outlineThickness,
-					self.size - self.outlineThickness,
-					self.size - self.outlineThickness
-				)
-			)
-
-	def render_without_state(self):
+	def get_screen_y(self, row):
 		"""
-		RENDER THE NODE IN BLACK-AND-WHITE COLORS WITH A SHADE DEPENDING ON ITS WEIGHT
-		THE GREATER THE WEIGHT, THE DARKER COLOR
+		RETURNS THE SCREEN Y OF THE TOP EDGE OF THE ROW (SEEN THROUGH THE CAMERA)
 		"""
+		return self.yPos + math.floor((row - self.cameraRow) * self.nodeSize)
 
-		if self.outlineThickness > 0:
-			pg.draw.rect(
-				window, self.outlineColor,
-				(
-					self.xPos,
-					self.yPos,
-					self.size + self.outlineThickness,
-					self.size + self.outlineThickness
-				)
-			)
+	def get_visible_range(self):
+		"""
+		RETURNS (FIRST COLUMN, FIRST ROW, LAST COLUMN + 1, LAST ROW + 1) OF THE CELLS WHICH INTERSECT THE VIEW
+		"""
+		return (
+			max(0, math.floor(self.cameraCol)),
+			max(0, math.floor(self.cameraRow)),
+			min(self.columnsCount, math.ceil(self.cameraCol + self.viewWidth / self.nodeSize)),
+			min(self.rowsCount, math.ceil(self.cameraRow + self.viewHeight / self.nodeSize))
+		)
 
-		color_component = int(255 * (1 - (self.__weight - self.minWeight) / (self.maxWeight - self.minWeight)))
-		pg.draw.rect(
-			window, (color_component, color_component, color_component),
-			(
-				self.xPos + self.outlineThickness,
-				self.yPos + self.outlineThickness,
-				self.size - self.outlineThickness,
-				self.size - self.outlineThickness
-			)
+	def is_any_visible(self, cells):
+		"""
+		RETURNS TRUE IF ANY OF THE CELLS INTERSECTS THE VIEW
+		"""
+		first_col, first_row, end_col, end_row = self.get_visible_range()
+		columns_count = self.columnsCount
+		return any(
+			first_col <= cell % columns_count < end_col and first_row <= cell // columns_count < end_row for cell in cells
 		)
 
+	def get_fitting_node_size(self):
+		"""
+		RETURNS THE NODE SIZE AT WHICH THE WHOLE GRAPH FITS INTO THE VIEW
+		"""
+		return min(self.viewWidth / self.columnsCount, self.viewHeight / self.rowsCount)
 
-class BfsComponent:
-	def __init__(self, columns_count, rows_count):
-		self.queue = Queue(maxsize=rows_count * columns_count)
+	def is_lod_used(self):
+		"""
+		RETURNS TRUE IF CELLS ARE TOO SMALL TO BE DRAWN WITH OUTLINES
+		"""
+		return self.nodeSize < LOD_NODE_SIZE
 
+	def get_weight_color(self, weight):
+		weight = min(max(weight, self.minNodeWeight), self.maxNodeWeight)
+		color_component = int(255 * (1 - (weight - self.minNodeWeight) / (self.maxNodeWeight - self.minNodeWeight)))
+		return color_component, color_component, color_component
 
-class DfsComponent:
-	def __init__(self):
-		self.stack = list()
+	def get_cell_color(self, cell, with_state):
+		state = STATES[self.grid.states[cell]]
+		if with_state and state is not None:
+			return Node.statesColors[state]
+		return self.weightsPalette[self.grid.weights[cell]]
 
+	def get_shown_states(self, done):
+		"""
+		RETURNS STATES SHOWN IN COLORS OF STATES (AFTER THE SEARCH IS DONE ONLY START, END AND THE PATH KEEP THEM)
+		"""
+		return (START, END, IN_PATH) if done else range(1, len(STATES))
 
-class DijkstraComponent:
-	def __init__(self, rows_count, columns_count):
-		self.distances = {}
-		for y in range(rows_count):
-			for x in range(columns_count):
-				self.distances[x, y] = float('inf')
-		self.priorityQueue = PriorityQueue()
+	def build_cells_image(self, done):
+		"""
+		DRAWS ALL CELLS INTO THE IMAGE WITH ONE PIXEL PER CELL
+		"""
+		if np is not None:
+			self.update_cells_pixels(slice(None), done)
+			return
 
+		# WITHOUT NUMPY THE WEIGHTS AND THE STATES ARE TURNED INTO 8-BIT IMAGES WITH PALETTES
+		# AND THE STATES ARE BLITTED OVER THE WEIGHTS:
+		size = self.columnsCount, self.rowsCount
+		weights_image = pg.image.frombuffer(bytes(self.grid.weights), size, 'P')
+		weights_image.set_palette(self.weightsPalette)
 
-class AStarComponent:
-	def __init__(self):
-		self.count = None
-		self.openSet = PriorityQueue()
-		self.gScore = None
-		self.fScore = None
-		self.openSetHash = None
+		shown_states = self.get_shown_states(done)
+		states_table = bytes(state if state in shown_states else 0 for state in range(256))
+		states_image = pg.image.frombuffer(bytes(self.grid.states).translate(states_table), size, 'P')
+		states_image.set_palette([Node.statesColors.get(state, BLACK) for state in STATES] + [BLACK] * (256 - len(STATES)))
+		states_image.set_colorkey(0)
 
+		self.cellsImage.blit(weights_image, (0, 0))
+		self.cellsImage.blit(states_image, (0, 0))
 
-class AlgoComponents:
-	def __init__(self, columns_count, rows_count):
-		self.fathersPos = list()
-		for i in range(columns_count):
-			temp = list()
-			for j in range(rows_count):
-				temp.append(None)
-			self.fathersPos.append(temp)
-		self.bfs = BfsComponent(columns_count, rows_count)
-		self.dfs = DfsComponent()
-		self.dijkstra = DijkstraComponent(columns_count, rows_count)
-		self.aStar = AStarComponent()
+	def update_cells_pixels(self, cells, done):
+		"""
+		LOOKS UP COLORS OF THE CELLS (A NUMPY ARRAY OF CELL IDS OR slice(None) FOR ALL CELLS) IN THE TABLE OF COLORS
+		AND WRITES THEM TO THE PIXELS OF THE IMAGE AT ONCE, WITHOUT A PYTHON LOOP OVER CELLS
+		"""
+		weights = np.frombuffer(self.grid.weights, np.uint8)[cells]
+		states = np.frombuffer(self.grid.states, np.uint8)[cells]
+		shown = np.zeros(256, bool)
+		shown[list(self.get_shown_states(done))] = True
+		colors = self.colorsTable[np.where(shown[states], states.astype(np.uint16) + 256, weights)]
+
+		# SURFARRAYS ARE INDEXED BY (X, Y), SO THE ROWS OF THE GRID ARE TRANSPOSED:
+		pixels = pg.surfarray.pixels2d(self.cellsImage)
+		if isinstance(cells, slice):
+			pixels[...] = colors.reshape(self.rowsCount, self.columnsCount).T
+		else:
+			pixels[cells % self.columnsCount, cells // self.columnsCount] = colors
+		del pixels
 
+	def update_cells_image(self, done):
+		"""
+		COPIES CHANGES OF CELLS TO THE IMAGE WITH ONE PIXEL PER CELL (ALL CELLS AFTER A FULL REPAINT, OTHERWISE ONLY
+		THE DIRTY ONES) AND RETURNS TRUE IF ANY PIXEL MAY HAVE CHANGED
+		"""
+		if self.cellsImage is None:
+			self.cellsImage = pg.Surface((self.columnsCount, self.rowsCount), 0, 32)
+			colors = self.weightsPalette + [Node.statesColors.get(state, BLACK) for state in STATES]
+			if np is not None:
+				self.colorsTable = np.array([self.cellsImage.map_rgb(color) for color in colors], np.uint32)
+			self.fullRepaint = True
+
+		if self.fullRepaint:
+			self.build_cells_image(done)
+		elif not self.dirtyCells:
+			return False
+		elif np is not None:
+			self.update_cells_pixels(np.fromiter(self.dirtyCells, np.intp, len(self.dirtyCells)), done)
+		elif len(self.dirtyCells) * 64 > self.grid.get_cells_count():
+			self.build_cells_image(done)
+		else:
+			shown_states = self.get_shown_states(done)
+			states = self.grid.states
+			for cell in self.dirtyCells:
+				self.cellsImage.set_at(self.grid.get_position(cell), self.get_cell_color(cell, states[cell] in shown_states))
+		return True
 
-class Graph:
-	def __init__(
-			self, x_pos, y_pos, columns_count, rows_count,
-			node_size, node_outline_color, node_outline_thickness,
-			min_nodes_weight, max_node_weight, default_nodes_weights
-	):
-		self.xPos = x_pos
-		self.yPos = y_pos
-		self.columnsCount = columns_count
-		self.rowsCount = rows_count
-		self.minNodeWeight = min_nodes_weight
-		self.maxNodeWeight = max_node_weight
+	def get_outlines_image(self):
+		"""
+		RETURNS THE IMAGE OF OUTLINES OF VISIBLE CELLS (AS BIG AS THE VIEW, TRANSPARENT BETWEEN OUTLINES).
+		IT IS DRAWN AGAIN ONLY AFTER THE CAMERA HAS MOVED.
+		"""
+		camera = self.nodeSize, self.cameraCol, self.cameraRow
+		if self.outlinesImage is not None and self.outlinesCamera == camera:
+			return self.outlinesImage
+
+		t = self.nodeOutlineThickness
+		transparent_color = tuple(255 - component for component in self.nodeOutlineColor)
+		self.outlinesImage = pg.Surface(self.viewRect.size)
+		self.outlinesImage.fill(transparent_color)
+		self.outlinesImage.set_colorkey(transparent_color)
+		self.outlinesCamera = camera
+
+		first_col, first_row, end_col, end_row = self.get_visible_range()
+		left, top = self.get_screen_x(first_col) - self.xPos, self.get_screen_y(first_row) - self.yPos
+		right, bottom = self.get_screen_x(end_col) - self.xPos, self.get_screen_y(end_row) - self.yPos
+		for col in range(first_col, end_col + 1):
+			x = self.get_screen_x(col) - self.xPos
+			pg.draw.rect(self.outlinesImage, self.nodeOutlineColor, (x, top, t, bottom - top + t))
+		for row in range(first_row, end_row + 1):
+			y = self.get_screen_y(row) - self.yPos
+			pg.draw.rect(self.outlinesImage, self.nodeOutlineColor, (left, y, right - left + t, t))
+		return self.outlinesImage
+
+	def render_cells_image(self):
+		"""
+		DRAWS THE VISIBLE PART OF THE IMAGE OF CELLS SCALED TO THE CURRENT NODE SIZE
+		(DOWNSAMPLED WITH AVERAGING WHEN CELLS ARE SMALLER THAN A PIXEL)
+		"""
+		first_col, first_row, end_col, end_row = self.get_visible_range()
+		x, y = self.get_screen_x(first_col), self.get_screen_y(first_row)
+		size = self.get_screen_x(end_col) - x, self.get_screen_y(end_row) - y
+		if size[0] <= 0 or size[1] <= 0:
+			return
+		visible_part = self.cellsImage.subsurface((first_col, first_row, end_col - first_col, end_row - first_row))
+		if self.nodeSize < 1:
+			window.blit(pg.transform.smoothscale(visible_part, size), (x, y))
+		else:
+			window.blit(pg.transform.scale(visible_part, size), (x, y))
 
-		# constructing nodes:
-		self.nodes = list()
-		for x in range(int(columns_count)):
-			temp = []
-			for y in range(int(rows_count)):
-				temp.append(
-					Node(
-						x_pos + x * node_size, y_pos + y * node_size, x, y,
-						node_size, node_outline_color, node_outline_thickness,
-						min_nodes_weight, max_node_weight, default_nodes_weights
-					)
-				)
-			self.nodes.append(temp)
-
-		# making random start position:
-		x1_temp = random.randint(0, columns_count - 1)
-		y1_temp = random.randint(0, rows_count - 1)
-		self.startPos = x1_temp, y1_temp
-		self.nodes[x1_temp][y1_temp].change_state('START')
-
-		# making random end position:
-		x2_temp = random.randint(0, columns_count - 1)
-		y2_temp = random.randint(0, rows_count - 1)
-		while x1_temp == x2_temp and y1_temp == y2_temp:
-			x2_temp = random.randint(0, columns_count - 1)
-			y2_temp = random.randint(0, rows_count - 1)
-		self.endPos = x2_temp, y2_temp
-		self.nodes[x2_temp][y2_temp].change_state('END')
+	def render_clusters_overlay(self):
+		"""
+		DRAWS BORDERS OF HPA* CLUSTERS AND THE LAST ABSTRACT PATH (THROUGH THE CENTERS OF ITS NODES)
+		"""
+		cluster_size = self.planner.clusterSize
+		first_col, first_row, end_col, end_row = self.get_visible_range()
+		top, bottom = self.get_screen_y(first_row), self.get_screen_y(end_row)
+		left, right = self.get_screen_x(first_col), self.get_screen_x(end_col)
+		for col in range((first_col // cluster_size + 1) * cluster_size, end_col, cluster_size):
+			x = self.get_screen_x(col)
+			pg.draw.line(window, DARK_BLUE, (x, top), (x, bottom - 1), 2)
+		for row in range((first_row // cluster_size + 1) * cluster_size, end_row, cluster_size):
+			y = self.get_screen_y(row)
+			pg.draw.line(window, DARK_BLUE, (left, y), (right - 1, y), 2)
+
+		abstract_path = self.planner.get_abstract_path()
+		if abstract_path is not None and len(abstract_path) > 1:
+			points = []
+			for cell in abstract_path:
+				col, row = self.grid.get_position(cell)
+				points.append((self.get_screen_x(col + 0.5), self.get_screen_y(row + 0.5)))
+			pg.draw.lines(window, PINK, False, points, 3)
+			for point in points:
+				pg.draw.circle(window, PINK, point, max(2, int(self.nodeSize) // 6))
 
-		self.algorithm = 'BFS'
-		self.sthHappened = False
-		self.currentlyConsideredPos = None
-		self.endFound = False
-		self.currentlyConsideredPathPos = None
-		self.pathIsDone = False
+	# ACCESSORS:
+	def is_overlay_shown(self):
+		"""
+		RETURNS TRUE IF HPA* CLUSTERS (AND THE ABSTRACT PATH) ARE DRAWN OVER THE GRAPH
+		"""
+		return self.showClusters and self.algorithm == 'HPA*' and self.planner is not None and not self.replay
 
-		self.algoComponents = AlgoComponents(columns_count, rows_count)
+	def get_rect(self):
+		"""
+		RETURNS THE SCREEN RECTANGLE COVERED BY THE GRAPH (BY ITS VIEW)
+		"""
+		return pg.Rect(self.viewRect)
 
-		self.load_from_file('Graph templates/start.txt')
+	def get_relinked_count(self):
+		"""
+		RETURNS HOW MANY CELLS HAVE BEEN RE-LINKED (HAVE HAD THEIR NEIGHBORS UPDATED) BY THE LAST WEIGHT EDIT
+		"""
+		return self.relinkedCount
 
-	# "PRIVATE" METHODS (ARE USED ONLY BY OTHER METHODS OF THIS CLASS):
-	def make_path_step(self):
-		if self.currentlyConsideredPathPos is None:
-			self.currentlyConsideredPathPos = self.endPos
-		x, y = self.currentlyConsideredPathPos
-		self.currentlyConsideredPathPos = self.algoComponents.fathersPos[x][y]
-		x, y = self.currentlyConsideredPathPos
-		if self.currentlyConsideredPathPos == self.startPos:
-			self.pathIsDone = True
-			return
-		self.nodes[x][y].change_state('IN_PATH')
+	def get_search_report(self):
+		"""
+		RETURNS A SHORT SUMMARY OF THE FINISHED SEARCH OR PYTHONIC None IF THE SEARCH HASN'T FINISHED (OR STARTED) YET.
+		THE NUMBER OF NODES EXPANDED BY JPS OR ALT, RE-EXPANDED BY LPA* OR EXPANDED IN THE ABSTRACT GRAPH BY HPA*
+		IS COMPARED WITH A* (WITH THE MANHATTAN HEURISTIC) RUN ON THE SAME GRID FROM SCRATCH, IF THE COMPARISON IS ON.
+		"""
+		if self.search is None or not self.search.is_done():
+			return None
+
+		if self.searchReport is None:
+			expansions_count = self.search.expansionsCount
+			if self.algorithm == 'LPA*':
+				reference = self.get_reference_result()
+				self.searchReport = "LPA*: " + str(expansions_count) + " (re-)expanded nodes"
+				if reference is not None:
+					self.searchReport += ", A* from scratch: " + str(reference.expansionsCount)
+			elif self.algorithm == 'HPA*':
+				path = self.search.get_path()
+				cost = path_cost(self.grid, path) if path is not None else None
+				reference = self.get_reference_result()
+				self.searchReport = "HPA*: " + str(expansions_count) + " abstract nodes expanded, cost " + str(cost)
+				if reference is not None:
+					self.searchReport += ", A*: " + str(reference.expansionsCount) + " nodes expanded"
+					self.searchReport += ", cost " + str(reference.cost)
+			elif self.algorithm == 'ALT':
+				reference = self.get_reference_result()
+				self.searchReport = "ALT: " + str(expansions_count) + " expanded nodes"
+				self.searchReport += " (" + str(len(self.planner.landmarks)) + " landmarks"
+				self.searchReport += ", cached)" if self.planner.loadedFromCache else ")"
+				if reference is not None:
+					self.searchReport += ", A* with Manhattan: " + str(reference.expansionsCount)
+			elif self.algorithm != 'JPS':
+				self.searchReport = self.algorithm + ": " + str(expansions_count) + " expanded nodes"
+			elif self.search.algorithm != 'JPS':
+				self.searchReport = "JPS: weights aren't uniform, A* expanded " + str(expansions_count) + " nodes"
+			else:
+				reference = self.get_reference_result()
+				self.searchReport = "JPS: " + str(expansions_count) + " expanded nodes"
+				if reference is not None:
+					self.searchReport += ", A*: " + str(reference.expansionsCount)
+				if reference is not None and reference.expansionsCount:
+					reduction = 100 * (reference.expansionsCount - expansions_count) // reference.expansionsCount
+					self.searchReport += " (" + str(reduction) + "% fewer)"
+		return self.searchReport
+
+	def get_reference_result(self):
+		"""
+		RETURNS THE SearchResult OF A* (WITH THE MANHATTAN HEURISTIC) RUN FROM SCRATCH BETWEEN THE CURRENT START AND END
+		OR PYTHONIC None IF THE COMPARISON WITH A* IS OFF
+		"""
+		if not self.compareWithAStar:
+			return None
+		return self.pathCache.solve(self.startPos, self.endPos, 'A*')
 
-	def make_bfs_step(self):
-		if not self.sthHappened:
-			self.algoComponents.bfs.queue.put(self.startPos)
-			self.sthHappened = True
-		else:
-			x, y = self.currentlyConsideredPos
-			self.safely_change_node_state(x, y, 'CLOSED')
-
-		if not self.algoComponents.bfs.queue.empty():
-			self.currentlyConsideredPos = self.algoComponents.bfs.queue.get()
-			x, y = self.currentlyConsideredPos
-			self.nodes[x][y].set_visited(True)
-			self.safely_change_node_state(x, y, 'ACTIVE')
-
-			neighbors = self.nodes[x][y].get_neighbors()
-			for neighbor in neighbors:
-				if not neighbor.has_been_visited():
-					xx, yy = neighbor.get_coordinates()
-					self.nodes[xx][yy].set_visited(True)
-					self.algoComponents.bfs.queue.put(neighbor.get_coordinates())
-					self.algoComponents.fathersPos[xx][yy] = self.currentlyConsideredPos
-					if self.nodes[xx][yy].get_state() == 'END':
-						self.endFound = True
-						return
-					self.safely_change_node_state(xx, yy, 'IN_QUEUE')
-
-	def make_dfs_step(self):
-		if not self.sthHappened:
-			self.algoComponents.dfs.stack.append(self.startPos)
-			self.sthHappened = True
-		else:
-			x, y = self.currentlyConsideredPos
-			self.safely_change_node_state(x, y, 'CLOSED')
-
-		if self.algoComponents.dfs.stack:
-			self.currentlyConsideredPos = self.algoComponents.dfs.stack.pop()
-			x, y = self.currentlyConsideredPos
-			self.nodes[x][y].set_visited(True)
-			self.safely_change_node_state(x, y, 'ACTIVE')
-
-			neighbors = self.nodes[x][y].get_neighbors()
-			for neighbor in neighbors:
-				if not neighbor.has_been_visited():
-					xx, yy = neighbor.get_coordinates()
-					self.nodes[xx][yy].set_visited(True)
-					self.algoComponents.dfs.stack.append(neighbor.get_coordinates())
-					self.algoComponents.fathersPos[xx][yy] = self.currentlyConsideredPos
-					if self.nodes[xx][yy].get_state() == 'END':
-						self.endFound = True
-						return
-					self.safely_change_node_state(xx, yy, 'IN_QUEUE')
-
-	def make_dijkstra_step(self):
-		if not self.sthHappened:
-			self.sthHappened = True
-			self.algoComponents.dijkstra.distances[self.startPos] = 0
-			self.algoComponents.dijkstra.priorityQueue.put(([0, self.startPos]))
-		else:
-			x, y = self.currentlyConsideredPos
-			self.safely_change_node_state(x, y, 'CLOSED')
-
-		if not self.algoComponents.dijkstra.priorityQueue.empty():
-			v_tuple = self.algoComponents.dijkstra.priorityQueue.get()
-			v = v_tuple[1]
-			self.currentlyConsideredPos = v_tuple[1]
-
-			if self.currentlyConsideredPos == self.endPos:
-				self.endFound = True
-				return
-
-			x, y = self.currentlyConsideredPos
-			self.nodes[x][y].set_visited(True)
-			self.safely_change_node_state(x, y, 'ACTIVE')
-
-			neighbors = self.nodes[x][y].get_neighbors()
-			for neighbor in neighbors:
-				x, y = neighbor.get_coordinates()
-				candidate_distance = self.algoComponents.dijkstra.distances[v] + self.nodes[x][y].get_weight()
-				if self.algoComponents.dijkstra.distances[neighbor.get_coordinates()] > candidate_distance:
-					self.algoComponents.dijkstra.distances[neighbor.get_coordinates()] = candidate_distance
-					self.algoComponents.fathersPos[x][y] = self.currentlyConsideredPos
-					self.algoComponents.dijkstra.priorityQueue.put(
-						([self.algoComponents.dijkstra.distances[neighbor.get_coordinates()], neighbor.get_coordinates()])
-					)
-					x, y = neighbor.get_coordinates()
-					self.safely_change_node_state(x, y, 'IN_QUEUE')
-
-	def make_a_star_step(self):
-		def heuristic(a, b):
-			x1, y1 = a
-			x2, y2 = b
-			return abs(x1 - x2) + abs(y1 - y2)
-
-		if not self.sthHappened:
-			self.sthHappened = True
-			self.algoComponents.aStar.count = 0
-			self.algoComponents.aStar.openSet = PriorityQueue()
-			xs, ys = self.startPos
-			self.algoComponents.aStar.openSet.put((0, self.algoComponents.aStar.count, self.nodes[xs][ys]))
-			self.algoComponents.aStar.gScore = {node: float("inf") for row in self.nodes for node in row}
-			self.algoComponents.aStar.gScore[self.nodes[xs][ys]] = 0
-			self.algoComponents.aStar.fScore = {node: float("inf") for row in self.nodes for node in row}
-			xe, ye = self.endPos
-			temp = heuristic(self.nodes[xs][ys].get_coordinates(), self.nodes[xe][ye].get_coordinates())
-			self.algoComponents.aStar.fScore[self.nodes[xs][ys]] = temp
-			self.algoComponents.aStar.openSetHash = {self.nodes[xs][ys]}
-
-		if not self.algoComponents.aStar.openSet.empty():
-			current = self.algoComponents.aStar.openSet.get()[2]
-			self.algoComponents.aStar.openSetHash.remove(current)
-			self.currentlyConsideredPos = current.get_coordinates()
-
-			if current.get_coordinates() == self.endPos:
-				self.endFound = True
-				return
-
-			for neighbor in current.get_neighbors():
-				xx, yy = neighbor.get_coordinates()
-				temp_g_score = self.algoComponents.aStar.gScore[current] + self.nodes[xx][yy].get_weight()
-
-				if temp_g_score < self.algoComponents.aStar.gScore[neighbor]:
-					self.algoComponents.fathersPos[xx][yy] = current.get_coordinates()
-					self.algoComponents.aStar.gScore[neighbor] = temp_g_score
-					self.algoComponents.aStar.fScore[neighbor] = temp_g_score + heuristic(neighbor.get_coordinates(), self.endPos)
-
-					if neighbor not in self.algoComponents.aStar.openSetHash:
-						self.algoComponents.aStar.count += 1
-						self.algoComponents.aStar.openSet.put(
-							(
-								self.algoComponents.aStar.fScore[neighbor],
-								self.algoComponents.aStar.count,
-								neighbor
-							)
-						)
-						self.algoComponents.aStar.openSetHash.add(neighbor)
-						self.safely_change_node_state(xx, yy, 'IN_QUEUE')
-
-			x, y = current.get_coordinates()
-			self.safely_change_node_state(x, y, 'CLOSED')
+	def get_search_counters(self):
+		"""
+		RETURNS A DICTIONARY WITH COUNTERS OF THE CURRENT SEARCH: EXPANSIONS, QUEUE (NODES WAITING IN THE QUEUE),
+		RE-PUSHES, PATH LENGTH AND PATH COST (BOTH ARE None UNTIL THE PATH IS FOUND), FOLLOWED BY THE COUNTERS
+		OF THE CACHE OF REFERENCE A* RESULTS (HITS, MISSES, EVICTIONS AND INVALIDATIONS)
+		"""
+		path = self.search.get_path_cells() if self.search is not None else None
+		if path is not None and self.pathCost is None:
+			self.pathCost = path_cost(self.grid, self.search.get_path())
+		counters = {
+			'expansions': self.search.expansionsCount if self.search is not None else 0,
+			'queue': self.queueSize,
+			'repushes': self.repushesCount,
+			'path_length': len(path) if path is not None else None,
+			'path_cost': self.pathCost if path is not None else None
+		}
+		counters.update(('cache_' + name, count) for name, count in self.pathCache.get_counters().items())
+		return counters
+
+	@property
+	def startPos(self):
+		return self.grid.startPos
+
+	@property
+	def endPos(self):
+		return self.grid.endPos
+
+	def is_incremental(self):
+		"""
+		RETURNS TRUE IF THE SEARCH KEEPS ITS PROGRESS BETWEEN EDITS (LPA* OR HPA* HAS ALREADY RUN ON THIS MAP).
+		LANDMARKS OF ALT ARE KEPT TOO, BUT AFTER AN EDIT THEY HAVE TO BE COMPUTED AGAIN, SO ALT DOESN'T COUNT.
+		"""
+		return self.planner is not None and self.algorithm != 'ALT'
 
-	# ACCESSORS:
 	def get_node_coordinates(self, mouse_pos):
 		"""
-		RETURNS OVER WHICH COLUMN AND ROW OF THE GRAPH THE MOUSE CURSOR IS LOCATED.
-		NOTICE THAT IF THE MOUSE CURSOR ISN'T OVER THE GRAPH THE FUNCTION WILL RETURN NEGATIVE OR TOO BIG NUMBERS.
-		IN OTHER WORDS, THE FUNCTION DOESN'T CHECK IF THE MOUSE CURSOR IS OVER THE GRAPH.
+		RETURNS OVER WHICH COLUMN AND ROW OF THE GRAPH THE MOUSE CURSOR IS LOCATED (SEEN THROUGH THE CAMERA).
+		IF THE MOUSE CURSOR ISN'T OVER THE VIEW, THE FUNCTION RETURNS (-1, -1). OVER THE VIEW, BUT BEYOND THE LAST COLUMN
+		OR ROW, IT RETURNS TOO BIG NUMBERS. IN OTHER WORDS, THE FUNCTION DOESN'T CHECK IF THE NODE EXISTS.
 		"""
 		x, y = mouse_pos
-		col = (x - self.xPos) // self.nodes[0][0].size
-		row = (y - self.yPos) // self.nodes[0][0].size
+		if not self.viewRect.collidepoint(x, y):
+			return -1, -1
+		col = math.floor(self.cameraCol + (x - self.xPos) / self.nodeSize)
+		row = math.floor(self.cameraRow + (y - self.yPos) / self.nodeSize)
 		return col, row
 
 	def get_node(self, col, row):
-		return self.nodes[col][row]
+		"""
+		RETURNS A THIN Node VIEW OF THE NODE IN THE GIVEN COLUMN AND ROW
+		"""
+		return Node(self, col, row)
 
 	def is_done(self):
 		"""
@@ -741,22 +941,28 @@ class Graph:
 
 		IF FUNCTION RETURNS FALSE, IT MEANS THAT THE PATH-FINDING PROCESS WOULD STILL GOING ON (NEXT CALLING make_step
 		FUNCTION WILL CHANGE SOMETHING)
+
+		IN THE REPLAY MODE RETURNS TRUE IF THE REPLAY HAS REACHED THE END (OR THE BEGINNING, WHEN PLAYING BACKWARDS)
 		"""
 
-		if self.endFound:
-			return self.pathIsDone
+		if self.replay:
+			if self.player is None:
+				return False
+			return self.player.is_at_beginning() if self.replayBackwards else self.player.is_at_end()
 
-		if not self.sthHappened:
+		if self.search is None:
 			return False
 
-		if self.algorithm == 'BFS':
-			return self.algoComponents.bfs.queue.empty()
-		if self.algorithm == 'DFS':
-			return not self.algoComponents.dfs.stack
-		if self.algorithm == 'DIJKSTRA':
-			return self.algoComponents.dijkstra.priorityQueue.empty()
-		if self.algorithm == 'A*':
-			return self.algoComponents.aStar.openSet.empty()
+		return self.search.is_done()
+
+	def trace_matches(self):
+		"""
+		RETURNS TRUE IF THE CURRENT TRACE HAS BEEN RECORDED ON THE CURRENT MAP, WITH THE CURRENT START, END AND ALGORITHM
+		"""
+		return (
+			self.trace is not None and self.trace.matches(self.grid) and self.trace.algorithm == self.algorithm and
+			self.trace.start == self.grid.get_id(*self.startPos) and self.trace.end == self.grid.get_id(*self.endPos)
+		)
 
 	# MUTATORS:
 	def safely_change_node_state(self, column, row, state):
@@ -764,25 +970,64 @@ class Graph:
 		SIMPLY CHANGES A NODE STATE, BUT PREVENTS CHANGING STATE OF A NODE, WHICH IS START OR END
 		"""
 
-		if self.nodes[column][row].get_state() != 'START' and self.nodes[column][row].get_state() != 'END':
-			self.nodes[column][row].change_state(state)
-			if state == 'START':
-				x, y = self.startPos
-				self.nodes[x][y].change_state(None)
-				self.startPos = column, row
-				self.nodes[column][row].change_state('START')
-			elif state == 'END':
-				x, y = self.endPos
-				self.nodes[x][y].change_state(None)
-				self.endPos = column, row
-				self.nodes[column][row].change_state('END')
+		if self.grid.get_state(column, row) != 'START' and self.grid.get_state(column, row) != 'END':
+			if state == 'START' or state == 'END':
+				self.mark_dirty(*(self.startPos if state == 'START' else self.endPos))
+			self.grid.set_state(column, row, state)
+			self.mark_dirty(column, row)
 
 	def set_algorithm(self, algorithm):
 		"""
 		TAKES AS THE ARGUMENT A STRING
 		"""
+		if algorithm != self.algorithm:
+			self.planner = None
+			self.fullRepaint = True
 		self.algorithm = algorithm
 
+	def set_replay(self, replay):
+		"""
+		TURNS THE SOLVE-THEN-REPLAY MODE ON OR OFF (TAKES AS THE ARGUMENT PYTHONIC True OR False).
+		IN THE REPLAY MODE THE WHOLE SEARCH IS RUN AT FULL SPEED FIRST AND THEN ITS TRACE IS ANIMATED.
+		"""
+		self.reset()
+		self.replay = replay
+
+	def set_clusters_shown(self, shown):
+		"""
+		TURNS THE HPA* CLUSTERS OVERLAY ON OR OFF (TAKES AS THE ARGUMENT PYTHONIC True OR False)
+		"""
+		self.showClusters = shown
+		self.fullRepaint = True
+
+	def set_comparison_with_a_star(self, compared):
+		"""
+		TURNS THE COMPARISON OF FINISHED SEARCHES WITH A* RUN FROM SCRATCH ON OR OFF
+		(TAKES AS THE ARGUMENT PYTHONIC True OR False)
+		"""
+		self.compareWithAStar = compared
+		self.searchReport = None
+
+	def set_replay_backwards(self, backwards):
+		"""
+		TAKES AS THE ARGUMENT PYTHONIC True (PLAY THE REPLAY BACKWARDS) OR False (PLAY IT FORWARDS)
+		"""
+		self.replayBackwards = backwards
+
+	def seek_replay(self, position):
+		"""
+		MOVES THE REPLAY TO THE GIVEN NUMBER OF APPLIED EVENTS (0 IS THE BEGINNING, None IS THE END)
+		"""
+		self.prepare_replay()
+		self.player.seek(len(self.trace) if position is None else position)
+
+	def step_replay(self, events_count):
+		"""
+		MOVES THE REPLAY BY THE GIVEN NUMBER OF EVENTS (NEGATIVE NUMBERS MOVE IT BACKWARDS)
+		"""
+		self.prepare_replay()
+		self.player.seek(self.player.position + events_count)
+
 	def increase_weight(self, column, row, weight_gain):
 		"""
 		weights_gain ARGUMENT HAVE TO BE NON-NEGATIVE.
@@ -792,9 +1037,11 @@ class Graph:
 		"""
 
 		assert weight_gain >= 0, "ERROR: increase_weight function:\nArgument weight_gain must be non-negative\n"
-		self.nodes[column][row].set_weight(
-			min(self.nodes[column][row].maxWeight, self.nodes[column][row].get_weight() + weight_gain)
-		)
+		self.grid.set_weight(column, row, min(self.maxNodeWeight, self.grid.get_weight(column, row) + weight_gain))
+		self.relinkedCount = self.grid.relinkedCount
+		self.mark_dirty(column, row)
+		if self.planner is not None:
+			self.planner.update_cell(self.grid.get_id(column, row))
 
 	def decrease_weight(self, column, row, weight_loss):
 		"""
@@ -805,28 +1052,50 @@ class Graph:
 		"""
 
 		assert weight_loss >= 0, "ERROR: decrease_weight function:\nArgument weight_gain must be non-negative\n"
-		self.nodes[column][row].set_weight(
-			max(self.nodes[column][row].minWeight, self.nodes[column][row].get_weight() - weight_loss)
-		)
+		self.grid.set_weight(column, row, max(self.minNodeWeight, self.grid.get_weight(column, row) - weight_loss))
+		self.relinkedCount = self.grid.relinkedCount
+		self.mark_dirty(column, row)
+		if self.planner is not None:
+			self.planner.update_cell(self.grid.get_id(column, row))
 
 	def reset(self):
 		"""
 		REMOVE ALL PROGRESS IN THE PATH-FINDING PROCESS, RESTORE THE GRAPH TO ITS INITIAL STATE
 		"""
 
-		for x in self.nodes:
-			for y in x:
-				y.set_visited(False)
-				if not y.get_state() == 'START' and not y.get_state() == 'END':
-					y.change_state(None)
-
-		self.currentlyConsideredPos = None
-		self.sthHappened = False
-		self.pathIsDone = False
-		self.currentlyConsideredPathPos = None
-		self.endFound = False
+		# ONLY THE SEARCH (OR THE REPLAY) CHANGES STATES OTHER THAN START AND END, SO ONLY CELLS TOUCHED BY IT ARE CLEARED
+		# AND REPAINTED (START OR END MAY HAVE BEEN MOVED ONTO ONE OF THEM SINCE, THEY STAY). AFTER BIG SEARCHES ALL STATES
+		# ARE CLEARED AT ONCE. NOTHING ELSE IS CLEARED, THE NEXT SEARCH ONLY STARTS A NEW GENERATION OF THE SEARCH ARRAYS:
+		if self.touchedCells is None:
+			self.grid.clear_states()
+			self.fullRepaint = True
+		else:
+			states = self.grid.states
+			for cell in self.touchedCells:
+				if states[cell] != START and states[cell] != END:
+					states[cell] = 0
+			self.dirtyCells |= self.touchedCells
+		self.touchedCells = set()
+		self.resetScheduled = False
+		self.search = None
+		self.searchReport = None
+		self.player = None
+		self.queueSize = 0
+		self.repushesCount = 0
+		self.pathCost = None
+
+	def schedule_reset(self):
+		"""
+		ASKS FOR A reset, WHICH IS DONE BY apply_scheduled_reset ONLY ONCE, HOWEVER MANY EDITS HAVE ASKED FOR IT
+		"""
+		self.resetScheduled = True
 
-		self.algoComponents = AlgoComponents(self.columnsCount, self.rowsCount)
+	def apply_scheduled_reset(self):
+		"""
+		CALL THE FUNCTION ONCE PER FRAME, AFTER ALL EDITS
+		"""
+		if self.resetScheduled:
+			self.reset()
 
 	def clean_all(self):
 		"""
@@ -834,9 +1103,12 @@ class Graph:
 		SETS ALL WEIGHTS IN THE GRAPH TO VALUE OF THE minNodeWeight VARIABLE (WHICH IS VARIABLE OF THE GRAPH)
 		"""
 		self.reset()
-		for x in self.nodes:
-			for y in x:
-				y.set_weight(self.minNodeWeight)
+		self.grid.fill_weights(self.minNodeWeight)
+		self.relinkedCount = self.grid.relinkedCount
+		self.fullRepaint = True
+
+		# AFTER CHANGING ALL WEIGHTS AT ONCE LPA* AND HPA* START FROM SCRATCH:
+		self.planner = None
 
 	def make_random(self):
 		"""
@@ -846,124 +1118,361 @@ class Graph:
 		"""
 
 		self.clean_all()
+		make_random(self.grid)
+		self.relinkedCount += self.grid.relinkedCount
+		self.fullRepaint = True
+
+	def set_camera(self, col, row):
+		"""
+		MOVES THE CAMERA, SO THE VIEW STARTS AT THE GIVEN (FRACTIONAL) COLUMN AND ROW.
+		THE CAMERA DOESN'T GO BEYOND THE EDGES OF THE GRAPH.
+		"""
+		col = min(max(col, 0), max(0, self.columnsCount - self.viewWidth / self.nodeSize))
+		row = min(max(row, 0), max(0, self.rowsCount - self.viewHeight / self.nodeSize))
+		if col != self.cameraCol or row != self.cameraRow:
+			self.cameraCol = col
+			self.cameraRow = row
+			self.viewOutdated = True
+
+	def pan(self, dx, dy):
+		"""
+		MOVES THE VIEW BY dx AND dy PIXELS (THE GRAPH MOVES THE OTHER WAY)
+		"""
+		self.set_camera(self.cameraCol + dx / self.nodeSize, self.cameraRow + dy / self.nodeSize)
+
+	def zoom_at(self, mouse_pos, factor):
+		"""
+		MULTIPLIES THE NODE SIZE BY factor, KEEPING THE POINT OF THE GRAPH UNDER THE MOUSE CURSOR IN PLACE
+		(OR THE CENTER OF THE VIEW IF THE CURSOR ISN'T OVER IT). THE GRAPH CANNOT BE ZOOMED OUT FURTHER THAN TO FIT
+		THE VIEW, NOR THE NODE SIZE GO BEYOND <MIN_NODE_SIZE; MAX_NODE_SIZE>.
+		"""
+		min_size = max(MIN_NODE_SIZE, min(self.get_fitting_node_size(), MAX_NODE_SIZE))
+		node_size = min(max(self.nodeSize * factor, min_size), max(MAX_NODE_SIZE, min_size))
+		if node_size == self.nodeSize:
+			return
 
-		x, y = self.startPos
-		self.nodes[x][y].change_state(None)
-		x1 = random.randint(0, self.columnsCount - 1)
-		y1 = random.randint(0, self.rowsCount - 1)
-		self.startPos = x1, y1
-		self.nodes[x1][y1].change_state('START')
-
-		x2 = random.randint(0, self.columnsCount - 1)
-		y2 = random.randint(0, self.rowsCount - 1)
-		x, y = self.endPos
-		self.nodes[x][y].change_state(None)
-		while x1 == x2 and y1 == y2:
-			x2 = random.randint(0, self.columnsCount - 1)
-			y2 = random.randint(0, self.rowsCount - 1)
-		self.endPos = x2, y2
-		self.nodes[x2][y2].change_state('END')
-
-		for x in self.nodes:
-			for y in x:
-				y.set_weight(random.randint(self.minNodeWeight, self.maxNodeWeight))
-				y.set_visited(False)
+		if mouse_pos is not None and self.viewRect.collidepoint(mouse_pos):
+			x, y = mouse_pos[0] - self.xPos, mouse_pos[1] - self.yPos
+		else:
+			x, y = self.viewWidth / 2, self.viewHeight / 2
+		col = self.cameraCol + x / self.nodeSize
+		row = self.cameraRow + y / self.nodeSize
+		self.nodeSize = node_size
+		self.viewOutdated = True
+		self.set_camera(col - x / node_size, row - y / node_size)
+
+	def invalidate_view(self):
+		"""
+		MAKES THE NEXT render CALL DRAW THE WHOLE VIEW AGAIN (E.G. AFTER THE WINDOW HAS BEEN EXPOSED)
+		"""
+		self.viewOutdated = True
+
+	def fit_to_view(self):
+		"""
+		ZOOMS OUT (OR IN), SO THE WHOLE GRAPH IS SHOWN
+		"""
+		self.nodeSize = max(MIN_NODE_SIZE, min(self.get_fitting_node_size(), MAX_NODE_SIZE))
+		self.viewOutdated = True
+		self.set_camera(0, 0)
 
 	# OTHER METHODS:
-	def make_step(self):
+	def make_step(self, steps_count=1, time_budget=None):
 		"""
 		MAKE ANOTHER STEP IN PATH-FINDING PROCESS. AFTER CALLING render FUNCTION CHANGES WILL BE VISIBLE.
+		THE SEARCH ITSELF IS RUN BY THE solver PACKAGE, THE GRAPH ONLY COLORS THE NODES.
+
+		MAKES AT MOST steps_count STEPS AND, IF time_budget (IN MILLISECONDS) IS GIVEN, STOPS WHEN THE BUDGET IS USED UP.
+		IF BOTH ARGUMENTS ARE None, THE SEARCH IS RUN TO COMPLETION. RETURNS THE NUMBER OF MADE STEPS.
 		"""
 
-		if self.endFound:
-			self.make_path_step()
-		elif self.algorithm == 'BFS':
-			self.make_bfs_step()
-		elif self.algorithm == 'DFS':
-			self.make_dfs_step()
-		elif self.algorithm == 'DIJKSTRA':
-			self.make_dijkstra_step()
-		elif self.algorithm == 'A*':
-			self.make_a_star_step()
+		if self.replay:
+			return self.make_replay_step(steps_count, time_budget)
+
+		if self.search is None:
+			if self.algorithm == 'LPA*' and self.planner is None:
+				self.planner = LPAStar(self.grid, self.startPos, self.endPos)
+			elif self.algorithm == 'HPA*' and self.planner is None:
+				self.planner = ClusterAbstraction(self.grid)
+			elif self.algorithm == 'ALT' and self.planner is None:
+				self.planner = Landmarks(self.grid)
+			self.search = Search(
+				self.grid, self.startPos, self.endPos, self.algorithm, self.set_cell_state, self.planner, self.searchArrays
+			)
+
+		deadline = time.perf_counter() + time_budget / 1000 if time_budget is not None else None
+		steps_made = 0
+		while not self.search.is_done() and (steps_count is None or steps_made < steps_count):
+			self.search.make_step()
+			steps_made += 1
+			if deadline is not None and time.perf_counter() >= deadline:
+				break
+		return steps_made
+
+	def prepare_replay(self):
+		"""
+		RECORDS THE TRACE OF THE WHOLE SEARCH (UNLESS THE CURRENT ONE CAN BE REUSED) AND CREATES ITS PLAYER
+		"""
+		if self.player is not None:
+			return
+		if not self.trace_matches():
+			self.trace = record_trace(self.grid, self.startPos, self.endPos, self.algorithm)
+		self.player = TracePlayer(self.trace, self.grid.states, self.touch_cell)
+
+	def make_replay_step(self, events_count, time_budget):
+		"""
+		APPLIES THE NEXT EVENTS OF THE TRACE (OR UNDOES THE PREVIOUS ONES, WHEN PLAYING BACKWARDS),
+		WITH THE SAME LIMITS AS make_step. RETURNS THE NUMBER OF APPLIED EVENTS.
+		"""
+		self.prepare_replay()
+		step = self.player.step_backward if self.replayBackwards else self.player.step_forward
+
+		if time_budget is None:
+			return step(len(self.trace) if events_count is None else events_count)
+
+		deadline = time.perf_counter() + time_budget / 1000
+		applied = 0
+		while not self.is_done() and (events_count is None or applied < events_count):
+			applied += step(64 if events_count is None else min(64, events_count - applied))
+			if time.perf_counter() >= deadline:
+				break
+		return applied
+
+	def save_trace(self, file_path):
+		"""
+		SAVES THE TRACE OF THE CURRENT SEARCH (RECORDING IT IF NEEDED), SO IT CAN BE REPLAYED WITHOUT RECOMPUTATION
+		"""
+		if not self.trace_matches():
+			self.trace = record_trace(self.grid, self.startPos, self.endPos, self.algorithm)
+		self.trace.save(file_path)
+
+	def load_trace(self, file_path):
+		"""
+		LOADS A TRACE SAVED BY save_trace. THE TRACE IS USED ONLY IF IT HAS BEEN RECORDED ON THE CURRENT MAP,
+		THEN THE START AND END NODES AND THE ALGORITHM ARE TAKEN FROM IT. RETURNS TRUE IF THE TRACE HAS BEEN USED.
+		"""
+		trace = Trace.load(file_path)
+		if not trace.matches(self.grid):
+			return False
+		self.reset()
+		self.mark_dirty(*self.startPos)
+		self.mark_dirty(*self.endPos)
+		self.grid.set_endpoints(self.grid.get_position(trace.start), self.grid.get_position(trace.end))
+		self.mark_dirty(*self.startPos)
+		self.mark_dirty(*self.endPos)
+		self.set_algorithm(trace.algorithm)
+		self.trace = trace
+		return True
 
 	def render(self):
 		"""
-		CALL THE FUNCTION AT THE END OF EVERY FRAME
+		CALL THE FUNCTION AT THE END OF EVERY FRAME.
+		ONLY PIXELS OF NODES WHICH HAVE CHANGED SINCE THE LAST CALL ARE UPDATED IN THE IMAGE OF CELLS, UNLESS A FULL REPAINT
+		IS NEEDED (AFTER LOADS AND OTHER CHANGES OF THE WHOLE GRAPH). IF ANYTHING HAS CHANGED OR THE CAMERA HAS MOVED,
+		THE VIEW IS DRAWN AGAIN FROM THE IMAGE, SO THE TIME OF A FRAME DOESN'T GROW WITH THE NUMBER OF NODES.
+		RETURNS THE LIST OF REDRAWN SCREEN RECTANGLES, WHICH CAN BE PASSED TO pg.display.update
 		"""
 
-		if not self.is_done():
-			for x in self.nodes:
-				for y in x:
-					y.render_with_state()
-		else:
-			for x in self.nodes:
-				for y in x:
-					if y.state != 'START' and y.state != 'END' and y.state != 'IN_PATH':
-						y.render_without_state()
-					else:
-						y.render_with_state()
+		# WHEN THE SEARCH GETS DONE, ONLY START, END AND THE PATH KEEP THEIR COLORS, SO ALL CELLS WITH STATES ARE REDRAWN:
+		done = self.is_done()
+		if done != self.renderedDone:
+			self.renderedDone = done
+			if self.touchedCells is None:
+				self.fullRepaint = True
+			else:
+				self.dirtyCells |= self.touchedCells
+
+		# THE CHANGED PIXELS ARE UPDATED AND, IF ANY OF THEM IS VISIBLE, THE VISIBLE PART OF THE IMAGE IS SCALED
+		# TO THE VIEW WITH ONE BLIT:
+		full_repaint = self.fullRepaint or self.cellsImage is None
+		changed = self.update_cells_image(done) and (full_repaint or self.is_any_visible(self.dirtyCells))
+		rects = []
+		if changed or self.viewOutdated:
+			window.set_clip(self.viewRect)
+			# WHEN THE GRAPH IS ZOOMED OUT, IT MAY NOT COVER THE WHOLE VIEW:
+			window.fill(BACKGROUND_COLOR, self.viewRect)
+			self.render_cells_image()
+			if self.nodeOutlineThickness > 0 and not self.is_lod_used():
+				window.blit(self.get_outlines_image(), self.viewRect)
+			if self.is_overlay_shown():
+				self.render_clusters_overlay()
+			window.set_clip(None)
+			rects = [self.get_rect()]
+
+		self.dirtyCells = set()
+		self.fullRepaint = False
+		self.viewOutdated = False
+		return rects
 
 	def save_to_file(self, file_path):
-		template = open(file_path, "w")
-		for y in range(int(self.rowsCount)):
-			string = ""
-			for x in range(int(self.columnsCount)):
-				if self.nodes[x][y].get_state() == 'START':
-					string += 'START '
-				elif self.nodes[x][y].get_state() == "END":
-					string += 'END '
-				else:
-					string += str(self.nodes[x][y].get_weight()) + ' '
-			template.write(str(string))
-			template.write('\n')
-		template.close()
+		self.grid.save_to_file(file_path)
 
 	def load_from_file(self, file_path):
-		self.clean_all()
+		self.reset()
+		start_pos, end_pos = self.startPos, self.endPos
+		self.grid.load_from_file(file_path)
+		self.relinkedCount = self.grid.relinkedCount
+		self.fullRepaint = True
+		self.planner = None
 
-		x, y = self.startPos
-		self.nodes[x][y].change_state(None)
-
-		x, y = self.endPos
-		self.nodes[x][y].change_state(None)
-
-		template = open(file_path, "r")
-		y = 0
-		for line in template:
-			x = 0
-			for word in line.split():
-				if word == 'START':
-					self.nodes[x][y].change_state('START')
-					self.startPos = x, y
-				elif word == 'END':
-					self.nodes[x][y].change_state('END')
-					self.endPos = x, y
-				else:
-					self.nodes[x][y].set_weight(int(word))
-				x += 1
-			y += 1
-		template.close()
+		# THE TEMPLATE MAY NOT CONTAIN START OR END, THEN THEY STAY WHERE THEY WERE:
+		if self.startPos is None:
+			self.grid.set_state(*start_pos, 'START')
+		if self.endPos is None:
+			self.grid.set_state(*end_pos, 'END')
 
 
-def init_choice_boxes(graph):
-	x = 2 * LEFT_MARGIN + graph.columnsCount * graph.nodes[0][0].size
-	algorithm_choice_box = ChoiceBox(
-		x, TOP_MARGIN, 160, 18, 12, GREY224, BLACK, ['BFS', 'DFS', 'DIJKSTRA', 'A*'], 'BFS', 'ALGORITHM:', BLACK
+class FrameProfiler:
+	"""
+	MEASURES HOW LONG EVERY PHASE OF A FRAME TAKES (CALLING start_phase ENDS THE PREVIOUS PHASE),
+	SHOWS THE TIMES AND THE SEARCH COUNTERS IN AN OVERLAY AND (IF file_path IS GIVEN) STREAMS THEM FOR EVERY FRAME
+	TO A CSV FILE (IF THE FILE NAME ENDS WITH .csv) OR TO A JSON LINES FILE (OTHERWISE)
+	"""
+
+	PHASES = ('EVENTS', 'WIDGETS', 'EDITS', 'STEP', 'RENDER', 'DISPLAY', 'IDLE')
+	COUNTERS = (
+		'expansions', 'queue', 'repushes', 'path_length', 'path_cost',
+		'cache_hits', 'cache_misses', 'cache_evictions', 'cache_invalidations'
 	)
+
+	# THE OVERLAY IS REDRAWN ONLY EVERY FEW FRAMES, SO THE NUMBERS CAN BE READ:
+	REFRESH_FRAMES = 10
+
+	def __init__(self, x_pos, y_pos, width, height, background_color, text_color, char_size=12, file_path=None):
+		self.rect = pg.Rect(x_pos, y_pos, width, height)
+		self.backgroundColor = background_color
+		self.textColor = text_color
+		self.charSize = char_size
+		self.visible = False
+		self.renderedVisible = False
+		self.framesCount = 0
+
+		# active frames have handled events or stepped the search, idle frames have only waited for events:
+		self.activeFramesCount = 0
+		self.idleFramesCount = 0
+		self.currentPhase = None
+		self.phaseStart = None
+		self.times = dict.fromkeys(self.PHASES, 0.0)
+		self.averageTimes = dict.fromkeys(self.PHASES, 0.0)
+		self.counters = dict.fromkeys(self.COUNTERS)
+
+		self.file = None
+		self.writer = None
+		if file_path is not None:
+			self.file = open(file_path, "w", newline='')
+			if file_path.endswith('.csv'):
+				self.writer = csv.DictWriter(self.file, self.get_record_fields())
+				self.writer.writeheader()
+
+	# "PRIVATE" METHODS (ARE USED ONLY BY OTHER METHODS OF THIS CLASS):
+	def get_record_fields(self):
+		return ('frame', 'active') + tuple(phase.lower() + '_ms' for phase in self.PHASES) + self.COUNTERS
+
+	def write_record(self, active):
+		record = {'frame': self.framesCount, 'active': int(active)}
+		for phase in self.PHASES:
+			record[phase.lower() + '_ms'] = round(self.times[phase], 3)
+		record.update(self.counters)
+		if self.writer is not None:
+			self.writer.writerow(record)
+		else:
+			self.file.write(json.dumps(record) + '\n')
+
+	# ACCESSORS:
+	def get_rect(self):
+		return self.rect
+
+	def is_visible(self):
+		return self.visible
+
+	# MUTATORS:
+	def set_visible(self, visible):
+		self.visible = visible
+
+	def start_phase(self, phase):
+		now = time.perf_counter()
+		if self.currentPhase is not None:
+			self.times[self.currentPhase] += (now - self.phaseStart) * 1000
+		self.currentPhase = phase
+		self.phaseStart = now
+
+	def end_frame(self, counters, active=True):
+		"""
+		CALL THE FUNCTION AT THE END OF EVERY FRAME WITH THE DICTIONARY OF SEARCH COUNTERS
+		AND PYTHONIC False IF THE FRAME HAS ONLY WAITED FOR EVENTS
+		"""
+		self.start_phase(None)
+		self.framesCount += 1
+		if active:
+			self.activeFramesCount += 1
+		else:
+			self.idleFramesCount += 1
+		self.counters = counters
+		for phase in self.PHASES:
+			self.averageTimes[phase] = 0.9 * self.averageTimes[phase] + 0.1 * self.times[phase]
+		if self.file is not None:
+			self.write_record(active)
+		self.times = dict.fromkeys(self.PHASES, 0.0)
+
+	def close(self):
+		if self.file is not None:
+			self.file.close()
+			self.file = None
+
+	# OTHER METHODS:
+	def render(self, force=False):
+		"""
+		DRAWS THE OVERLAY (OR CLEARS IT AFTER IT HAS BEEN HIDDEN), RETURNS TRUE IF ANYTHING HAS BEEN DRAWN
+		"""
+		if not force and self.visible == self.renderedVisible and (
+				not self.visible or self.framesCount % self.REFRESH_FRAMES != 0
+		):
+			return False
+		self.renderedVisible = self.visible
+
+		pg.draw.rect(window, self.backgroundColor, self.rect)
+		if not self.visible:
+			return True
+
+		lines = [phase + ": %.2f MS" % self.averageTimes[phase] for phase in self.PHASES]
+		lines += [counter.upper().replace('_', ' ') + ": " + str(self.counters[counter]) for counter in self.COUNTERS]
+		lines += ["ACTIVE FRAMES: " + str(self.activeFramesCount), "IDLE FRAMES: " + str(self.idleFramesCount)]
+		font = get_font('arial', self.charSize)
+		line_height = self.rect.height // len(lines)
+		for i, line in enumerate(lines):
+			window.blit(font.render(line, 1, self.textColor), (self.rect.x, self.rect.y + i * line_height))
+		return True
+
+
+def init_choice_boxes(graph):
+	# THE FIRST COLUMN (NEXT TO THE GRAPH) HOLDS NODE ACTIONS, ON/OFF AND THE BUTTONS,
+	# THE SECOND ONE HOLDS THE ALGORITHM (WHICH LIST GROWS WITH NEW ALGORITHMS), THE MODE AND THE SPEED:
+	x = 2 * LEFT_MARGIN + graph.viewWidth
 	node_action_choice_box = ChoiceBox(
-		x, 2 * TOP_MARGIN + 162, 160, 18, 12, GREY224, BLACK, ['START', 'END', 'INCREASE', 'DECREASE'], 'START',
+		x, TOP_MARGIN, 160, 18, 12, GREY224, BLACK, ['START', 'END', 'INCREASE', 'DECREASE'], 'START',
 		'NODE ACTIONS:', BLACK
 	)
 	on_choice_box = ChoiceBox(
-		x, 3 * TOP_MARGIN + 324, 160, 18, 12, GREY224, BLACK, ['ON', 'OFF'], 'OFF', 'ON/OFF:', BLACK
+		x, 2 * TOP_MARGIN + 162, 160, 18, 12, GREY224, BLACK, ['ON', 'OFF'], 'OFF', 'ON/OFF:', BLACK
+	)
+	x += 160 + LEFT_MARGIN
+	algorithm_choice_box = ChoiceBox(
+		x, TOP_MARGIN, 160, 18, 12, GREY224, BLACK, list(ALGORITHMS), 'BFS', 'ALGORITHM:', BLACK
+	)
+	mode_choice_box = ChoiceBox(
+		x, algorithm_choice_box.get_rect().bottom + TOP_MARGIN, 160, 18, 12, GREY224, BLACK, ['LIVE', 'REPLAY'],
+		'LIVE', 'MODE:', BLACK
 	)
-	return algorithm_choice_box, node_action_choice_box, on_choice_box
+	speed_choice_box = ChoiceBox(
+		x, mode_choice_box.get_rect().bottom + TOP_MARGIN, 160, 18, 12, GREY224, BLACK, list(SPEEDS), 'x1', 'SPEED:',
+		BLACK
+	)
+	return algorithm_choice_box, node_action_choice_box, on_choice_box, speed_choice_box, mode_choice_box
 
 
 def init_buttons(graph):
 	buttons = []
-	x = 2 * LEFT_MARGIN + graph.columnsCount * graph.nodes[0][0].size + 30
-	y = 4 * TOP_MARGIN + 324 + 4 * 12 + 3 * 18 + 10
+	x = 2 * LEFT_MARGIN + graph.viewWidth + 30
+	y = 3 * TOP_MARGIN + 162 + 102 + 10
 	buttons.append(Button(x, y + 0 * 42, 100, 32, GREY224, GREY240, GREY192, 1, BLACK, 18, "RESET"))
 	buttons.append(Button(x, y + 1 * 42, 100, 32, GREY224, GREY240, GREY192, 1, BLACK, 18, "CLEAN"))
 	buttons.append(Button(x, y + 2 * 42, 100, 32, GREY224, GREY240, GREY192, 1, BLACK, 18, "RANDOM"))
@@ -977,43 +1486,149 @@ def render_buttons_background(graph):
 	pg.draw.rect(
 		window, BLACK,
 		(
-			2 * LEFT_MARGIN + graph.columnsCount * graph.nodes[0][0].size,
-			4 * TOP_MARGIN + 324 + 4 * 12 + 3 * 18,
+			2 * LEFT_MARGIN + graph.viewWidth,
+			3 * TOP_MARGIN + 162 + 102,
 			160,
-			HEIGHT - (4 * TOP_MARGIN + 324 + 4 * 12 + 3 * 18) - TOP_MARGIN
+			HEIGHT - (3 * TOP_MARGIN + 162 + 102) - TOP_MARGIN
 		)
 	)
 	pg.draw.rect(
 		window, GREY224,
 		(
-			2 * LEFT_MARGIN + graph.columnsCount * graph.nodes[0][0].size + 1,
-			4 * TOP_MARGIN + 324 + 4 * 12 + 3 * 18 + 1,
+			2 * LEFT_MARGIN + graph.viewWidth + 1,
+			3 * TOP_MARGIN + 162 + 102 + 1,
 			158,
-			HEIGHT - (4 * TOP_MARGIN + 324 + 4 * 12 + 3 * 18) - TOP_MARGIN - 2
+			HEIGHT - (3 * TOP_MARGIN + 162 + 102) - TOP_MARGIN - 2
 		)
 	)
 
 
-def main():
+def render_window(graph, widgets):
+	"""
+	DRAWS THE STATIC BACKGROUND AND ALL WIDGETS, THE GRAPH IS DRAWN BY ITS NEXT render CALL
+	"""
+	window.fill(BACKGROUND_COLOR)
+	render_buttons_background(graph)
+	for widget in widgets:
+		widget.render(force=True)
+	graph.invalidate_view()
+
+
+def init_profiler(graph, buttons, file_path):
+	# THE OVERLAY FILLS THE FREE SPACE OF THE BUTTONS PANEL, BELOW THE LAST BUTTON:
+	x = 2 * LEFT_MARGIN + graph.viewWidth + 10
+	y = buttons[-1].get_rect().bottom + 12
+	return FrameProfiler(x, y, 140, HEIGHT - TOP_MARGIN - 8 - y, GREY224, BLACK, 12, file_path)
+
+
+def main(arguments=None):
+	parser = argparse.ArgumentParser(description="Pathfinding Visualizer (F3 shows or hides the profiling overlay).")
+	parser.add_argument('--metrics', help="stream per-frame timings and search counters to this .csv or .jsonl file")
+	parser.add_argument('--columns', type=int, default=23, help="columns of a new graph (default: 23)")
+	parser.add_argument('--rows', type=int, default=23, help="rows of a new graph (default: 23)")
+	parser.add_argument('--map', help="show a .txt template, a binary .pfg grid or a Moving AI .map file")
+	args = parser.parse_args(arguments)
+	if args.columns < 1 or args.rows < 1:
+		parser.error("--columns and --rows must be at least 1")
+	if args.columns * args.rows < 2:
+		parser.error("the graph needs at least 2 nodes (for the start and the end)")
+
+	# THE VIEW IS ALWAYS 23 x 23 NODES OF 32 PIXELS, BIGGER GRAPHS ARE ZOOMED OUT TO FIT IT:
+	grid = load_template(args.map) if args.map else None
 	clock = pg.time.Clock()
-	graph = Graph(LEFT_MARGIN, TOP_MARGIN, 23, 23, 32, BLACK, 1, 1, 255, 1)
+	graph = Graph(LEFT_MARGIN, TOP_MARGIN, args.columns, args.rows, 32, BLACK, 1, 1, 255, 1, 23 * 32, 23 * 32, grid)
 
-	algorithm_choice_box, node_action_choice_box, on_choice_box = init_choice_boxes(graph)
+	choice_boxes = list(init_choice_boxes(graph))
+	algorithm_choice_box, node_action_choice_box, on_choice_box, speed_choice_box, mode_choice_box = choice_boxes
 	buttons = init_buttons(graph)
+	profiler = init_profiler(graph, buttons, args.metrics)
 
 	run = True
 	mouse_pos = None
+	caption = None
+
+	# THE STATIC BACKGROUND IS DRAWN ONLY ONCE (AND AGAIN WHEN THE WINDOW IS EXPOSED),
+	# LATER ONLY CHANGED RECTANGLES ARE REDRAWN:
+	render_window(graph, buttons + choice_boxes + [profiler])
+	pg.display.update()
 
 	# MAIN LOOP, THE ENTIRE PROGRAM RUNS HERE:
 	while run:
-		clock.tick(FPS)  # TO NOT EXCEED THE FRAMES PER SECOND LIMIT
+		# WHILE NOTHING IS GOING ON (THE SEARCH IS OFF AND NO MOUSE BUTTON IS HELD), THE LOOP SLEEPS UNTIL AN EVENT COMES,
+		# OTHERWISE IT RUNS AT MOST FPS FRAMES PER SECOND:
+		profiler.start_phase('IDLE')
+		idle = on_choice_box.get_current_option() == 'OFF' and not any(pg.mouse.get_pressed())
+		if idle:
+			event = pg.event.wait(IDLE_TIMEOUT)
+			events = [event] + pg.event.get() if event.type != pg.NOEVENT else []
+			if not events:
+				profiler.end_frame(graph.get_search_counters(), active=False)
+				if profiler.render():
+					pg.display.update(profiler.get_rect())
+				continue
+		else:
+			clock.tick(FPS)
+			events = pg.event.get()
 
-		for event in pg.event.get():
+		profiler.start_phase('EVENTS')
+		exposed = False
+		for event in events:
 			if event.type == pg.QUIT:
 				run = False
 
+			# THE WINDOW HAS BEEN UNCOVERED, SO EVERYTHING IS DRAWN AGAIN:
+			elif event.type == pg.VIDEOEXPOSE or event.type == pg.WINDOWEXPOSED:
+				render_window(graph, buttons + choice_boxes + [profiler])
+				exposed = True
+
+			# F3 SHOWS OR HIDES THE PROFILING OVERLAY:
+			elif event.type == pg.KEYDOWN and event.key == pg.K_F3:
+				profiler.set_visible(not profiler.is_visible())
+
+			# C SHOWS OR HIDES HPA* CLUSTERS AND THE ABSTRACT PATH:
+			elif event.type == pg.KEYDOWN and event.key == pg.K_c:
+				graph.set_clusters_shown(not graph.showClusters)
+
+			# A TURNS THE COMPARISON WITH A* RUN FROM SCRATCH ON OR OFF:
+			elif event.type == pg.KEYDOWN and event.key == pg.K_a:
+				graph.set_comparison_with_a_star(not graph.compareWithAStar)
+
+			# CAMERA (THE WHEEL ZOOMS, DRAGGING WITH THE MIDDLE BUTTON PANS, Z SHOWS THE WHOLE GRAPH):
+			elif event.type == pg.MOUSEWHEEL:
+				graph.zoom_at(pg.mouse.get_pos(), ZOOM_FACTOR ** event.y)
+			elif event.type == pg.MOUSEMOTION and event.buttons[1]:
+				graph.pan(-event.rel[0], -event.rel[1])
+			elif event.type == pg.KEYDOWN and event.key == pg.K_z:
+				graph.fit_to_view()
+
+			# REPLAY CONTROLS (ARROWS STEP, HOME AND END SEEK, B REVERSES, S AND L SAVE AND LOAD THE TRACE):
+			elif event.type == pg.KEYDOWN and mode_choice_box.get_current_option() == 'REPLAY':
+				events_count = 100 if event.mod & pg.KMOD_SHIFT else 1
+				if event.key == pg.K_RIGHT:
+					graph.step_replay(events_count)
+				elif event.key == pg.K_LEFT:
+					graph.step_replay(-events_count)
+				elif event.key == pg.K_HOME:
+					graph.seek_replay(0)
+				elif event.key == pg.K_END:
+					graph.seek_replay(None)
+				elif event.key == pg.K_b:
+					graph.set_replay_backwards(not graph.replayBackwards)
+				elif event.key == pg.K_s:
+					graph.save_trace('Graph templates/saved.trace')
+				elif event.key == pg.K_l and os.path.exists('Graph templates/saved.trace'):
+					if graph.load_trace('Graph templates/saved.trace'):
+						algorithm_choice_box.set_option(graph.algorithm)
+
+			# IN THE LIVE MODE ARROWS PAN THE VIEW BY A QUARTER OF ITS SIZE:
+			elif event.type == pg.KEYDOWN and event.key in (pg.K_LEFT, pg.K_RIGHT, pg.K_UP, pg.K_DOWN):
+				dx = (event.key == pg.K_RIGHT) - (event.key == pg.K_LEFT)
+				dy = (event.key == pg.K_DOWN) - (event.key == pg.K_UP)
+				graph.pan(dx * graph.viewWidth / 4, dy * graph.viewHeight / 4)
+
 			mouse_pos = pg.mouse.get_pos()
 
+		profiler.start_phase('WIDGETS')
 		for btn in buttons:
 			btn.update(mouse_pos)
 
@@ -1037,9 +1652,8 @@ def main():
 					break
 
 		# UPDATING CHOICE BOXES:
-		algorithm_choice_box.update(mouse_pos)
-		node_action_choice_box.update(mouse_pos)
-		on_choice_box.update(mouse_pos)
+		for choice_box in choice_boxes:
+			choice_box.update(mouse_pos)
 
 		node_action = node_action_choice_box.get_current_option()
 
@@ -1047,11 +1661,15 @@ def main():
 			graph.set_algorithm(algorithm_choice_box.get_current_option())
 			graph.reset()
 
-		# CHANGING A NODE STATE:
+		if mode_choice_box.get_state_has_changed():
+			graph.set_replay(mode_choice_box.get_current_option() == 'REPLAY')
+
+		# CHANGING A NODE STATE (EDITS OF WEIGHTS RE-LINK NEIGHBORS):
+		profiler.start_phase('EDITS')
 		if pg.mouse.get_pressed()[0]:
 			col, row = graph.get_node_coordinates(mouse_pos)
 			if 0 <= col < graph.columnsCount and 0 <= row < graph.rowsCount:
-				graph.reset()
+				graph.schedule_reset()
 				if node_action == 'START' or node_action == 'END':
 					graph.safely_change_node_state(col, row, node_action)
 				elif node_action == 'INCREASE':
@@ -1059,11 +1677,15 @@ def main():
 				elif node_action == 'DECREASE':
 					graph.decrease_weight(col, row, 10)
 
+				# LPA* AND HPA* KEEP THEIR PROGRESS BETWEEN EDITS, SO THE PATH IS REPAIRED AT ONCE:
+				if graph.is_incremental():
+					on_choice_box.set_option('ON')
+
 		# REMOVING BARRIERS USING RIGHT MOUSE BUTTON:
 		if pg.mouse.get_pressed()[2]:
 			col, row = graph.get_node_coordinates(mouse_pos)
 			if 0 <= col < graph.columnsCount and 0 <= row < graph.rowsCount:
-				graph.reset()
+				graph.schedule_reset()
 				if node_action == 'START':
 					graph.safely_change_node_state(col, row, 'END')
 				elif node_action == 'END':
@@ -1073,28 +1695,43 @@ def main():
 				elif node_action == 'DECREASE':
 					graph.increase_weight(col, row, 10)
 
-		# UPDATING NEIGHBORS:
-		for x in range(int(graph.columnsCount)):
-			for y in range(int(graph.rowsCount)):
-				graph.get_node(x, y).update_neighbors(graph)
+				if graph.is_incremental():
+					on_choice_box.set_option('ON')
+
+		# ALL EDITS OF THE FRAME ARE FOLLOWED BY AT MOST ONE RESET:
+		graph.apply_scheduled_reset()
+
+		# SHOWING HOW MANY CELLS HAVE BEEN RE-LINKED BY THE LAST EDIT AND THE SUMMARY OF THE FINISHED SEARCH:
+		new_caption = TITLE + " (re-linked cells: " + str(graph.get_relinked_count()) + ")"
+		if graph.get_search_report() is not None:
+			new_caption += " " + graph.get_search_report()
+		if caption != new_caption:
+			caption = new_caption
+			pg.display.set_caption(caption)
 
 		if graph.is_done():
 			on_choice_box.set_option('OFF')
 
+		profiler.start_phase('STEP')
 		if on_choice_box.get_current_option() == 'ON':
-			graph.make_step()
-
-		# RENDERING:
-		window.fill(BACKGROUND_COLOR)
-		graph.render()
-		render_buttons_background(graph)
-		for btn in buttons:
-			btn.render()
-		algorithm_choice_box.render()
-		node_action_choice_box.render()
-		on_choice_box.render()
-		pg.display.update()
+			steps_count, time_budget = SPEEDS[speed_choice_box.get_current_option()]
+			graph.make_step(steps_count, time_budget)
+
+		# RENDERING (ONLY CHANGED RECTANGLES ARE UPDATED ON THE SCREEN):
+		profiler.start_phase('RENDER')
+		dirty_rects = graph.render()
+		for widget in buttons + choice_boxes + [profiler]:
+			if widget.render():
+				dirty_rects.append(widget.get_rect())
+
+		profiler.start_phase('DISPLAY')
+		if exposed:
+			pg.display.update()
+		else:
+			pg.display.update(dirty_rects)
+		profiler.end_frame(graph.get_search_counters())
 
+	profiler.close()
 	pg.quit()
 
 
@@ -0,0 +1,24 @@
+"""
+PATH-FINDING ENGINE OF THE PATHFINDING VISUALIZER.
+
+THE PACKAGE DOESN'T DEPEND ON PYGAME, SO IT CAN BE IMPORTED WITHOUT A DISPLAY (IN WORKERS, TESTS AND BATCH JOBS):
+
+	from solver import Grid, solve
+	grid = Grid(23, 23)
+	result = solve(grid, (0, 0), (22, 22), 'A*')
+"""
+
+from .alt import Landmarks
+from .cache import PathCache
+from .grid import Grid
+from .hpa import ClusterAbstraction
+from .lpa import LPAStar
+from .search import ALGORITHMS
+from .search import Search
+from .search import SearchArrays
+from .search import SearchResult
+from .search import path_cost
+from .search import solve
+from .trace import Trace
+from .trace import TracePlayer
+from .trace import record_trace
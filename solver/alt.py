@@ -0,0 +1,247 @@
+"""
+ALT HEURISTIC (A*, LANDMARKS AND THE TRIANGLE INEQUALITY).
+
+A FEW LANDMARK NODES ARE PICKED FAR FROM EACH OTHER AND THE COSTS OF THE CHEAPEST PATHS FROM EVERY LANDMARK TO ALL
+NODES ARE COMPUTED IN ADVANCE. FOR ANY LANDMARK L THE TRIANGLE INEQUALITY GIVES TWO LOWER BOUNDS OF THE COST d(v, t):
+
+	d(L, t) - d(L, v)        AND        d(v, L) - d(t, L)
+
+THE WEIGHT OF A NODE IS PAID ON ENTERING IT, SO THE PATH BACK COSTS d(v, L) = d(L, v) - weight(v) + weight(L)
+AND ONE DISTANCE FIELD PER LANDMARK IS ENOUGH. ON WEIGHTED MAPS THESE BOUNDS ARE MUCH TIGHTER THAN THE MANHATTAN
+DISTANCE, SO A* EXPANDS FAR FEWER NODES.
+
+DISTANCE FIELDS ARE CACHED ON DISK, IN FILES NAMED AFTER THE HASH OF THE WEIGHTS, SO THEY ARE REUSED BY LATER QUERIES
+AND SESSIONS ON THE SAME MAP. ONLY FIELDS OF WEIGHTS READ FROM A FILE ARE SAVED (AN EDITED MAP IS RARELY MET AGAIN)
+AND THE LEAST RECENTLY USED FILES ARE REMOVED WHEN THE CACHE GROWS BEYOND ITS LIMITS.
+"""
+
+from array import array
+import hashlib
+import heapq
+import os
+import struct
+
+DEFAULT_LANDMARKS_COUNT = 8
+DEFAULT_CACHE_DIR = os.path.join(
+	os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'pathfinding-visualizer'
+)
+
+# limits of the disk cache, above them the least recently used files are removed:
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_CACHE_MAX_FILES = 64
+CACHE_EXTENSION = '.alt'
+
+# distance to nodes which cannot be reached from a landmark:
+UNREACHABLE = 0xFFFFFFFF
+
+CACHE_MAGIC = b'PFAL'
+# magic, columns count, rows count, landmarks count, followed by landmark cells and distance fields (uint32 each):
+CACHE_HEADER = struct.Struct('<4sIII')
+
+
+def distance_field(grid, source):
+	"""
+	RETURNS AN array OF COSTS OF THE CHEAPEST PATHS FROM THE source CELL TO ALL CELLS (DIJKSTRA'S ALGORITHM),
+	CELLS WHICH CANNOT BE REACHED GET UNREACHABLE
+	"""
+	weights = grid.weights
+	links = grid.links
+	offsets_by_links = grid.offsetsByLinks
+	distances = array('I', [UNREACHABLE]) * grid.get_cells_count()
+	distances[source] = 0
+	queue = [(0, source)]
+
+	while queue:
+		distance, current = heapq.heappop(queue)
+		if distance > distances[current]:
+			continue
+		for offset in offsets_by_links[links[current]]:
+			neighbor = current + offset
+			candidate_distance = distance + weights[neighbor]
+			if candidate_distance < distances[neighbor]:
+				distances[neighbor] = candidate_distance
+				heapq.heappush(queue, (candidate_distance, neighbor))
+
+	return distances
+
+
+class Landmarks:
+	"""
+	LANDMARKS OF A GRID WITH THEIR DISTANCE FIELDS, USED AS THE HEURISTIC OF A* (THE 'ALT' ALGORITHM).
+	THE FIRST LANDMARK IS THE NODE FARTHEST FROM THE FIRST PASSABLE NODE, EVERY NEXT ONE IS THE NODE FARTHEST FROM
+	ALL LANDMARKS PICKED SO FAR. IF cache_dir ISN'T None, THE FIELDS ARE READ FROM THAT DIRECTORY AND, IF THE WEIGHTS
+	HAVE BEEN READ FROM A FILE, WRITTEN TO IT. THE DIRECTORY IS KEPT BELOW cache_max_bytes AND cache_max_files.
+
+	AFTER AN EDIT update_cell MARKS THE FIELDS AS OUTDATED (THEY WOULDN'T BE LOWER BOUNDS ANYMORE)
+	AND THEY ARE LOADED OR COMPUTED AGAIN BEFORE THE NEXT SEARCH.
+	"""
+
+	def __init__(
+			self, grid, landmarks_count=DEFAULT_LANDMARKS_COUNT, cache_dir=DEFAULT_CACHE_DIR,
+			cache_max_bytes=DEFAULT_CACHE_MAX_BYTES, cache_max_files=DEFAULT_CACHE_MAX_FILES
+	):
+		info = "ERROR: class Landmarks: __init__ function: following condition isn't met: landmarks_count > 0"
+		assert landmarks_count > 0, info
+		self.grid = grid
+		self.landmarksCount = landmarks_count
+		self.cacheDir = cache_dir
+		self.cacheMaxBytes = cache_max_bytes
+		self.cacheMaxFiles = cache_max_files
+		self.landmarks = []
+		self.fields = []
+		self.isOutdated = True
+		self.loadedFromCache = False
+		self.prepare()
+
+	# ACCESSORS:
+	def get_cache_path(self):
+		"""
+		RETURNS THE PATH OF THE CACHE FILE OF THE CURRENT WEIGHTS OR PYTHONIC None IF THE CACHE IS OFF
+		"""
+		if self.cacheDir is None:
+			return None
+		grid = self.grid
+		key = hashlib.blake2b(digest_size=16)
+		key.update(struct.pack('<IIII', grid.columnsCount, grid.rowsCount, grid.maxWeight, self.landmarksCount))
+		key.update(grid.weights)
+		return os.path.join(self.cacheDir, key.hexdigest() + CACHE_EXTENSION)
+
+	def get_heuristic(self, end):
+		"""
+		RETURNS THE HEURISTIC FUNCTION (CELL ID -> LOWER BOUND OF THE COST OF GETTING TO end) FOR A*.
+		IT IS THE BIGGEST OF THE MANHATTAN DISTANCE AND THE BOUNDS GIVEN BY ALL LANDMARKS WHICH CAN REACH end.
+		"""
+		if self.isOutdated:
+			self.prepare()
+
+		grid = self.grid
+		weights = grid.weights
+		columns_count = grid.columnsCount
+		end_col, end_row = grid.get_position(end)
+		end_weight = weights[end]
+		fields = [(field, field[end]) for field in self.fields if field[end] != UNREACHABLE]
+
+		def heuristic(cell):
+			bound = abs(cell % columns_count - end_col) + abs(cell // columns_count - end_row)
+			for field, to_end in fields:
+				from_landmark = field[cell]
+				if from_landmark != UNREACHABLE:
+					bound = max(bound, to_end - from_landmark, from_landmark - weights[cell] - to_end + end_weight)
+			return bound
+
+		return heuristic
+
+	# MUTATORS:
+	def update_cell(self, cell):
+		"""
+		CALL THE FUNCTION AFTER THE WEIGHT OF THE CELL HAS CHANGED
+		"""
+		self.isOutdated = True
+
+	# OTHER METHODS:
+	def prepare(self):
+		"""
+		LOADS THE LANDMARKS OF THE CURRENT WEIGHTS FROM THE CACHE OR, IF THEY AREN'T THERE, PICKS THEM
+		AND SAVES THEM (ONLY IF THE WEIGHTS HAVE BEEN READ FROM A FILE)
+		"""
+		cache_path = self.get_cache_path()
+		self.loadedFromCache = cache_path is not None and self.load(cache_path)
+		if not self.loadedFromCache:
+			self.pick_landmarks()
+			if cache_path is not None and self.grid.is_loaded():
+				self.save(cache_path)
+				self.evict()
+		self.isOutdated = False
+
+	def pick_landmarks(self):
+		grid = self.grid
+		self.landmarks = []
+		self.fields = []
+		passable = bytes(grid.weights).translate(bytes(int(weight != grid.maxWeight) for weight in range(256)))
+		first = passable.find(1)
+		if first == -1:
+			return
+
+		# THE FARTHEST NODE IS LOOKED FOR AMONG NODES WHICH CAN BE REACHED, SO UNREACHABLE DISTANCES ARE SKIPPED:
+		nearest = distance_field(grid, first)
+		for _ in range(self.landmarksCount):
+			landmark = max(range(len(nearest)), key=lambda cell: nearest[cell] if nearest[cell] != UNREACHABLE else -1)
+			if nearest[landmark] in (0, UNREACHABLE):
+				break
+			field = distance_field(grid, landmark)
+			self.landmarks.append(landmark)
+			self.fields.append(field)
+			nearest = array('I', map(min, nearest, field)) if len(self.fields) > 1 else field
+
+	def load(self, file_path):
+		"""
+		READS LANDMARKS FROM THE CACHE FILE AND RETURNS TRUE, OR RETURNS FALSE IF THE FILE DOESN'T EXIST OR DOESN'T MATCH
+		"""
+		grid = self.grid
+		try:
+			with open(file_path, "rb") as file:
+				magic, columns_count, rows_count, landmarks_count = CACHE_HEADER.unpack(file.read(CACHE_HEADER.size))
+				if (magic, columns_count, rows_count) != (CACHE_MAGIC, grid.columnsCount, grid.rowsCount):
+					return False
+				landmarks = array('I')
+				landmarks.fromfile(file, landmarks_count)
+				fields = []
+				for _ in range(landmarks_count):
+					field = array('I')
+					field.fromfile(file, grid.get_cells_count())
+					fields.append(field)
+		except (OSError, EOFError, struct.error):
+			return False
+
+		# THE MODIFICATION TIME OF A FILE IS THE TIME OF ITS LAST USE, SO evict REMOVES THE LEAST RECENTLY USED FILES:
+		try:
+			os.utime(file_path)
+		except OSError:
+			pass
+		self.landmarks = list(landmarks)
+		self.fields = fields
+		return True
+
+	def save(self, file_path):
+		"""
+		WRITES LANDMARKS TO THE CACHE FILE. THE FILE IS WRITTEN UNDER A TEMPORARY NAME AND THEN RENAMED,
+		SO OTHER PROCESSES NEVER READ IT HALF-WRITTEN. A CACHE WHICH CANNOT BE WRITTEN IS SKIPPED.
+		"""
+		temporary_path = file_path + '.' + str(os.getpid())
+		try:
+			os.makedirs(os.path.dirname(file_path), exist_ok=True)
+			with open(temporary_path, "wb") as file:
+				file.write(CACHE_HEADER.pack(CACHE_MAGIC, self.grid.columnsCount, self.grid.rowsCount, len(self.landmarks)))
+				array('I', self.landmarks).tofile(file)
+				for field in self.fields:
+					field.tofile(file)
+			os.replace(temporary_path, file_path)
+		except OSError:
+			pass
+
+	def evict(self):
+		"""
+		REMOVES THE LEAST RECENTLY USED FILES OF THE CACHE DIRECTORY UNTIL IT HAS AT MOST cacheMaxFiles FILES
+		WHICH TAKE AT MOST cacheMaxBytes BYTES. FILES WHICH CANNOT BE READ OR REMOVED ARE SKIPPED.
+		"""
+		files = []
+		try:
+			with os.scandir(self.cacheDir) as entries:
+				for entry in entries:
+					if entry.name.endswith(CACHE_EXTENSION) and entry.is_file():
+						stat = entry.stat()
+						files.append((stat.st_mtime, stat.st_size, entry.path))
+		except OSError:
+			return
+
+		files_count = len(files)
+		total_size = sum(size for _, size, _ in files)
+		for _, size, file_path in sorted(files):
+			if files_count <= self.cacheMaxFiles and total_size <= self.cacheMaxBytes:
+				break
+			try:
+				os.remove(file_path)
+			except OSError:
+				continue
+			files_count -= 1
+			total_size -= size
@@ -0,0 +1,171 @@
+"""
+OFFLINE SOLVER OF MANY START/END QUERIES ON ONE MAP.
+
+THE MAP (.txt, .pfg OR MOVING AI .map) IS LOADED ONCE AND PUBLISHED IN SHARED MEMORY (SEE solver.shared), WORKER
+PROCESSES ATTACH TO IT WITHOUT COPYING AND QUERIES ARE SENT TO THEM IN CHUNKS.
+RESULTS ARE WRITTEN AS JSON LINES IN THE ORDER OF THE QUERIES, AS SOON AS ALL EARLIER ONES ARE READY:
+
+	python -m solver.batch map.pfg --queries queries.txt --algorithm A* > results.jsonl
+	python -m solver.batch arena.map --queries arena.map.scen
+	echo "0 0 22 22" | python -m solver.batch "Graph templates/maze.txt"
+
+A QUERY IS A LINE OF FOUR INTEGERS: START COLUMN, START ROW, END COLUMN AND END ROW (SEPARATED WITH SPACES OR COMMAS).
+EMPTY LINES AND LINES STARTING WITH # ARE SKIPPED. .scen FILES ARE READ AS MOVING AI SCENARIOS.
+EVERY WORKER KEEPS AN LRU CACHE OF ITS RESULTS, SO REPEATED QUERIES ARE ANSWERED WITHOUT SEARCHING (THEY ARE MARKED
+WITH "cached": true AND KEEP THE TIME OF THE FIRST SEARCH).
+"""
+
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import itertools
+import json
+import os
+import sys
+import time
+
+from .maps import load_template
+from .movingai import load_scenarios
+from .cache import PathCache
+from .search import ALGORITHMS
+from .search import Search
+from .search import SearchArrays
+from .shared import SharedGrid
+from .shared import attach_grid
+
+# Grid, algorithm, results cache and search arrays of the worker process, set once by init_worker:
+worker_grid = None
+worker_algorithm = None
+worker_cache = None
+worker_arrays = None
+
+
+def read_queries(file):
+	"""
+	GENERATOR OF ((START COLUMN, START ROW), (END COLUMN, END ROW)) QUERIES READ FROM AN OPENED TEXT FILE
+	"""
+	for line in file:
+		line = line.strip()
+		if not line or line.startswith('#'):
+			continue
+		numbers = [int(word) for word in line.replace(',', ' ').split()]
+		if len(numbers) != 4:
+			raise AssertionError("ERROR: read_queries function: a query must have 4 numbers, not: " + line)
+		yield (numbers[0], numbers[1]), (numbers[2], numbers[3])
+
+
+def read_scenario_queries(file_path):
+	"""
+	GENERATOR OF QUERIES OF A MOVING AI .scen FILE
+	"""
+	for batch in load_scenarios(file_path):
+		for scenario in batch:
+			yield scenario.startPos, scenario.endPos
+
+
+def solve_query(grid, algorithm, start_pos, end_pos, cache=None, arrays=None):
+	"""
+	RETURNS THE RESULT OF ONE QUERY AS A DICTIONARY: START, END, COST, LENGTH (NUMBER OF NODES), EXPANSIONS AND TIME.
+	QUERIES WITH A START OR END OUTSIDE THE GRID GET AN ERROR INSTEAD. IF cache (A PathCache OF THE GRID) IS GIVEN,
+	RESULTS ARE TAKEN FROM IT AND PUT INTO IT. arrays (SearchArrays OF THE GRID) ARE REUSED BY CONSECUTIVE QUERIES.
+	"""
+	result = {'start': list(start_pos), 'end': list(end_pos)}
+	if not grid.contains(*start_pos) or not grid.contains(*end_pos):
+		result['error'] = "outside the grid"
+		return result
+	if cache is not None:
+		cached_result = cache.get(algorithm, start_pos, end_pos)
+		if cached_result is not None:
+			return dict(cached_result, cached=True)
+
+	begin = time.perf_counter()
+	search = Search(grid, start_pos, end_pos, algorithm, arrays=arrays)
+	path_cells = search.finish_search()
+	elapsed = time.perf_counter() - begin
+
+	weights = grid.weights
+	result['cost'] = sum(weights[cell] for cell in path_cells[1:]) if path_cells is not None else None
+	result['length'] = len(path_cells) if path_cells is not None else None
+	result['expansions'] = search.expansionsCount
+	result['time_s'] = round(elapsed, 6)
+	if cache is not None:
+		cache.put(algorithm, start_pos, end_pos, result)
+	return result
+
+
+def init_worker(descriptor, algorithm, cache_size):
+	global worker_grid, worker_algorithm, worker_cache, worker_arrays
+	worker_grid = attach_grid(descriptor)
+	worker_algorithm = algorithm
+	worker_cache = PathCache(worker_grid, cache_size) if cache_size else None
+	worker_arrays = SearchArrays(worker_grid.get_cells_count())
+
+
+def solve_chunk(queries):
+	"""
+	SOLVES A LIST OF QUERIES ON THE GRID OF THE WORKER AND RETURNS THE LIST OF THEIR RESULTS
+	"""
+	return [
+		solve_query(worker_grid, worker_algorithm, start_pos, end_pos, worker_cache, worker_arrays)
+		for start_pos, end_pos in queries
+	]
+
+
+def solve_all(map_path, queries, algorithm='A*', workers_count=None, chunk_size=64, cache_size=1024):
+	"""
+	GENERATOR OF RESULTS OF ALL QUERIES (AN ITERABLE OF (START POSITION, END POSITION) PAIRS) IN THEIR ORDER.
+	QUERIES ARE READ LAZILY AND ONLY A FEW CHUNKS PER WORKER ARE IN FLIGHT AT ONCE, SO AN ENDLESS STREAM CAN BE SOLVED.
+	IF workers_count IS 0, QUERIES ARE SOLVED IN THIS PROCESS. IF IT IS None, ONE WORKER PER CORE IS STARTED.
+	cache_size IS THE CAPACITY OF THE RESULTS CACHE OF EVERY WORKER, 0 TURNS THE CACHE OFF.
+	"""
+	queries = iter(queries)
+	chunks = iter(lambda: list(itertools.islice(queries, chunk_size)), [])
+
+	grid = load_template(map_path)
+	if workers_count == 0:
+		cache = PathCache(grid, cache_size) if cache_size else None
+		arrays = SearchArrays(grid.get_cells_count())
+		for chunk in chunks:
+			for start_pos, end_pos in chunk:
+				yield solve_query(grid, algorithm, start_pos, end_pos, cache, arrays)
+		return
+
+	workers_count = workers_count or os.cpu_count() or 1
+	with SharedGrid(grid) as shared, ProcessPoolExecutor(
+			workers_count, initializer=init_worker, initargs=(shared.descriptor, algorithm, cache_size)
+	) as executor:
+		pending = deque()
+		for chunk in chunks:
+			pending.append(executor.submit(solve_chunk, chunk))
+			if len(pending) >= 4 * workers_count:
+				yield from pending.popleft().result()
+		while pending:
+			yield from pending.popleft().result()
+
+
+def main(arguments=None):
+	parser = argparse.ArgumentParser(prog='python -m solver.batch', description="Solve many queries on one map.")
+	parser.add_argument('map', help="a .txt template, a binary .pfg grid or a Moving AI .map file")
+	parser.add_argument('--queries', help="file with queries or a Moving AI .scen file (default: standard input)")
+	parser.add_argument('--algorithm', default='A*', choices=list(ALGORITHMS))
+	parser.add_argument('--workers', type=int, help="worker processes, 0 solves in this process (default: one per core)")
+	parser.add_argument('--chunk-size', type=int, default=64, help="queries sent to a worker at once (default: 64)")
+	parser.add_argument('--cache-size', type=int, default=1024, help="results cached by every worker, 0 turns it off")
+	parser.add_argument('--output', help="write JSON lines to this file (default: standard output)")
+	args = parser.parse_args(arguments)
+
+	queries_file = open(args.queries, "r") if args.queries else contextlib.nullcontext(sys.stdin)
+	output = open(args.output, "w") if args.output else contextlib.nullcontext(sys.stdout)
+	with queries_file as queries_file, output as output:
+		if args.queries and args.queries.endswith('.scen'):
+			queries = read_scenario_queries(args.queries)
+		else:
+			queries = read_queries(queries_file)
+		for result in solve_all(args.map, queries, args.algorithm, args.workers, args.chunk_size, args.cache_size):
+			output.write(json.dumps(result) + '\n')
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+HEADLESS BENCHMARK OF THE PATH-FINDING ENGINES.
+
+RUNS EVERY ALGORITHM ON TEMPLATES, RANDOM MAPS AND MAZES OF THE GIVEN SIZES AND RECORDS FOR EVERY RUN:
+WALL TIME, NUMBER OF EXPANSIONS, PEAK QUEUE SIZE (THE LARGEST NUMBER OF NODES WAITING IN THE QUEUE AT ONCE),
+PEAK MEMORY ALLOCATED BY THE SEARCH AND THE PATH COST. RESULTS CAN BE WRITTEN TO JSON AND CSV AND COMPARED
+WITH A BASELINE JSON FILE SAVED BY AN EARLIER RUN:
+
+	python -m solver.benchmark --sizes 23 256 2048 --json baseline.json
+	python -m solver.benchmark --sizes 23 256 2048 --baseline baseline.json
+
+QUERIES OF MOVING AI SCENARIO FILES (.scen, WITH THEIR .map FILES) CAN BE RUN TOO:
+
+	python -m solver.benchmark --maps --scenarios dao/arena.map.scen --queries 2
+
+THE TIME IS MEASURED IN A SEPARATE RUN WITHOUT ANY INSTRUMENTATION, BECAUSE COUNTING QUEUED NODES AND TRACING
+ALLOCATIONS SLOW THE SEARCH DOWN.
+"""
+
+import argparse
+import csv
+import glob
+import importlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from .alt import Landmarks
+from .grid import IN_QUEUE
+from .grid import Grid
+from .maps import load_template
+from .maps import make_maze
+from .maps import make_random
+from .movingai import find_map
+from .movingai import load_map
+from .movingai import load_scenarios
+from .search import ALGORITHMS
+from .search import Search
+from .search import path_cost
+
+MAP_TYPES = ('template', 'random', 'maze')
+FIELDS = (
+	'map', 'map_type', 'columns', 'rows', 'algorithm', 'found', 'path_cost', 'path_length', 'expansions', 'time_s',
+	'peak_queue', 'peak_memory_bytes'
+)
+
+
+def generate_maps(map_types, sizes, templates_dir, seed, scenario_paths=(), queries_count=1):
+	"""
+	GENERATOR OF (NAME, MAP TYPE, Grid) TRIPLES. RANDOM MAPS AND MAZES ARE SQUARE AND REPRODUCIBLE FOR THE SAME SEED.
+	FROM EVERY BUCKET OF EVERY SCENARIO FILE THE FIRST queries_count QUERIES ARE TAKEN. QUERIES OF ONE MAP SHARE ONE Grid,
+	WHICH ONLY GETS NEW START AND END, SO IT MUSTN'T BE KEPT AFTER THE NEXT TRIPLE IS GENERATED.
+	"""
+	if 'template' in map_types:
+		file_paths = glob.glob(os.path.join(templates_dir, '*.txt')) + glob.glob(os.path.join(templates_dir, '*.pfg'))
+		for file_path in sorted(file_paths):
+			# BINARY TEMPLATES KEEP THEIR EXTENSION IN THE NAME, SO A CONVERTED COPY OF A TEXT TEMPLATE HAS ITS OWN RESULTS:
+			name = os.path.basename(file_path)
+			yield name[:-len('.txt')] if name.endswith('.txt') else name, 'template', load_template(file_path)
+
+	for size in sizes:
+		if 'random' in map_types:
+			grid = Grid(size, size)
+			make_random(grid, random.Random(seed * 1000003 + size))
+			yield 'random-' + str(size), 'random', grid
+		if 'maze' in map_types:
+			grid = Grid(size, size)
+			make_maze(grid, random.Random(seed * 1000003 + size))
+			yield 'maze-' + str(size), 'maze', grid
+
+	# THE LAST LOADED MAP IS REUSED, BECAUSE QUERIES OF ONE MAP FOLLOW EACH OTHER:
+	grid = grid_path = None
+	for scenario_path in scenario_paths:
+		for batch in load_scenarios(scenario_path):
+			for index, scenario in enumerate(batch[:queries_count]):
+				map_path = find_map(scenario_path, scenario.mapName)
+				if map_path != grid_path:
+					grid, grid_path = load_map(map_path), map_path
+				grid.set_endpoints(scenario.startPos, scenario.endPos)
+				name = os.path.splitext(os.path.basename(map_path))[0] + '-' + str(scenario.bucket) + '-' + str(index)
+				yield name, 'movingai', grid
+
+
+def measure(grid, algorithm, profile=True, planner=None):
+	"""
+	RUNS THE ALGORITHM ON THE GRID (BETWEEN ITS START AND END) AND RETURNS A DICTIONARY OF MEASUREMENTS.
+	planner (E.G. Landmarks OF THE GRID) IS PREPARED BEFOREHAND, SO ITS PREPARATION ISN'T MEASURED.
+	"""
+	# THE WAVEFRONT ENGINE IMPORTS NUMPY ON ITS FIRST USE, WHICH WOULD BE COUNTED IN THE TIME OF THE FIRST RUN:
+	if algorithm == 'WAVEFRONT':
+		importlib.import_module('.wavefront', __package__)
+
+	search = Search(grid, grid.startPos, grid.endPos, algorithm, planner=planner)
+	begin = time.perf_counter()
+	search.finish_search()
+	elapsed = time.perf_counter() - begin
+
+	path = search.get_path()
+	result = {
+		'algorithm': algorithm,
+		'found': path is not None,
+		'path_cost': path_cost(grid, path) if path is not None else None,
+		'path_length': len(path) if path is not None else None,
+		'expansions': search.expansionsCount,
+		'time_s': round(elapsed, 6),
+		'peak_queue': None,
+		'peak_memory_bytes': None
+	}
+
+	if profile:
+		states = bytearray(grid.get_cells_count())
+		queue_size = peak_queue = 0
+
+		def on_state_change(cell, state):
+			nonlocal queue_size, peak_queue
+			if state == IN_QUEUE and states[cell] != IN_QUEUE:
+				queue_size += 1
+				peak_queue = max(peak_queue, queue_size)
+			elif state != IN_QUEUE and states[cell] == IN_QUEUE:
+				queue_size -= 1
+			states[cell] = state
+
+		tracemalloc.start()
+		Search(grid, grid.startPos, grid.endPos, algorithm, on_state_change, planner).finish_search()
+		result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		result['peak_queue'] = peak_queue
+
+	return result
+
+
+def run(
+		algorithms, map_types, sizes, templates_dir='Graph templates', seed=0, profile=True, log=None, scenario_paths=(),
+		queries_count=1
+):
+	"""
+	RUNS THE WHOLE BENCHMARK AND RETURNS THE LIST OF RESULTS (DICTIONARIES WITH FIELDS)
+	"""
+	results = []
+	maps = generate_maps(map_types, sizes, templates_dir, seed, scenario_paths, queries_count)
+	for name, map_type, grid in maps:
+		for algorithm in algorithms:
+			# LANDMARKS ARE PRECOMPUTED (OR READ FROM THE DISK CACHE) ONCE PER MAP, LIKE IN REAL USE:
+			planner = Landmarks(grid) if algorithm == 'ALT' else None
+			result = {'map': name, 'map_type': map_type, 'columns': grid.columnsCount, 'rows': grid.rowsCount}
+			result.update(measure(grid, algorithm, profile, planner))
+			results.append(result)
+			if log is not None:
+				log(format_result(result))
+	return results
+
+
+def format_result(result):
+	return "%-14s %-12s %10s exp %10s peak queue %10.4f s  cost %s" % (
+		result['map'], result['algorithm'], result['expansions'], result['peak_queue'], result['time_s'], result['path_cost']
+	)
+
+
+def compare(results, baseline, time_tolerance=0.2, min_time_difference=0.005):
+	"""
+	RETURNS THE LIST OF REGRESSIONS (STRINGS) OF results AGAINST baseline (A LIST OF RESULTS OF AN EARLIER RUN).
+	A RUN HAS REGRESSED IF IT IS SLOWER BY MORE THAN time_tolerance (AND BY MORE THAN min_time_difference SECONDS),
+	IF IT EXPANDS MORE NODES OR IF IT FINDS A PATH OF A DIFFERENT COST.
+	"""
+	baseline_results = {(result['map'], result['algorithm']): result for result in baseline}
+	regressions = []
+	for result in results:
+		key = result['map'], result['algorithm']
+		if key not in baseline_results:
+			continue
+		before = baseline_results[key]
+		name = result['map'] + " " + result['algorithm'] + ": "
+		if result['path_cost'] != before['path_cost']:
+			regressions.append(name + "path cost " + str(before['path_cost']) + " -> " + str(result['path_cost']))
+		if result['expansions'] > before['expansions']:
+			regressions.append(name + "expansions " + str(before['expansions']) + " -> " + str(result['expansions']))
+		slowdown = result['time_s'] - before['time_s']
+		if slowdown > min_time_difference and result['time_s'] > before['time_s'] * (1 + time_tolerance):
+			regressions.append(name + "time " + str(before['time_s']) + " s -> " + str(result['time_s']) + " s")
+	return regressions
+
+
+def save_json(results, file_path):
+	with open(file_path, "w") as file:
+		json.dump({'python': platform.python_version(), 'results': results}, file, indent=1)
+
+
+def load_json(file_path):
+	with open(file_path, "r") as file:
+		return json.load(file)['results']
+
+
+def save_csv(results, file_path):
+	with open(file_path, "w", newline='') as file:
+		writer = csv.DictWriter(file, FIELDS)
+		writer.writeheader()
+		writer.writerows(results)
+
+
+def main(arguments=None):
+	parser = argparse.ArgumentParser(prog='python -m solver.benchmark', description="Benchmark path-finding engines.")
+	parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+	parser.add_argument('--maps', nargs='*', default=list(MAP_TYPES), choices=MAP_TYPES)
+	parser.add_argument(
+		'--sizes', nargs='+', type=int, default=[23, 128, 512, 2048],
+		help="sizes of random maps and mazes (default: 23 128 512 2048, 2048 x 2048 maps take most of the time,"
+		" pass smaller sizes for a quick run)"
+	)
+	parser.add_argument('--templates', default='Graph templates', help="directory with *.txt and *.pfg templates")
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--scenarios', nargs='+', default=[], help="Moving AI .scen files to run")
+	parser.add_argument('--queries', type=int, default=1, help="queries taken from every bucket of a .scen file")
+	parser.add_argument('--no-profile', action='store_true', help="skip measuring peak queue and peak memory")
+	parser.add_argument('--json', help="write results to this JSON file")
+	parser.add_argument('--csv', help="write results to this CSV file")
+	parser.add_argument('--baseline', help="compare results with this JSON file, exit with 1 on regressions")
+	parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown (default: 0.2)")
+	args = parser.parse_args(arguments)
+
+	results = run(
+		args.algorithms, args.maps, args.sizes, args.templates, args.seed, not args.no_profile, print, args.scenarios,
+		args.queries
+	)
+	if args.json:
+		save_json(results, args.json)
+	if args.csv:
+		save_csv(results, args.csv)
+
+	if args.baseline:
+		regressions = compare(results, load_json(args.baseline), args.tolerance)
+		for regression in regressions:
+			print("REGRESSION: " + regression)
+		if regressions:
+			return 1
+		print("No regressions.")
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+from .search import solve
+
+DEFAULT_CACHE_CAPACITY = 1024
+
+
+class PathCache:
+	"""
+	BOUNDED LRU CACHE OF QUERIES SOLVED ON ONE GRID. A RESULT IS KEPT UNDER (GRID VERSION, ALGORITHM, START, END)
+	AND ANY CHANGE OF WEIGHTS (WHICH GIVES THE GRID A NEW VERSION) INVALIDATES ALL RESULTS COMPUTED BEFORE IT.
+
+	hitsCount AND missesCount COUNT QUERIES ANSWERED FROM THE CACHE AND QUERIES WHICH HAD TO BE SOLVED,
+	evictionsCount COUNTS RESULTS DROPPED TO MAKE ROOM FOR NEW ONES AND invalidationsCount RESULTS DROPPED
+	BECAUSE THE WEIGHTS HAVE CHANGED.
+	"""
+
+	def __init__(self, grid, capacity=DEFAULT_CACHE_CAPACITY):
+		info = "ERROR: class PathCache: __init__ function: following condition isn't met: capacity > 0"
+		assert capacity > 0, info
+		self.grid = grid
+		self.capacity = capacity
+		self.version = grid.version
+		self.results = OrderedDict()
+		self.hitsCount = 0
+		self.missesCount = 0
+		self.evictionsCount = 0
+		self.invalidationsCount = 0
+
+	def __len__(self):
+		return len(self.results)
+
+	# ACCESSORS:
+	def get(self, algorithm, start_pos, end_pos):
+		"""
+		RETURNS THE CACHED SearchResult OF THE QUERY OR PYTHONIC None (COUNTS A HIT OR A MISS)
+		"""
+		self.invalidate_outdated()
+		key = self.version, algorithm, tuple(start_pos), tuple(end_pos)
+		result = self.results.get(key)
+		if result is None:
+			self.missesCount += 1
+			return None
+		self.results.move_to_end(key)
+		self.hitsCount += 1
+		return result
+
+	def get_counters(self):
+		return {
+			'hits': self.hitsCount, 'misses': self.missesCount, 'evictions': self.evictionsCount,
+			'invalidations': self.invalidationsCount
+		}
+
+	# MUTATORS:
+	def put(self, algorithm, start_pos, end_pos, result):
+		"""
+		CACHES THE SearchResult OF THE QUERY, DROPPING THE LEAST RECENTLY USED RESULT IF THE CACHE IS FULL
+		"""
+		self.invalidate_outdated()
+		key = self.version, algorithm, tuple(start_pos), tuple(end_pos)
+		self.results[key] = result
+		self.results.move_to_end(key)
+		if len(self.results) > self.capacity:
+			self.results.popitem(last=False)
+			self.evictionsCount += 1
+
+	def invalidate_outdated(self):
+		"""
+		DROPS ALL RESULTS IF THE WEIGHTS OF THE GRID HAVE CHANGED SINCE THEY WERE COMPUTED
+		"""
+		if self.grid.version != self.version:
+			self.invalidationsCount += len(self.results)
+			self.results.clear()
+			self.version = self.grid.version
+
+	# OTHER METHODS:
+	def solve(self, start_pos, end_pos, algorithm='BFS'):
+		"""
+		RETURNS THE SearchResult OF THE QUERY FROM THE CACHE OR SOLVES IT (LIKE solver.solve) AND CACHES THE RESULT.
+		THE RESULT IS SHARED WITH LATER HITS, SO IT MUSTN'T BE CHANGED.
+		"""
+		result = self.get(algorithm, start_pos, end_pos)
+		if result is None:
+			result = solve(self.grid, start_pos, end_pos, algorithm)
+			self.put(algorithm, start_pos, end_pos, result)
+		return result
@@ -0,0 +1,392 @@
+from array import array
+import itertools
+import mmap
+import struct
+import zlib
+
+# Node states, stored as one byte per node:
+STATES = (None, 'START', 'END', 'ACTIVE', 'IN_QUEUE', 'CLOSED', 'IN_PATH')
+NO_STATE, START, END, ACTIVE, IN_QUEUE, CLOSED, IN_PATH = range(len(STATES))
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+# translation table of states which keeps only START and END:
+ENDPOINTS_TABLE = bytes(code if code in (START, END) else NO_STATE for code in range(256))
+
+# Bits of the adjacency mask, a bit is set if the neighbor in that direction exists and isn't a barrier:
+LINK_UP, LINK_LEFT, LINK_DOWN, LINK_RIGHT = 1, 2, 4, 8
+
+# Versions of weights, unique among all grids of the process:
+VERSIONS = itertools.count(1)
+
+# Binary grid file (.pfg): the header is followed by the uint8 weights plane and the uint8 adjacency plane.
+GRID_MAGIC = b'PFG1'
+# magic, columns count, rows count, min weight, max weight, start cell, end cell (-1 if missing), planes checksum:
+GRID_HEADER = struct.Struct('<4sIIBBqqI')
+
+
+class Grid:
+	"""
+	RECTANGULAR GRID OF NODES, WHERE EACH VERTEX HAS 4 NEIGHBORS.
+	A NODE WHICH WEIGHT IS EQUAL TO maxWeight IS A BARRIER THAT CANNOT BE CROSSED.
+
+	WEIGHTS ARE STORED IN A uint8 ARRAY AND STATES IN A BYTE ARRAY, BOTH INDEXED BY THE CELL ID: row * columnsCount + col.
+	THE ADJACENCY IS KEPT AS ONE BYTE OF LINK_* BITS PER CELL. IT IS COMPUTED ONCE AND THEN PATCHED ONLY AROUND CELLS
+	WHICH BECOME OR STOP BEING BARRIERS. relinkedCount IS THE NUMBER OF CELLS RE-LINKED BY THE LAST WEIGHT CHANGE.
+	version CHANGES WITH EVERY CHANGE OF WEIGHTS AND IS NEVER SHARED WITH ANOTHER GRID, SO RESULTS COMPUTED ON THE GRID
+	CAN BE CACHED BY IT. loadedVersion IS THE version OF WEIGHTS READ FROM A FILE (OR None), SO CACHES KEPT ON DISK
+	CAN TELL WEIGHTS WHICH WILL BE MET AGAIN FROM ONE-OFF EDITS.
+	weights AND links MAY BE GIVEN AS READY BUFFERS (E.G. VIEWS OF A MAPPED FILE), THEN THEY ARE USED WITHOUT COPYING
+	AND THE ADJACENCY ISN'T COMPUTED, SO links MUST MATCH weights.
+	THE CLASS DOESN'T DEPEND ON PYGAME, SO IT CAN BE USED IN WORKERS, TESTS AND BATCH JOBS.
+	"""
+
+	def __init__(
+			self, columns_count, rows_count, min_weight=1, max_weight=255, default_weight=1, weights=None, links=None
+	):
+		info = "ERROR: class Grid: __init__ function: following condition isn't met: 0 < min_weight < max_weight < 256"
+		info += " (0 < " + str(min_weight) + " < " + str(max_weight) + " < 256)"
+		assert 0 < min_weight < max_weight < 256, info
+		self.columnsCount = int(columns_count)
+		self.rowsCount = int(rows_count)
+		self.minWeight = min_weight
+		self.maxWeight = max_weight
+		if weights is None:
+			weights = array('B', [default_weight]) * (self.columnsCount * self.rowsCount)
+		info = "ERROR: class Grid: __init__ function: wrong number of weights"
+		assert len(weights) == self.columnsCount * self.rowsCount, info
+		self.weights = weights
+		self.states = bytearray(self.columnsCount * self.rowsCount)
+		self.startPos = None
+		self.endPos = None
+		self.relinkedCount = 0
+		self.version = next(VERSIONS)
+		self.loadedVersion = None
+
+		# neighbor offsets for every possible adjacency mask (in the order: UP, LEFT, DOWN, RIGHT):
+		offsets = ((LINK_UP, -self.columnsCount), (LINK_LEFT, -1), (LINK_DOWN, self.columnsCount), (LINK_RIGHT, 1))
+		self.offsetsByLinks = [tuple(offset for bit, offset in offsets if links & bit) for links in range(16)]
+		if links is None:
+			self.links = bytearray(self.columnsCount * self.rowsCount)
+			self.build_links()
+		else:
+			assert len(links) == len(weights), "ERROR: class Grid: __init__ function: wrong number of links"
+			self.links = links
+
+	# Accessors:
+	def get_cells_count(self):
+		return self.columnsCount * self.rowsCount
+
+	def get_id(self, col, row):
+		"""
+		RETURNS THE CELL ID OF THE NODE IN THE GIVEN COLUMN AND ROW
+		"""
+		return row * self.columnsCount + col
+
+	def get_position(self, cell):
+		"""
+		RETURNS THE COLUMN AND ROW OF THE NODE WITH THE GIVEN CELL ID
+		"""
+		return cell % self.columnsCount, cell // self.columnsCount
+
+	def contains(self, col, row):
+		"""
+		RETURNS TRUE IF THE GIVEN COLUMN AND ROW ARE INSIDE THE GRID
+		"""
+		return 0 <= col < self.columnsCount and 0 <= row < self.rowsCount
+
+	def is_loaded(self):
+		"""
+		RETURNS TRUE IF THE WEIGHTS HAVEN'T CHANGED SINCE THEY WERE READ FROM A FILE (A TEMPLATE, A BINARY GRID OR A MAP)
+		"""
+		return self.version == self.loadedVersion
+
+	def get_weight(self, col, row):
+		"""
+		RETURNS THE WEIGHT OF THE NODE IN THE GIVEN COLUMN AND ROW
+		"""
+		return self.weights[row * self.columnsCount + col]
+
+	def get_state(self, col, row):
+		"""
+		RETURNS CURRENT NODE STATE AS A STRING, BUT IF THE NODE HASN'T GOT ANY STATE, FUNCTION RETURNS PYTHONIC None
+		"""
+		return STATES[self.states[row * self.columnsCount + col]]
+
+	def is_barrier(self, col, row):
+		"""
+		RETURNS TRUE IF THE NODE CANNOT BE CROSSED
+		"""
+		return self.weights[row * self.columnsCount + col] == self.maxWeight
+
+	def get_uniform_weight(self):
+		"""
+		RETURNS THE WEIGHT SHARED BY ALL NODES WHICH ARE NOT BARRIERS,
+		OR PYTHONIC None IF THEIR WEIGHTS DIFFER (OR IF ALL NODES ARE BARRIERS)
+		"""
+		weights = set(bytes(self.weights))
+		weights.discard(self.maxWeight)
+		return weights.pop() if len(weights) == 1 else None
+
+	def find_barriers(self):
+		"""
+		RETURNS THE SET OF CELL IDS OF ALL BARRIERS
+		"""
+		weights = bytes(self.weights)
+		barrier = bytes([self.maxWeight])
+		barriers = set()
+		cell = weights.find(barrier)
+		while cell != -1:
+			barriers.add(cell)
+			cell = weights.find(barrier, cell + 1)
+		return barriers
+
+	def get_neighbors(self, cell):
+		"""
+		RETURNS CELL IDS OF ALL NEIGHBORS OF THE CELL WHICH ARE NOT BARRIERS
+		(IN THE ORDER: UP, LEFT, DOWN, RIGHT)
+		"""
+		return [cell + offset for offset in self.offsetsByLinks[self.links[cell]]]
+
+	# Adjacency:
+	def compute_links(self, cell):
+		"""
+		RETURNS THE ADJACENCY MASK OF THE CELL COMPUTED FROM THE WEIGHTS OF ITS NEIGHBORS
+		"""
+		columns_count = self.columnsCount
+		weights = self.weights
+		max_weight = self.maxWeight
+		col = cell % columns_count
+		links = 0
+
+		# UP:
+		if cell >= columns_count and weights[cell - columns_count] != max_weight:
+			links |= LINK_UP
+
+		# LEFT:
+		if col > 0 and weights[cell - 1] != max_weight:
+			links |= LINK_LEFT
+
+		# DOWN:
+		if cell + columns_count < len(weights) and weights[cell + columns_count] != max_weight:
+			links |= LINK_DOWN
+
+		# RIGHT:
+		if col < columns_count - 1 and weights[cell + 1] != max_weight:
+			links |= LINK_RIGHT
+
+		return links
+
+	def build_links(self):
+		"""
+		COMPUTES THE WHOLE ADJACENCY FROM SCRATCH
+		"""
+		columns_count = self.columnsCount
+		cells_count = len(self.weights)
+
+		# FIRST ALL CELLS ARE LINKED WITH ALL NEIGHBORS THAT EXIST:
+		self.links = bytearray([LINK_UP | LINK_LEFT | LINK_DOWN | LINK_RIGHT]) * cells_count
+		for cell in range(columns_count):
+			self.links[cell] &= ~LINK_UP
+			self.links[cells_count - 1 - cell] &= ~LINK_DOWN
+		for cell in range(0, cells_count, columns_count):
+			self.links[cell] &= ~LINK_LEFT
+			self.links[cell + columns_count - 1] &= ~LINK_RIGHT
+
+		# THEN LINKS POINTING TO BARRIERS ARE REMOVED:
+		weights = bytes(self.weights)
+		barrier = bytes([self.maxWeight])
+		cell = weights.find(barrier)
+		while cell != -1:
+			self.relink_around(cell)
+			cell = weights.find(barrier, cell + 1)
+
+	def relink_around(self, cell):
+		"""
+		CALL THE FUNCTION AFTER THE CELL HAS BECOME OR HAS STOPPED BEING A BARRIER.
+		UPDATES THE LINKS OF ITS NEIGHBORS POINTING TO IT AND RETURNS HOW MANY CELLS HAVE BEEN RE-LINKED.
+		"""
+		columns_count = self.columnsCount
+		col = cell % columns_count
+		passable = self.weights[cell] != self.maxWeight
+		relinked = 0
+
+		# THE UPPER NEIGHBOR POINTS DOWN TO THE CELL, THE LEFT ONE POINTS RIGHT AND SO ON:
+		for neighbor, bit, exists in (
+				(cell - columns_count, LINK_DOWN, cell >= columns_count),
+				(cell - 1, LINK_RIGHT, col > 0),
+				(cell + columns_count, LINK_UP, cell + columns_count < len(self.links)),
+				(cell + 1, LINK_LEFT, col < columns_count - 1)
+		):
+			if exists:
+				links = self.links[neighbor] | bit if passable else self.links[neighbor] & ~bit
+				if links != self.links[neighbor]:
+					self.links[neighbor] = links
+					relinked += 1
+
+		return relinked
+
+	# Mutators:
+	def set_weight(self, col, row, weight):
+		"""
+		TAKES AS THE ARGUMENT WEIGHT, WHICH IS A NUMBER IN RANGE minWeight-maxWeight
+		"""
+		if not self.minWeight <= weight <= self.maxWeight:
+			info = "ERROR: class Grid: set_weight function: following condition isn't met: min_weight <= weight <= max_weight"
+			info += " (" + str(self.minWeight) + " <= " + str(weight) + " <= " + str(self.maxWeight) + ")"
+			raise AssertionError(info)
+		cell = row * self.columnsCount + col
+		if self.weights[cell] != weight:
+			self.version = next(VERSIONS)
+		was_barrier = self.weights[cell] == self.maxWeight
+		self.weights[cell] = weight
+		self.relinkedCount = self.relink_around(cell) if was_barrier != (weight == self.maxWeight) else 0
+
+	def replace_weights(self, weights):
+		"""
+		REPLACES ALL WEIGHTS WITH THE GIVEN uint8 ARRAY (OF THE SAME LENGTH).
+		ONLY CELLS WHICH HAVE BECOME OR HAVE STOPPED BEING BARRIERS ARE RE-LINKED.
+		"""
+		assert len(weights) == len(self.weights), "ERROR: class Grid: replace_weights function: wrong number of weights"
+		old_barriers = self.find_barriers()
+		self.weights = weights
+		self.version = next(VERSIONS)
+		self.relinkedCount = 0
+		for cell in old_barriers.symmetric_difference(self.find_barriers()):
+			self.relinkedCount += self.relink_around(cell)
+
+	def fill_weights(self, weight):
+		"""
+		SETS ALL WEIGHTS IN THE GRID TO THE GIVEN VALUE
+		"""
+		self.replace_weights(array('B', [weight]) * len(self.weights))
+
+	def mark_loaded(self):
+		"""
+		CALL THE FUNCTION AFTER THE WEIGHTS HAVE BEEN READ FROM A FILE
+		"""
+		self.loadedVersion = self.version
+
+	def set_state(self, col, row, state):
+		"""
+		TAKES AS THE ARGUMENT STRING OR PYTHONIC None.
+		SETTING 'START' OR 'END' MOVES THE START OR END NODE FROM ITS PREVIOUS POSITION.
+		"""
+		if state == 'START':
+			if self.startPos is not None:
+				self.states[self.get_id(*self.startPos)] = NO_STATE
+			self.startPos = col, row
+		elif state == 'END':
+			if self.endPos is not None:
+				self.states[self.get_id(*self.endPos)] = NO_STATE
+			self.endPos = col, row
+		self.states[row * self.columnsCount + col] = STATE_CODES[state]
+
+	def set_endpoints(self, start_pos, end_pos):
+		"""
+		MOVES BOTH START AND END NODES AT ONCE (THE NEW START MAY BE WHERE THE OLD END WAS AND VICE VERSA)
+		"""
+		for pos in (self.startPos, self.endPos):
+			if pos is not None:
+				self.states[self.get_id(*pos)] = NO_STATE
+		self.startPos = tuple(start_pos)
+		self.endPos = tuple(end_pos)
+		self.states[self.get_id(*start_pos)] = START
+		self.states[self.get_id(*end_pos)] = END
+
+	def clear_states(self):
+		"""
+		REMOVES ALL STATES EXCEPT START AND END WITH ONE TRANSLATION OF THE WHOLE ARRAY. THE ARRAY IS CHANGED IN PLACE,
+		SO OTHER REFERENCES TO IT (E.G. OF A TracePlayer) STAY VALID.
+		"""
+		self.states[:] = self.states.translate(ENDPOINTS_TABLE)
+
+	# Templates:
+	def save_to_file(self, file_path):
+		"""
+		SAVES THE GRID AS A TEXT TEMPLATE: ONE LINE PER ROW, START AND END NODES ARE WRITTEN AS 'START' AND 'END'
+		"""
+		columns_count = self.columnsCount
+		words = [str(weight) for weight in self.weights]
+		if self.startPos is not None:
+			words[self.get_id(*self.startPos)] = 'START'
+		if self.endPos is not None:
+			words[self.get_id(*self.endPos)] = 'END'
+		with open(file_path, "w") as template:
+			for y in range(self.rowsCount):
+				template.write(' '.join(words[y * columns_count:(y + 1) * columns_count]) + ' \n')
+
+	def load_from_file(self, file_path):
+		"""
+		LOADS A TEXT TEMPLATE SAVED BY save_to_file. ALL STATES ARE REMOVED, NODES MISSING IN THE FILE GET minWeight
+		AND NODES OF THE FILE WHICH DON'T FIT INTO THE GRID ARE SKIPPED.
+		"""
+		weights = array('B', [self.minWeight]) * len(self.weights)
+		self.states = bytearray(len(self.states))
+		self.startPos = None
+		self.endPos = None
+
+		with open(file_path, "r") as template:
+			for y, line in enumerate(template):
+				if y >= self.rowsCount:
+					break
+				for x, word in enumerate(line.split()[:self.columnsCount]):
+					if word == 'START':
+						self.set_state(x, y, 'START')
+					elif word == 'END':
+						self.set_state(x, y, 'END')
+					else:
+						weight = int(word)
+						if not self.minWeight <= weight <= self.maxWeight:
+							info = "ERROR: class Grid: load_from_file function: following condition isn't met: "
+							info += "min_weight <= weight <= max_weight"
+							info += " (" + str(self.minWeight) + " <= " + str(weight) + " <= " + str(self.maxWeight) + ")"
+							raise AssertionError(info)
+						weights[self.get_id(x, y)] = weight
+
+		self.replace_weights(weights)
+		self.mark_loaded()
+
+	def save_binary(self, file_path):
+		"""
+		SAVES THE GRID IN THE BINARY FORMAT: GRID_HEADER, THEN THE RAW WEIGHTS AND LINKS (ONE BYTE PER CELL EACH).
+		THE ADJACENCY IS SAVED TOO, SO LOADING DOESN'T HAVE TO COMPUTE IT AGAIN.
+		"""
+		start = self.get_id(*self.startPos) if self.startPos is not None else -1
+		end = self.get_id(*self.endPos) if self.endPos is not None else -1
+		checksum = zlib.crc32(self.links, zlib.crc32(self.weights))
+		with open(file_path, "wb") as file:
+			file.write(
+				GRID_HEADER.pack(
+					GRID_MAGIC, self.columnsCount, self.rowsCount, self.minWeight, self.maxWeight, start, end, checksum
+				)
+			)
+			file.write(self.weights)
+			file.write(self.links)
+
+	@classmethod
+	def open_binary(cls, file_path, verify=True):
+		"""
+		RETURNS A NEW Grid OF A BINARY FILE SAVED BY save_binary. THE FILE IS MEMORY-MAPPED AND THE WEIGHTS AND LINKS
+		ARE memoryviews OF THE MAPPING, SO NOTHING IS PARSED OR COPIED. THE MAPPING IS COPY-ON-WRITE: EDITS OF THE GRID
+		DON'T CHANGE THE FILE. IF verify IS TRUE, THE CHECKSUM OF BOTH PLANES IS CHECKED.
+		"""
+		with open(file_path, "rb") as file:
+			mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+		header = GRID_HEADER.unpack_from(mapping)
+		magic, columns_count, rows_count, min_weight, max_weight, start, end, checksum = header
+		info = "ERROR: class Grid: open_binary function: "
+		assert magic == GRID_MAGIC, info + file_path + " is not a binary grid file"
+		cells_count = columns_count * rows_count
+		assert len(mapping) == GRID_HEADER.size + 2 * cells_count, info + file_path + " is truncated"
+		weights = memoryview(mapping)[GRID_HEADER.size:GRID_HEADER.size + cells_count]
+		links = memoryview(mapping)[GRID_HEADER.size + cells_count:]
+		if verify:
+			assert zlib.crc32(links, zlib.crc32(weights)) == checksum, info + file_path + " has a wrong checksum"
+
+		grid = cls(columns_count, rows_count, min_weight, max_weight, weights=weights, links=links)
+		grid.mark_loaded()
+		if start != -1:
+			grid.set_state(*grid.get_position(start), 'START')
+		if end != -1:
+			grid.set_state(*grid.get_position(end), 'END')
+		return grid
@@ -0,0 +1,299 @@
+import heapq
+
+from .grid import CLOSED
+from .grid import IN_QUEUE
+
+DEFAULT_CLUSTER_SIZE = 8
+
+# borders are kept only for the right and the lower neighbor of every cluster:
+RIGHT, DOWN = 0, 1
+
+
+class ClusterAbstraction:
+	"""
+	ABSTRACT GRAPH OF HIERARCHICAL PATH-FINDING (HPA*).
+	THE GRID IS DIVIDED INTO SQUARE CLUSTERS OF clusterSize x clusterSize NODES. EVERY MAXIMAL OPEN SEGMENT OF A BORDER
+	BETWEEN TWO CLUSTERS GETS ONE TRANSITION (TWO, AT ITS ENDS, IF IT IS LONGER THAN 5 NODES). NODES OF TRANSITIONS ARE
+	ENTRANCES, CONNECTED BY INTER-CLUSTER EDGES ACROSS BORDERS AND BY INTRA-CLUSTER EDGES, WHICH COSTS ARE THE COSTS OF
+	THE CHEAPEST PATHS INSIDE THE CLUSTER (THE WEIGHT OF A NODE IS PAID ON ENTERING IT, SO EDGES ARE DIRECTED).
+
+	TRANSITIONS AND EDGES ARE COMPUTED LAZILY, WHEN A SEARCH REACHES THE CLUSTER, AND CACHED.
+	CALL update_cell AFTER EVERY WEIGHT CHANGE, IT DROPS ONLY THE CACHE OF THE TOUCHED CLUSTER (AND OF ITS NEIGHBOR,
+	IF THE CELL LIES ON THEIR BORDER).
+	"""
+
+	def __init__(self, grid, cluster_size=DEFAULT_CLUSTER_SIZE):
+		assert cluster_size > 0, "ERROR: class ClusterAbstraction: __init__ function: cluster_size must be positive"
+		self.grid = grid
+		self.clusterSize = cluster_size
+		self.clustersColumnsCount = -(-grid.columnsCount // cluster_size)
+		self.clustersRowsCount = -(-grid.rowsCount // cluster_size)
+		self.transitions = {}
+		self.edges = {}
+		self.builtClustersCount = 0
+		self.abstractPath = None
+
+	# "PRIVATE" METHODS (ARE USED ONLY BY OTHER METHODS OF THIS CLASS):
+	def local_search(self, source, cluster, target=None, backward=False):
+		"""
+		DIJKSTRA'S ALGORITHM LIMITED TO THE CLUSTER. RETURNS (COSTS, FATHERS) DICTIONARIES.
+		backward=True COMPUTES COSTS OF PATHS TO THE SOURCE INSTEAD OF FROM IT (THEN FATHERS ARE NEXT NODES ON THE PATHS).
+		"""
+		grid = self.grid
+		weights = grid.weights
+		columns_count = grid.columnsCount
+		min_col, min_row, max_col, max_row = self.get_cluster_bounds(cluster)
+		costs = {source: 0}
+		fathers = {}
+		queue = [(0, source)]
+
+		while queue:
+			cost, current = heapq.heappop(queue)
+			if cost > costs[current]:
+				continue
+			if current == target:
+				break
+			for neighbor in grid.get_neighbors(current):
+				if not (min_col <= neighbor % columns_count < max_col and min_row <= neighbor // columns_count < max_row):
+					continue
+				candidate_cost = cost + (weights[current] if backward else weights[neighbor])
+				if candidate_cost < costs.get(neighbor, float('inf')):
+					costs[neighbor] = candidate_cost
+					fathers[neighbor] = current
+					heapq.heappush(queue, (candidate_cost, neighbor))
+
+		return costs, fathers
+
+	def build_transitions(self, cluster, direction):
+		grid = self.grid
+		min_col, min_row, max_col, max_row = self.get_cluster_bounds(cluster)
+		if direction == RIGHT:
+			pairs = [(grid.get_id(max_col - 1, row), grid.get_id(max_col, row)) for row in range(min_row, max_row)]
+		else:
+			pairs = [(grid.get_id(col, max_row - 1), grid.get_id(col, max_row)) for col in range(min_col, max_col)]
+
+		transitions = []
+		weights = grid.weights
+		max_weight = grid.maxWeight
+		segment = []
+		for pair in pairs + [None]:
+			if pair is not None and weights[pair[0]] != max_weight and weights[pair[1]] != max_weight:
+				segment.append(pair)
+			elif segment:
+				if len(segment) > 5:
+					transitions += [segment[0], segment[-1]]
+				else:
+					transitions.append(segment[len(segment) // 2])
+				segment = []
+		return transitions
+
+	def build_edges(self, cluster):
+		"""
+		RETURNS {ENTRANCE: [(NEIGHBOR ENTRANCE, COST), ...]} WITH INTER- AND INTRA-CLUSTER EDGES OF THE CLUSTER
+		"""
+		weights = self.grid.weights
+		edges = {}
+		for entrance, other in self.get_crossings(cluster):
+			edges.setdefault(entrance, []).append((other, weights[other]))
+
+		for entrance in edges:
+			costs = self.local_search(entrance, cluster)[0]
+			edges[entrance] += [(other, costs[other]) for other in edges if other != entrance and other in costs]
+		self.builtClustersCount += 1
+		return edges
+
+	def get_crossings(self, cluster):
+		"""
+		RETURNS (ENTRANCE IN THE CLUSTER, ENTRANCE IN THE NEIGHBOR CLUSTER) PAIRS OF ALL BORDERS OF THE CLUSTER
+		"""
+		col, row = cluster % self.clustersColumnsCount, cluster // self.clustersColumnsCount
+		crossings = []
+		if col < self.clustersColumnsCount - 1:
+			crossings += self.get_transitions(cluster, RIGHT)
+		if row < self.clustersRowsCount - 1:
+			crossings += self.get_transitions(cluster, DOWN)
+		if col > 0:
+			crossings += [(inner, outer) for outer, inner in self.get_transitions(cluster - 1, RIGHT)]
+		if row > 0:
+			crossings += [(inner, outer) for outer, inner in self.get_transitions(cluster - self.clustersColumnsCount, DOWN)]
+		return crossings
+
+	# ACCESSORS:
+	def get_cluster(self, cell):
+		col, row = self.grid.get_position(cell)
+		return row // self.clusterSize * self.clustersColumnsCount + col // self.clusterSize
+
+	def get_cluster_bounds(self, cluster):
+		"""
+		RETURNS (MIN COLUMN, MIN ROW, MAX COLUMN, MAX ROW) OF THE CLUSTER, WHERE MAXIMUMS ARE EXCLUDED
+		"""
+		min_col = cluster % self.clustersColumnsCount * self.clusterSize
+		min_row = cluster // self.clustersColumnsCount * self.clusterSize
+		return (
+			min_col, min_row,
+			min(min_col + self.clusterSize, self.grid.columnsCount), min(min_row + self.clusterSize, self.grid.rowsCount)
+		)
+
+	def get_transitions(self, cluster, direction):
+		"""
+		RETURNS (CELL, CELL) PAIRS CROSSING THE RIGHT OR THE LOWER BORDER OF THE CLUSTER
+		"""
+		key = cluster, direction
+		if key not in self.transitions:
+			self.transitions[key] = self.build_transitions(cluster, direction)
+		return self.transitions[key]
+
+	def get_edges(self, cluster):
+		if cluster not in self.edges:
+			self.edges[cluster] = self.build_edges(cluster)
+		return self.edges[cluster]
+
+	def get_abstract_path(self):
+		"""
+		RETURNS CELL IDS OF THE START, THE ENTRANCES AND THE END OF THE LAST FOUND ABSTRACT PATH (OR PYTHONIC None)
+		"""
+		return self.abstractPath
+
+	# MUTATORS:
+	def update_cell(self, cell):
+		"""
+		CALL THE FUNCTION AFTER THE WEIGHT OF THE CELL HAS CHANGED
+		"""
+		col, row = self.grid.get_position(cell)
+		cluster = self.get_cluster(cell)
+		self.edges.pop(cluster, None)
+		cluster_col, cluster_row = col // self.clusterSize, row // self.clusterSize
+
+		# BORDERS GOING THROUGH THE CELL (AND THE CLUSTERS ON THEIR OTHER SIDES):
+		borders = []
+		if col % self.clusterSize == self.clusterSize - 1 and cluster_col < self.clustersColumnsCount - 1:
+			borders.append((cluster, RIGHT, cluster + 1))
+		if col % self.clusterSize == 0 and cluster_col > 0:
+			borders.append((cluster - 1, RIGHT, cluster - 1))
+		if row % self.clusterSize == self.clusterSize - 1 and cluster_row < self.clustersRowsCount - 1:
+			borders.append((cluster, DOWN, cluster + self.clustersColumnsCount))
+		if row % self.clusterSize == 0 and cluster_row > 0:
+			borders.append((cluster - self.clustersColumnsCount, DOWN, cluster - self.clustersColumnsCount))
+		for border_cluster, direction, neighbor_cluster in borders:
+			self.transitions.pop((border_cluster, direction), None)
+			self.edges.pop(neighbor_cluster, None)
+
+	# OTHER METHODS:
+	def find_path(self, search):
+		"""
+		STEP ENGINE FOR Search. CONNECTS THE START AND THE END WITH ENTRANCES OF THEIR CLUSTERS, RUNS A* ON THE ABSTRACT
+		GRAPH (YIELDING ONCE PER ABSTRACT EXPANSION) AND REFINES EVERY ABSTRACT EDGE INTO NODES BY A LOCAL SEARCH.
+		RETURNS THE PATH AS A LIST OF CELL IDS OR None IF THERE IS NO PATH. THE PATH IS USUALLY, BUT NOT ALWAYS, THE SHORTEST.
+		"""
+		grid = self.grid
+		change_state = search.change_state
+		start, end = search.start, search.end
+		columns_count = grid.columnsCount
+		end_col, end_row = search.endPos
+		self.abstractPath = None
+
+		# AN END PUT ON A BARRIER CANNOT BE ENTERED (A START PUT ON A BARRIER IS LEFT LIKE IN THE OTHER ENGINES):
+		if start == end:
+			return [start]
+		if grid.weights[end] == grid.maxWeight:
+			return None
+
+		def heuristic(cell):
+			return abs(cell % columns_count - end_col) + abs(cell // columns_count - end_row)
+
+		# CONNECTING THE START AND THE END WITH THE ABSTRACT GRAPH:
+		start_cluster, end_cluster = self.get_cluster(start), self.get_cluster(end)
+		start_costs = self.local_search(start, start_cluster)[0]
+		start_edges = [(entrance, start_costs[entrance]) for entrance in self.get_edges(start_cluster) if entrance in start_costs]
+		if end in start_costs:
+			start_edges.append((end, start_costs[end]))
+
+		# A START ON A BARRIER ISN'T AN ENTRANCE EVEN ON A BORDER, SO IT IS ALSO CONNECTED WITH ENTRANCES OF OTHER CLUSTERS
+		# THROUGH ITS NEIGHBORS IN THEM (EVERY OTHER CLUSTER HOLDS AT MOST ONE NEIGHBOR OF THE START):
+		start_neighbors = {}
+		if grid.weights[start] == grid.maxWeight:
+			for neighbor in grid.get_neighbors(start):
+				cluster = self.get_cluster(neighbor)
+				if cluster == start_cluster:
+					continue
+				start_neighbors[cluster] = neighbor
+				costs = self.local_search(neighbor, cluster)[0]
+				weight = grid.weights[neighbor]
+				start_edges += [
+					(entrance, weight + costs[entrance]) for entrance in self.get_edges(cluster) if entrance in costs
+				]
+				if end in costs:
+					start_edges.append((end, weight + costs[end]))
+		end_costs = self.local_search(end, end_cluster, backward=True)[0]
+
+		g_scores = {start: 0}
+		fathers = {}
+		closed = set()
+		count = 0
+		open_set = [(heuristic(start), count, start)]
+
+		while open_set:
+			current = heapq.heappop(open_set)[2]
+			if current in closed:
+				continue
+			closed.add(current)
+			if current == end:
+				break
+
+			search.expansionsCount += 1
+			neighbors = self.get_edges(self.get_cluster(current)).get(current, [])
+			if current == start:
+				neighbors = neighbors + start_edges
+			if current in end_costs:
+				neighbors = neighbors + [(end, end_costs[current])]
+
+			g_score = g_scores[current]
+			for neighbor, cost in neighbors:
+				temp_g_score = g_score + cost
+				if temp_g_score < g_scores.get(neighbor, float('inf')):
+					fathers[neighbor] = current
+					g_scores[neighbor] = temp_g_score
+					count += 1
+					heapq.heappush(open_set, (temp_g_score + heuristic(neighbor), count, neighbor))
+					change_state(neighbor, IN_QUEUE)
+
+			change_state(current, CLOSED)
+			yield
+
+		if end not in closed:
+			return None
+
+		self.abstractPath = [end]
+		while self.abstractPath[-1] != start:
+			self.abstractPath.append(fathers[self.abstractPath[-1]])
+		self.abstractPath.reverse()
+
+		# REFINING: NODES ON BOTH SIDES OF A BORDER ARE NEIGHBORS, OTHER ABSTRACT EDGES LIE INSIDE ONE CLUSTER:
+		path = [start]
+		for cell, next_cell in zip(self.abstractPath, self.abstractPath[1:]):
+			cluster, next_cluster = self.get_cluster(cell), self.get_cluster(next_cell)
+			if cell == start and next_cluster in start_neighbors:
+				# THE START ON A BARRIER IS LEFT THROUGH ITS NEIGHBOR IN THE NEXT CLUSTER:
+				cell, cluster = start_neighbors[next_cluster], next_cluster
+				path.append(cell)
+			if cluster != next_cluster:
+				path.append(next_cell)
+				continue
+			local_fathers = self.local_search(cell, cluster, target=next_cell)[1]
+			piece = [next_cell]
+			while piece[-1] != cell:
+				piece.append(local_fathers[piece[-1]])
+			path += reversed(piece[:-1])
+
+		# REFINED PIECES MAY CROSS EACH OTHER, THEN THE LOOP BETWEEN BOTH VISITS OF THE NODE IS CUT OUT:
+		simple_path = []
+		indices = {}
+		for cell in path:
+			if cell in indices:
+				for removed_cell in simple_path[indices[cell] + 1:]:
+					del indices[removed_cell]
+				del simple_path[indices[cell] + 1:]
+			else:
+				indices[cell] = len(simple_path)
+				simple_path.append(cell)
+		return simple_path
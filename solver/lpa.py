@@ -0,0 +1,156 @@
+import heapq
+
+from .grid import CLOSED
+from .grid import IN_QUEUE
+from .search import reconstruct_path
+
+
+class LPAStar:
+	"""
+	LIFELONG PLANNING A*: AN INCREMENTAL VERSION OF A*, WHICH KEEPS ITS g AND rhs VALUES BETWEEN SEARCHES.
+	g IS THE COST OF THE BEST PATH FROM THE START FOUND SO FAR, rhs IS THE ONE-STEP LOOKAHEAD:
+	THE WEIGHT OF THE NODE PLUS THE SMALLEST g OF ITS NEIGHBORS. ONLY NODES WHERE THEY DIFFER (LOCALLY INCONSISTENT NODES)
+	ARE IN THE QUEUE, SO AFTER A WEIGHT EDIT ONLY THE REGION AFFECTED BY IT IS EXPANDED AGAIN.
+
+	CALL update_cell AFTER EVERY WEIGHT CHANGE OF THE GRID. MOVING THE END ONLY REORDERS THE QUEUE
+	(THE g VALUES DON'T DEPEND ON IT), MOVING THE START MAKES THE PLANNER START FROM SCRATCH.
+	THE START IS LEFT LIKE IN THE OTHER ENGINES, EVEN IF IT IS PUT ON A BARRIER.
+	"""
+
+	def __init__(self, grid, start_pos, end_pos):
+		self.grid = grid
+		self.start = None
+		self.end = None
+		self.endCol, self.endRow = None, None
+		self.g = None
+		self.rhs = None
+		self.queue = None
+		self.set_endpoints(start_pos, end_pos)
+
+	# "PRIVATE" METHODS (ARE USED ONLY BY OTHER METHODS OF THIS CLASS):
+	def initialize(self):
+		cells_count = self.grid.get_cells_count()
+		self.g = [float('inf')] * cells_count
+		self.rhs = [float('inf')] * cells_count
+		self.rhs[self.start] = 0
+		self.queue = [self.calculate_key(self.start) + (self.start,)]
+
+	def heuristic(self, cell):
+		columns_count = self.grid.columnsCount
+		return abs(cell % columns_count - self.endCol) + abs(cell // columns_count - self.endRow)
+
+	def calculate_key(self, cell):
+		best = min(self.g[cell], self.rhs[cell])
+		return best + self.heuristic(cell), best
+
+	def get_predecessors(self, cell):
+		"""
+		RETURNS NEIGHBORS FROM WHICH THE CELL CAN BE ENTERED: ITS NEIGHBORS WHICH AREN'T BARRIERS AND THE START,
+		EVEN IF IT IS A BARRIER (LINKS DON'T POINT TO BARRIERS, BUT LINKS OF THE START ITSELF POINT OUT OF IT)
+		"""
+		grid = self.grid
+		neighbors = grid.get_neighbors(cell)
+		if grid.weights[self.start] == grid.maxWeight and cell in grid.get_neighbors(self.start):
+			neighbors.append(self.start)
+		return neighbors
+
+	def update_vertex(self, cell):
+		grid = self.grid
+		g = self.g
+		if cell != self.start:
+			if grid.weights[cell] == grid.maxWeight:
+				self.rhs[cell] = float('inf')
+			else:
+				best = min([g[neighbor] for neighbor in self.get_predecessors(cell)], default=float('inf'))
+				self.rhs[cell] = grid.weights[cell] + best
+		if g[cell] != self.rhs[cell]:
+			heapq.heappush(self.queue, self.calculate_key(cell) + (cell,))
+
+	def get_top(self):
+		"""
+		REMOVES OUTDATED ENTRIES FROM THE TOP OF THE QUEUE AND RETURNS THE KEY OF THE TOP ONE (OR PYTHONIC None)
+		"""
+		queue = self.queue
+		while queue:
+			key1, key2, cell = queue[0]
+			if self.g[cell] != self.rhs[cell] and (key1, key2) == self.calculate_key(cell):
+				return key1, key2
+			heapq.heappop(queue)
+		return None
+
+	# ACCESSORS:
+	def get_cost(self):
+		"""
+		RETURNS THE COST OF THE SHORTEST PATH (AFTER compute_shortest_path HAS FINISHED) OR PYTHONIC None IF THERE IS NO PATH
+		"""
+		cost = self.g[self.end]
+		return None if cost == float('inf') else cost
+
+	# MUTATORS:
+	def set_endpoints(self, start_pos, end_pos):
+		start = self.grid.get_id(*start_pos)
+		end = self.grid.get_id(*end_pos)
+		self.endCol, self.endRow = end_pos
+		if start != self.start:
+			self.start, self.end = start, end
+			self.initialize()
+		elif end != self.end:
+			# ALL KEYS DEPEND ON THE END THROUGH THE HEURISTIC, SO THE QUEUE IS REBUILT WITH NEW KEYS:
+			self.end = end
+			cells = {entry[2] for entry in self.queue}
+			self.queue = [self.calculate_key(cell) + (cell,) for cell in cells if self.g[cell] != self.rhs[cell]]
+			heapq.heapify(self.queue)
+
+	def update_cell(self, cell):
+		"""
+		CALL THE FUNCTION AFTER THE WEIGHT OF THE CELL HAS CHANGED.
+		THE COSTS OF ENTERING THE CELL HAVE CHANGED AND, IF IT HAS BECOME OR STOPPED BEING A BARRIER, ALSO ITS NEIGHBORS
+		HAVE GAINED OR LOST A WAY THROUGH IT.
+		"""
+		self.update_vertex(cell)
+		for neighbor in self.grid.get_neighbors(cell):
+			self.update_vertex(neighbor)
+
+	# OTHER METHODS:
+	def compute_shortest_path(self, search):
+		"""
+		STEP ENGINE FOR Search: REPAIRS g VALUES UNTIL THE END IS CONSISTENT AND NOTHING IN THE QUEUE CAN IMPROVE IT,
+		YIELDING ONCE PER EXPANSION. RETURNS THE PATH AS A LIST OF CELL IDS OR None IF THERE IS NO PATH.
+		"""
+		grid = self.grid
+		change_state = search.change_state
+		g, rhs = self.g, self.rhs
+		end = self.end
+
+		while True:
+			top_key = self.get_top()
+			if top_key is None or (top_key >= self.calculate_key(end) and g[end] == rhs[end]):
+				break
+			current = heapq.heappop(self.queue)[2]
+			search.expansionsCount += 1
+
+			if g[current] > rhs[current]:
+				# OVERCONSISTENT: A CHEAPER PATH HAS BEEN FOUND, IT IS PROPAGATED TO THE NEIGHBORS:
+				g[current] = rhs[current]
+				change_state(current, CLOSED)
+			else:
+				# UNDERCONSISTENT: THE PATH HAS BECOME MORE EXPENSIVE, THE NODE IS INVALIDATED AND REPAIRED LATER:
+				g[current] = float('inf')
+				self.update_vertex(current)
+				change_state(current, IN_QUEUE)
+			for neighbor in grid.get_neighbors(current):
+				self.update_vertex(neighbor)
+				if g[neighbor] != rhs[neighbor]:
+					change_state(neighbor, IN_QUEUE)
+			yield
+
+		if g[end] == float('inf'):
+			return None
+
+		# EVERY WAY INTO A NODE COSTS THE SAME (ITS WEIGHT), SO THE FATHER IS THE NEIGHBOR WITH THE SMALLEST g:
+		fathers = search.fathers
+		cell = end
+		while cell != self.start:
+			fathers[cell] = min(self.get_predecessors(cell), key=g.__getitem__)
+			cell = fathers[cell]
+		return reconstruct_path(fathers, self.start, end)
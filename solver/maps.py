@@ -0,0 +1,137 @@
+"""
+MAP GENERATORS AND TEMPLATE HELPERS USED OUTSIDE THE VISUALIZER (BENCHMARKS, BATCH JOBS).
+
+TEXT TEMPLATES (.txt) CAN BE CONVERTED TO BINARY GRID FILES (.pfg), WHICH ARE MEMORY-MAPPED INSTEAD OF PARSED,
+AND BACK:
+
+	python -m solver.maps "Graph templates/maze.txt" "Graph templates/start.txt"
+	python -m solver.maps big.pfg --output-dir text
+"""
+
+import argparse
+from array import array
+import os
+import random
+import sys
+
+from .grid import Grid
+from .movingai import load_map
+
+
+def make_random(grid, rng=random):
+	"""
+	SETS ALL WEIGHTS TO RANDOM VALUES FROM RANGE <minWeight; maxWeight> (LIKE THE RANDOM BUTTON OF THE VISUALIZER)
+	AND PUTS START AND END IN RANDOM, DIFFERENT POSITIONS. rng IS A random.Random (OR THE random MODULE ITSELF).
+	"""
+	cells_count = grid.get_cells_count()
+	weights_count = grid.maxWeight - grid.minWeight + 1
+
+	# RANDOM BYTES ARE SCALED TO THE RANGE OF WEIGHTS WITH ONE TRANSLATION TABLE, WITHOUT A PYTHON LOOP OVER CELLS
+	# (THE BYTES ARE THE SAME AS GIVEN BY rng.randbytes, WHICH ISN'T AVAILABLE BEFORE PYTHON 3.9):
+	table = bytes(grid.minWeight + value * weights_count // 256 for value in range(256))
+	random_bytes = rng.getrandbits(8 * cells_count).to_bytes(cells_count, 'little')
+	grid.replace_weights(array('B', random_bytes.translate(table)))
+
+	start = rng.randrange(cells_count)
+	end = rng.randrange(cells_count - 1)
+	if end >= start:
+		end += 1
+	grid.set_endpoints(grid.get_position(start), grid.get_position(end))
+
+
+def make_maze(grid, rng=random):
+	"""
+	CARVES A PERFECT MAZE (EXACTLY ONE PATH BETWEEN ANY TWO CORRIDOR NODES) WITH THE RANDOMIZED DEPTH-FIRST SEARCH.
+	CORRIDOR NODES LIE IN EVEN COLUMNS AND ROWS, EVERYTHING ELSE IS A BARRIER UNLESS IT CONNECTS TWO CORRIDOR NODES.
+	START IS PUT IN THE TOP LEFT CORNER AND END IN THE FARTHEST CORRIDOR NODE OF THE BOTTOM RIGHT CORNER.
+	"""
+	columns_count, rows_count = grid.columnsCount, grid.rowsCount
+	weights = array('B', [grid.maxWeight]) * grid.get_cells_count()
+	passage = grid.minWeight
+	weights[0] = passage
+	stack = [(0, 0)]
+
+	while stack:
+		col, row = stack[-1]
+		unvisited = [
+			(col + dx, row + dy) for dx, dy in ((0, -2), (-2, 0), (0, 2), (2, 0))
+			if 0 <= col + dx < columns_count and 0 <= row + dy < rows_count and
+			weights[(row + dy) * columns_count + col + dx] != passage
+		]
+		if not unvisited:
+			stack.pop()
+			continue
+		next_col, next_row = rng.choice(unvisited)
+		weights[(row + next_row) // 2 * columns_count + (col + next_col) // 2] = passage
+		weights[next_row * columns_count + next_col] = passage
+		stack.append((next_col, next_row))
+
+	grid.replace_weights(weights)
+	grid.set_endpoints((0, 0), ((columns_count - 1) // 2 * 2, (rows_count - 1) // 2 * 2))
+
+
+def get_template_size(file_path):
+	"""
+	RETURNS (COLUMNS COUNT, ROWS COUNT) OF A TEXT TEMPLATE SAVED BY Grid.save_to_file
+	"""
+	columns_count = rows_count = 0
+	with open(file_path, "r") as template:
+		for line in template:
+			words_count = len(line.split())
+			if words_count:
+				columns_count = max(columns_count, words_count)
+				rows_count += 1
+	return columns_count, rows_count
+
+
+def load_template(file_path):
+	"""
+	RETURNS A NEW Grid OF THE TEMPLATE SIZE LOADED FROM THE TEMPLATE (A BINARY .pfg FILE, A MOVING AI .map FILE
+	OR A TEXT TEMPLATE). IF THE TEMPLATE HASN'T GOT START OR END,
+	THEY ARE PUT IN THE TOP LEFT AND THE BOTTOM RIGHT CORNERS.
+	"""
+	if file_path.endswith('.pfg'):
+		grid = Grid.open_binary(file_path)
+	elif file_path.endswith('.map'):
+		grid = load_map(file_path)
+	else:
+		grid = Grid(*get_template_size(file_path))
+		grid.load_from_file(file_path)
+	if grid.startPos is None or grid.endPos is None:
+		start_pos = grid.startPos if grid.startPos is not None else (0, 0)
+		end_pos = grid.endPos if grid.endPos is not None else (grid.columnsCount - 1, grid.rowsCount - 1)
+		grid.set_endpoints(start_pos, end_pos)
+	return grid
+
+
+def convert_template(source_path, destination_path):
+	"""
+	CONVERTS A TEXT TEMPLATE TO A BINARY GRID FILE OR THE OTHER WAY ROUND, DEPENDING ON THE EXTENSION OF destination_path
+	"""
+	grid = load_template(source_path)
+	if destination_path.endswith('.pfg'):
+		grid.save_binary(destination_path)
+	else:
+		grid.save_to_file(destination_path)
+
+
+def main(arguments=None):
+	parser = argparse.ArgumentParser(
+		prog='python -m solver.maps', description="Convert text templates (.txt) to binary grid files (.pfg) and back."
+	)
+	parser.add_argument('templates', nargs='+', help="files to convert, .txt files become .pfg and .pfg files become .txt")
+	parser.add_argument('--output-dir', help="write converted files to this directory (default: next to the sources)")
+	args = parser.parse_args(arguments)
+
+	for source_path in args.templates:
+		name, extension = os.path.splitext(source_path)
+		destination_path = name + ('.txt' if extension == '.pfg' else '.pfg')
+		if args.output_dir:
+			destination_path = os.path.join(args.output_dir, os.path.basename(destination_path))
+		convert_template(source_path, destination_path)
+		print(source_path + " -> " + destination_path)
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
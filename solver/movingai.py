@@ -0,0 +1,127 @@
+"""
+IMPORTER OF THE MOVING AI GRID BENCHMARK SETS (https://movingai.com/benchmarks/grids.html).
+
+A .map FILE STARTS WITH A HEADER (type, height, width AND map LINES) FOLLOWED BY ONE LINE OF TERRAIN CHARACTERS
+PER ROW. A .scen FILE HAS A version LINE AND THEN ONE QUERY PER LINE: BUCKET, MAP, WIDTH, HEIGHT, START X, START Y,
+GOAL X, GOAL Y AND THE OPTIMAL LENGTH. THE OPTIMAL LENGTHS ARE COMPUTED FOR 8-CONNECTED GRIDS WITH DIAGONAL MOVES
+COSTING SQRT(2), SO THEY ARE KEPT ONLY FOR REFERENCE AND DON'T MATCH COSTS FOUND ON THE 4-CONNECTED Grid.
+
+BOTH FILES ARE READ LINE BY LINE: MAP ROWS ARE TRANSLATED TO WEIGHTS WITH ONE TABLE LOOKUP PER ROW
+AND QUERIES ARE YIELDED IN BATCHES, SO EVEN THE BIGGEST SETS DON'T HAVE TO BE HELD IN MEMORY AS TEXT.
+"""
+
+from array import array
+import os
+
+from .grid import Grid
+
+# Terrain characters of the .map format mapped to node weights, None stands for a barrier.
+# Passable ground (., G) and swamp (S) cost the same; trees (T), water (W) and out of bounds (@, O) cannot be crossed,
+# as in the published 4-connected and 8-connected ground benchmarks.
+TERRAIN_WEIGHTS = {'.': 1, 'G': 1, 'S': 1, 'T': None, 'W': None, '@': None, 'O': None}
+
+
+class Scenario:
+	"""
+	ONE QUERY OF A .scen FILE: FIND A PATH FROM startPos TO endPos ON THE MAP mapName
+	"""
+
+	def __init__(self, bucket, map_name, start_pos, end_pos, optimal_length):
+		self.bucket = bucket
+		self.mapName = map_name
+		self.startPos = start_pos
+		self.endPos = end_pos
+		self.optimalLength = optimal_length
+
+
+def make_terrain_table(terrain_weights, max_weight):
+	"""
+	RETURNS A bytes.translate TABLE FROM TERRAIN CHARACTERS TO WEIGHTS (BARRIERS GET max_weight, UNKNOWN CHARACTERS 0)
+	"""
+	table = bytearray(256)
+	for character, weight in terrain_weights.items():
+		table[ord(character)] = max_weight if weight is None else weight
+	return bytes(table)
+
+
+def read_map_header(file):
+	"""
+	READS THE HEADER OF AN OPENED .map FILE UP TO THE map LINE AND RETURNS (WIDTH, HEIGHT)
+	"""
+	header = {}
+	for line in file:
+		words = line.split()
+		if words == [b'map']:
+			return int(header[b'width']), int(header[b'height'])
+		if len(words) == 2:
+			header[words[0]] = words[1]
+	raise AssertionError("ERROR: read_map_header function: the file has no map line")
+
+
+def load_map(file_path, terrain_weights=None, min_weight=1, max_weight=255):
+	"""
+	RETURNS A NEW Grid OF THE SIZE GIVEN IN THE HEADER OF A .map FILE, WITH WEIGHTS TAKEN FROM terrain_weights
+	(TERRAIN_WEIGHTS BY DEFAULT). START AND END AREN'T SET, THEY COME FROM SCENARIOS.
+	"""
+	table = make_terrain_table(TERRAIN_WEIGHTS if terrain_weights is None else terrain_weights, max_weight)
+	with open(file_path, "rb") as file:
+		width, height = read_map_header(file)
+		weights = array('B')
+		for row in range(height):
+			line = file.readline().rstrip(b'\r\n')
+			if len(line) != width:
+				info = "ERROR: load_map function: row " + str(row) + " of " + file_path + " has " + str(len(line))
+				info += " characters instead of " + str(width)
+				raise AssertionError(info)
+			row_weights = line.translate(table)
+			if 0 in row_weights:
+				character = chr(line[row_weights.index(0)])
+				raise AssertionError("ERROR: load_map function: unknown terrain " + repr(character) + " in " + file_path)
+			weights.frombytes(row_weights)
+
+	grid = Grid(width, height, min_weight, max_weight, weights=weights)
+	grid.mark_loaded()
+	return grid
+
+
+def load_scenarios(file_path, batch_size=None):
+	"""
+	GENERATOR OF LISTS OF Scenario OBJECTS READ FROM A .scen FILE.
+	IF batch_size IS None, EVERY BUCKET (QUERIES OF SIMILAR LENGTH) IS ONE BATCH,
+	OTHERWISE BATCHES HAVE batch_size QUERIES.
+	"""
+	batch = []
+	with open(file_path, "r") as file:
+		for line in file:
+			words = line.split('\t') if '\t' in line else line.split()
+			if len(words) < 9:
+				continue
+			bucket, map_name = int(words[0]), words[1]
+			start_pos = int(words[4]), int(words[5])
+			end_pos = int(words[6]), int(words[7])
+			if batch and (len(batch) == batch_size or batch_size is None and batch[-1].bucket != bucket):
+				yield batch
+				batch = []
+			batch.append(Scenario(bucket, map_name, start_pos, end_pos, float(words[8])))
+	if batch:
+		yield batch
+
+
+def find_map(scenario_path, map_name):
+	"""
+	RETURNS THE PATH OF THE MAP OF A SCENARIO. MAP NAMES IN .scen FILES ARE OFTEN RELATIVE TO THE ROOT OF THE SET
+	AND SETS KEEP MAPS AND SCENARIOS IN SIBLING DIRECTORIES (E.G. dao-map AND dao-scen), SO THE MAP IS LOOKED FOR
+	RELATIVE TO THE DIRECTORY OF THE .scen FILE AND ITS PARENT, THEN BY ITS FILE NAME IN THE SIBLING DIRECTORIES.
+	"""
+	directory = os.path.dirname(scenario_path)
+	parent = os.path.dirname(os.path.abspath(directory or os.curdir))
+	file_name = os.path.basename(map_name)
+	candidates = [
+		os.path.join(directory, map_name), os.path.join(directory, file_name), os.path.join(parent, map_name),
+		os.path.join(parent, file_name)
+	]
+	candidates += [os.path.join(parent, sibling, file_name) for sibling in sorted(os.listdir(parent))]
+	for candidate in candidates:
+		if os.path.isfile(candidate):
+			return candidate
+	raise AssertionError("ERROR: find_map function: can't find " + map_name + " for " + scenario_path)
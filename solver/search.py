@@ -0,0 +1,693 @@
+from array import array
+from collections import deque
+import heapq
+import importlib.util
+
+from .grid import ACTIVE
+from .grid import CLOSED
+from .grid import IN_PATH
+from .grid import IN_QUEUE
+from .grid import LINK_DOWN
+from .grid import LINK_LEFT
+from .grid import LINK_RIGHT
+from .grid import LINK_UP
+
+
+class SearchArrays:
+	"""
+	PREALLOCATED ARRAYS OF A SEARCH (ONE ENTRY PER CELL), WHICH CAN BE REUSED BY MANY SEARCHES ON GRIDS OF THE SAME SIZE:
+	reached AND closed HOLD THE GENERATION IN WHICH A CELL HAS BEEN REACHED OR CLOSED, fathers, distances AND directions
+	ARE VALID ONLY FOR CELLS REACHED IN THE CURRENT GENERATION. SO reset DOESN'T CLEAR ANYTHING, IT ONLY STARTS A NEW
+	GENERATION AND ALL CELLS BECOME UNREACHED AT ONCE.
+	"""
+
+	def __init__(self, cells_count):
+		self.cellsCount = cells_count
+		self.generation = 0
+		self.reached = array('I', [0]) * cells_count
+		self.closed = array('I', [0]) * cells_count
+		self.fathers = array('i', [-1]) * cells_count
+		self.distances = array('Q', [0]) * cells_count
+		self.directions = bytearray(cells_count)
+		self.backward = None
+
+	# MUTATORS:
+	def reset(self):
+		"""
+		STARTS A NEW GENERATION (THE STAMPS ARE CLEARED ONLY ONCE IN 2 ** 32 - 1 GENERATIONS, WHEN THEY WOULD OVERFLOW)
+		"""
+		self.generation += 1
+		if self.generation == 1 << 32:
+			self.reached = array('I', [0]) * self.cellsCount
+			self.closed = array('I', [0]) * self.cellsCount
+			self.generation = 1
+
+	def get_backward(self):
+		"""
+		RETURNS THE SECOND ARRAYS, USED BY THE BACKWARD SIDE OF BIDIRECTIONAL SEARCHES, IN A NEW GENERATION.
+		THEY ARE CREATED BY THE FIRST CALL AND KEPT WITH THESE ARRAYS.
+		"""
+		if self.backward is None:
+			self.backward = SearchArrays(self.cellsCount)
+		self.backward.reset()
+		return self.backward
+
+
+def reconstruct_path(fathers, start, end):
+	"""
+	RETURNS THE LIST OF CELL IDS FROM START TO END (BOTH INCLUDED) BY FOLLOWING THE FATHERS FROM THE END
+	"""
+	path = [end]
+	while path[-1] != start:
+		path.append(fathers[path[-1]])
+	path.reverse()
+	return path
+
+
+# STEP ENGINES:
+# every algorithm is a generator, which takes a Search, yields once per expansion
+# and finally returns the found path (as a list of cell ids) or None if there is no path.
+
+def bfs(search):
+	grid = search.grid
+	start, end = search.start, search.end
+	if start == end:
+		return [start]
+	fathers = search.fathers
+	change_state = search.change_state
+	reached, generation = search.arrays.reached, search.arrays.generation
+	reached[start] = generation
+	queue = deque([start])
+
+	while queue:
+		current = queue.popleft()
+		search.expansionsCount += 1
+		change_state(current, ACTIVE)
+
+		for neighbor in grid.get_neighbors(current):
+			if reached[neighbor] != generation:
+				reached[neighbor] = generation
+				queue.append(neighbor)
+				fathers[neighbor] = current
+				if neighbor == end:
+					return reconstruct_path(fathers, start, end)
+				change_state(neighbor, IN_QUEUE)
+
+		yield
+		change_state(current, CLOSED)
+
+	return None
+
+
+def dfs(search):
+	grid = search.grid
+	start, end = search.start, search.end
+	if start == end:
+		return [start]
+	fathers = search.fathers
+	change_state = search.change_state
+	reached, generation = search.arrays.reached, search.arrays.generation
+	reached[start] = generation
+	stack = [start]
+
+	while stack:
+		current = stack.pop()
+		search.expansionsCount += 1
+		change_state(current, ACTIVE)
+
+		for neighbor in grid.get_neighbors(current):
+			if reached[neighbor] != generation:
+				reached[neighbor] = generation
+				stack.append(neighbor)
+				fathers[neighbor] = current
+				if neighbor == end:
+					return reconstruct_path(fathers, start, end)
+				change_state(neighbor, IN_QUEUE)
+
+		yield
+		change_state(current, CLOSED)
+
+	return None
+
+
+def dijkstra(search):
+	grid = search.grid
+	start, end = search.start, search.end
+	fathers = search.fathers
+	change_state = search.change_state
+	weights = grid.weights
+	reached, generation = search.arrays.reached, search.arrays.generation
+	distances = search.arrays.distances
+	reached[start] = generation
+	distances[start] = 0
+	priority_queue = [(0, start)]
+
+	while priority_queue:
+		distance, current = heapq.heappop(priority_queue)
+
+		# SKIPPING OUTDATED ENTRIES (THE NODE HAS BEEN PUSHED AGAIN WITH A SMALLER DISTANCE):
+		if distance > distances[current]:
+			continue
+
+		if current == end:
+			return reconstruct_path(fathers, start, end)
+
+		search.expansionsCount += 1
+		change_state(current, ACTIVE)
+
+		for neighbor in grid.get_neighbors(current):
+			candidate_distance = distance + weights[neighbor]
+			if reached[neighbor] != generation or distances[neighbor] > candidate_distance:
+				reached[neighbor] = generation
+				distances[neighbor] = candidate_distance
+				fathers[neighbor] = current
+				heapq.heappush(priority_queue, (candidate_distance, neighbor))
+				change_state(neighbor, IN_QUEUE)
+
+		yield
+		change_state(current, CLOSED)
+
+	return None
+
+
+def a_star(search, heuristic=None):
+	"""
+	A* WITH THE MANHATTAN DISTANCE AS THE HEURISTIC, UNLESS ANOTHER CONSISTENT heuristic (CELL ID -> LOWER BOUND
+	OF THE COST OF GETTING TO THE END) IS GIVEN
+	"""
+	grid = search.grid
+	start, end = search.start, search.end
+	fathers = search.fathers
+	change_state = search.change_state
+	weights = grid.weights
+	columns_count = grid.columnsCount
+	end_col, end_row = search.endPos
+
+	if heuristic is None:
+		def heuristic(cell):
+			return abs(cell % columns_count - end_col) + abs(cell // columns_count - end_row)
+
+	reached, closed, generation = search.arrays.reached, search.arrays.closed, search.arrays.generation
+	g_scores = search.arrays.distances
+	reached[start] = generation
+	g_scores[start] = 0
+	count = 0
+	open_set = [(heuristic(start), count, start)]
+
+	while open_set:
+		current = heapq.heappop(open_set)[2]
+
+		# SKIPPING OUTDATED ENTRIES (THE NODE HAS ALREADY BEEN EXPANDED WITH A BETTER SCORE):
+		if closed[current] == generation:
+			continue
+		closed[current] = generation
+
+		if current == end:
+			return reconstruct_path(fathers, start, end)
+
+		search.expansionsCount += 1
+		g_score = g_scores[current]
+		for neighbor in grid.get_neighbors(current):
+			temp_g_score = g_score + weights[neighbor]
+			if reached[neighbor] != generation or temp_g_score < g_scores[neighbor]:
+				reached[neighbor] = generation
+				fathers[neighbor] = current
+				g_scores[neighbor] = temp_g_score
+				count += 1
+				heapq.heappush(open_set, (temp_g_score + heuristic(neighbor), count, neighbor))
+				change_state(neighbor, IN_QUEUE)
+
+		change_state(current, CLOSED)
+		yield
+
+	return None
+
+
+def jump_point_search(search):
+	"""
+	JUMP POINT SEARCH ON THE 4-CONNECTED GRID: A* WHICH EXPANDS ONLY JUMP POINTS, SKIPPING STRAIGHT RUNS OF SYMMETRIC
+	PATHS. IT'S CORRECT ONLY IF ALL PASSABLE NODES WEIGH THE SAME, ON OTHER GRIDS THE PLAIN A* IS RUN INSTEAD.
+	"""
+	grid = search.grid
+	weight = grid.get_uniform_weight()
+	if weight is None:
+		search.algorithm = 'A*'
+		return (yield from a_star(search))
+
+	start, end = search.start, search.end
+	change_state = search.change_state
+	links = grid.links
+	columns_count = grid.columnsCount
+	end_col, end_row = search.endPos
+
+	# (LINK BIT, CELL ID OFFSET, LINK BITS OF PERPENDICULAR DIRECTIONS) IN THE ORDER: UP, LEFT, DOWN, RIGHT,
+	# SO THE OPPOSITE OF THE DIRECTION d IS d ^ 2:
+	directions = (
+		(LINK_UP, -columns_count, (LINK_LEFT, LINK_RIGHT)),
+		(LINK_LEFT, -1, (LINK_UP, LINK_DOWN)),
+		(LINK_DOWN, columns_count, (LINK_LEFT, LINK_RIGHT)),
+		(LINK_RIGHT, 1, (LINK_UP, LINK_DOWN))
+	)
+	NO_DIRECTION = len(directions)
+
+	def scan(cell, bit, offset, sides):
+		"""
+		MOVES FROM THE CELL IN ONE DIRECTION AND RETURNS THE FIRST JUMP POINT OR -1 IF THE WALL IS HIT BEFORE.
+		A JUMP POINT IS THE END OR A NODE WITH A FORCED NEIGHBOR: A SIDE NEIGHBOR, WHICH IS OPEN THERE,
+		BUT WAS BLOCKED BY A BARRIER NEXT TO THE PREVIOUS NODE.
+		"""
+		while links[cell] & bit:
+			previous = cell
+			cell += offset
+			if cell == end:
+				return cell
+			for side in sides:
+				if links[cell] & side and not links[previous] & side:
+					return cell
+		return -1
+
+	def jump(cell, direction):
+		bit, offset, sides = directions[direction]
+		if bit == LINK_LEFT or bit == LINK_RIGHT:
+			return scan(cell, bit, offset, sides)
+
+		# A VERTICAL MOVE STOPS ALSO AT EVERY NODE, FROM WHICH A HORIZONTAL SCAN FINDS A JUMP POINT:
+		while links[cell] & bit:
+			previous = cell
+			cell += offset
+			if cell == end:
+				return cell
+			for side in sides:
+				if links[cell] & side and not links[previous] & side:
+					return cell
+			if scan(cell, LINK_LEFT, -1, (LINK_UP, LINK_DOWN)) != -1:
+				return cell
+			if scan(cell, LINK_RIGHT, 1, (LINK_UP, LINK_DOWN)) != -1:
+				return cell
+		return -1
+
+	def heuristic(cell):
+		return (abs(cell % columns_count - end_col) + abs(cell // columns_count - end_row)) * weight
+
+	# FATHERS OF JUMP POINTS ARE KEPT IN THE BACKWARD ARRAYS, BECAUSE search.fathers GET ONLY THE FOUND PATH:
+	reached, closed, generation = search.arrays.reached, search.arrays.closed, search.arrays.generation
+	g_scores = search.arrays.distances
+	jump_fathers = search.arrays.get_backward().fathers
+	arrival_directions = search.arrays.directions
+	reached[start] = generation
+	g_scores[start] = 0
+	arrival_directions[start] = NO_DIRECTION
+	count = 0
+	open_set = [(heuristic(start), count, start)]
+
+	while open_set:
+		current = heapq.heappop(open_set)[2]
+
+		# SKIPPING OUTDATED ENTRIES (THE NODE HAS ALREADY BEEN EXPANDED WITH A BETTER SCORE):
+		if closed[current] == generation:
+			continue
+		closed[current] = generation
+
+		if current == end:
+			# JUMP POINTS ARE CONNECTED BY STRAIGHT SEGMENTS, THEIR NODES GET FATHERS ONLY ALONG THE FOUND PATH:
+			fathers = search.fathers
+			cell = end
+			while cell != start:
+				father = jump_fathers[cell]
+				if father // columns_count == cell // columns_count:
+					step = 1 if father > cell else -1
+				else:
+					step = columns_count if father > cell else -columns_count
+				while cell != father:
+					fathers[cell] = cell + step
+					cell += step
+			return reconstruct_path(fathers, start, end)
+
+		search.expansionsCount += 1
+		g_score = g_scores[current]
+		col, row = current % columns_count, current // columns_count
+		for direction in range(len(directions)):
+			# THE WAY BACK IS NEVER A PART OF A SHORTEST PATH:
+			if direction ^ 2 == arrival_directions[current]:
+				continue
+			jump_point = jump(current, direction)
+			if jump_point == -1:
+				continue
+			distance = abs(jump_point % columns_count - col) + abs(jump_point // columns_count - row)
+			temp_g_score = g_score + distance * weight
+			if reached[jump_point] != generation or temp_g_score < g_scores[jump_point]:
+				reached[jump_point] = generation
+				jump_fathers[jump_point] = current
+				arrival_directions[jump_point] = direction
+				g_scores[jump_point] = temp_g_score
+				count += 1
+				heapq.heappush(open_set, (temp_g_score + heuristic(jump_point), count, jump_point))
+				change_state(jump_point, IN_QUEUE)
+
+		change_state(current, CLOSED)
+		yield
+
+	return None
+
+
+def bidirectional_search(search, weighted, guided):
+	"""
+	SEARCHES FORWARDS FROM THE START AND BACKWARDS FROM THE END AT THE SAME TIME, ALWAYS EXPANDING THE SIDE WITH
+	THE SMALLER QUEUE. THE WEIGHT OF A NODE IS PAID ON ENTERING IT, SO GOING BACKWARDS FROM v TO ITS NEIGHBOR u COSTS
+	THE WEIGHT OF v. EVERY TIME A NODE REACHED BY ONE SIDE IS REACHED BY THE OTHER, THE BEST MEETING NODE IS UPDATED.
+	THE SEARCH STOPS WHEN THE SUM OF THE SMALLEST KEYS OF BOTH QUEUES IS NOT SMALLER THAN THE COST OF THE BEST PATH SO FAR,
+	BECAUSE NO PATH FOUND LATER COULD BE CHEAPER.
+
+	weighted=False COUNTS MOVES (LIKE BFS), guided=True ADDS THE AVERAGE OF THE FORWARD AND BACKWARD MANHATTAN DISTANCES
+	AS THE POTENTIAL (A CONSISTENT HEURISTIC FOR BOTH SIDES, SO THE STOP CONDITION STAYS THE SAME AS WITHOUT IT).
+	"""
+	grid = search.grid
+	start, end = search.start, search.end
+	change_state = search.change_state
+	weights = grid.weights
+	columns_count = grid.columnsCount
+	start_col, start_row = search.startPos
+	end_col, end_row = search.endPos
+
+	def potential(cell):
+		col, row = cell % columns_count, cell // columns_count
+		to_end = abs(col - end_col) + abs(row - end_row)
+		to_start = abs(col - start_col) + abs(row - start_row)
+		return (to_end - to_start) / 2
+
+	# EVERYTHING BELOW IS KEPT FOR BOTH SIDES, THE FORWARD ONE (INDEX 0) AND THE BACKWARD ONE (INDEX 1).
+	# THE BACKWARD SIDE REMEMBERS FOR EVERY NODE ITS NEXT NODE ON THE WAY TO THE END:
+	sides_arrays = search.arrays, search.arrays.get_backward()
+	generations = sides_arrays[0].generation, sides_arrays[1].generation
+	reached = sides_arrays[0].reached, sides_arrays[1].reached
+	scores = sides_arrays[0].distances, sides_arrays[1].distances
+	links = sides_arrays[0].fathers, sides_arrays[1].fathers
+	closed = sides_arrays[0].closed, sides_arrays[1].closed
+	reached[0][start] = generations[0]
+	reached[1][end] = generations[1]
+	scores[0][start] = 0
+	scores[1][end] = 0
+	signs = 1, -1
+	count = 0
+	if guided:
+		queues = [(potential(start), count, start)], [(-potential(end), count, end)]
+	else:
+		queues = [(0, count, start)], [(0, count, end)]
+
+	best_cost = float('inf')
+	meeting_cell = -1
+
+	# THE BACKWARD SIDE WOULD LEAVE THE END EVEN IF IT WERE A BARRIER, WHICH CANNOT BE ENTERED
+	# (UNLESS THE END IS THE START, THEN THE PATH IS THE START ITSELF, LIKE IN THE OTHER ENGINES):
+	if start == end:
+		return [start]
+	if weights[end] == grid.maxWeight:
+		return None
+
+	while queues[0] and queues[1]:
+		if queues[0][0][0] + queues[1][0][0] >= best_cost:
+			break
+
+		side = 0 if len(queues[0]) <= len(queues[1]) else 1
+		current = heapq.heappop(queues[side])[2]
+
+		# SKIPPING OUTDATED ENTRIES (THE NODE HAS ALREADY BEEN EXPANDED BY THIS SIDE WITH A BETTER SCORE):
+		generation, other_generation = generations[side], generations[1 - side]
+		if closed[side][current] == generation:
+			continue
+		closed[side][current] = generation
+
+		search.expansionsCount += 1
+		change_state(current, ACTIVE)
+		own_reached, other_reached = reached[side], reached[1 - side]
+		own_scores, other_scores = scores[side], scores[1 - side]
+		score = own_scores[current]
+		for neighbor in grid.get_neighbors(current):
+			if not weighted:
+				candidate_score = score + 1
+			elif side == 0:
+				candidate_score = score + weights[neighbor]
+			else:
+				candidate_score = score + weights[current]
+
+			if own_reached[neighbor] != generation or candidate_score < own_scores[neighbor]:
+				own_reached[neighbor] = generation
+				own_scores[neighbor] = candidate_score
+				links[side][neighbor] = current
+				count += 1
+				key = candidate_score + signs[side] * potential(neighbor) if guided else candidate_score
+				heapq.heappush(queues[side], (key, count, neighbor))
+				change_state(neighbor, IN_QUEUE)
+
+			if other_reached[neighbor] == other_generation and candidate_score + other_scores[neighbor] < best_cost:
+				best_cost = candidate_score + other_scores[neighbor]
+				meeting_cell = neighbor
+
+		yield
+		change_state(current, CLOSED)
+
+	if meeting_cell == -1:
+		return None
+
+	# STITCHING BOTH HALVES: THE BACKWARD HALF IS TURNED INTO FATHERS FROM THE MEETING NODE TO THE END:
+	fathers, sons = links
+	cell = meeting_cell
+	while cell != end:
+		fathers[sons[cell]] = cell
+		cell = sons[cell]
+	return reconstruct_path(fathers, start, end)
+
+
+def bidirectional_bfs(search):
+	return (yield from bidirectional_search(search, weighted=False, guided=False))
+
+
+def bidirectional_dijkstra(search):
+	return (yield from bidirectional_search(search, weighted=True, guided=False))
+
+
+def bidirectional_a_star(search):
+	return (yield from bidirectional_search(search, weighted=True, guided=True))
+
+
+def lpa_star(search):
+	"""
+	LIFELONG PLANNING A*: REUSES search.planner (IF GIVEN), SO ONLY NODES AFFECTED BY CHANGES SINCE ITS LAST SEARCH
+	ARE EXPANDED, OTHERWISE IT PLANS FROM SCRATCH (EXPANDING ABOUT AS MANY NODES AS A*)
+	"""
+	from .lpa import LPAStar
+	planner = search.planner
+	if planner is None:
+		planner = LPAStar(search.grid, search.startPos, search.endPos)
+	else:
+		planner.set_endpoints(search.startPos, search.endPos)
+	return (yield from planner.compute_shortest_path(search))
+
+
+def hpa_star(search):
+	"""
+	HIERARCHICAL PATH-FINDING: REUSES search.planner (IF GIVEN) AS THE CACHED ClusterAbstraction OF THE GRID
+	"""
+	from .hpa import ClusterAbstraction
+	abstraction = search.planner
+	if abstraction is None:
+		abstraction = ClusterAbstraction(search.grid)
+	return (yield from abstraction.find_path(search))
+
+
+def alt_a_star(search):
+	"""
+	A* WITH THE ALT (LANDMARKS) HEURISTIC: REUSES search.planner (IF GIVEN) AS THE Landmarks OF THE GRID,
+	OTHERWISE THEY ARE READ FROM THE DISK CACHE OR COMPUTED FIRST
+	"""
+	from .alt import Landmarks
+	landmarks = search.planner
+	if landmarks is None:
+		landmarks = Landmarks(search.grid)
+	return (yield from a_star(search, landmarks.get_heuristic(search.end)))
+
+
+# NEW ALGORITHMS CAN BE ADDED HERE, THE REST OF THE CODE DOESN'T NEED TO BE CHANGED:
+ALGORITHMS = {
+	'BFS': bfs,
+	'DFS': dfs,
+	'DIJKSTRA': dijkstra,
+	'A*': a_star,
+	'ALT': alt_a_star,
+	'JPS': jump_point_search,
+	'BI-BFS': bidirectional_bfs,
+	'BI-DIJKSTRA': bidirectional_dijkstra,
+	'BI-A*': bidirectional_a_star,
+	'LPA*': lpa_star,
+	'HPA*': hpa_star
+}
+
+
+def wavefront_bfs(search):
+	from .wavefront import wavefront
+	return (yield from wavefront(search))
+
+
+# THE WAVEFRONT BFS NEEDS NUMPY, SO IT IS AVAILABLE ONLY IF NUMPY IS INSTALLED (AND IS IMPORTED ONLY WHEN USED):
+if importlib.util.find_spec('numpy') is not None:
+	ALGORITHMS['WAVEFRONT'] = wavefront_bfs
+
+
+def ignore_state_change(cell, state):
+	pass
+
+
+class Search:
+	"""
+	STEP-BY-STEP PATH-FINDING PROCESS ON A Grid.
+	EVERY make_step CALL ADVANCES THE ALGORITHM'S GENERATOR BY ONE EXPANSION,
+	AFTER THE END IS FOUND IT COLORS ONE NODE OF THE PATH PER CALL.
+
+	THE SEARCH DOESN'T RENDER ANYTHING. EVERY TIME A NODE CHANGES ITS STATE (ACTIVE, IN_QUEUE, CLOSED, IN_PATH)
+	THE on_state_change FUNCTION (IF GIVEN) IS CALLED WITH THE CELL ID AND THE NEW STATE CODE.
+	START AND END NODES NEVER CHANGE THEIR STATES.
+
+	planner IS A STRUCTURE KEPT BETWEEN SEARCHES AND UPDATED AFTER EDITS: AN LPAStar FOR LPA* (WHICH REPAIRS ONLY WHAT
+	HAS CHANGED SINCE ITS LAST SEARCH), A ClusterAbstraction FOR HPA* (WHICH CACHES THE ABSTRACT GRAPH)
+	OR Landmarks FOR ALT (WHICH KEEP THEIR DISTANCE FIELDS).
+
+	arrays ARE SearchArrays OF THE SIZE OF THE GRID, REUSED BY CONSECUTIVE SEARCHES, SO STARTING A SEARCH DOESN'T
+	ALLOCATE OR CLEAR ANYTHING OF THE SIZE OF THE GRID (ONLY ONE SEARCH AT A TIME MAY USE THEM). IF THEY AREN'T GIVEN,
+	NEW ONES ARE CREATED.
+	"""
+
+	def __init__(self, grid, start_pos, end_pos, algorithm='BFS', on_state_change=None, planner=None, arrays=None):
+		assert algorithm in ALGORITHMS, "ERROR: class Search: unknown algorithm: " + str(algorithm)
+		if arrays is None:
+			arrays = SearchArrays(grid.get_cells_count())
+		info = "ERROR: class Search: __init__ function: following condition isn't met: arrays.cellsCount == cells count"
+		assert arrays.cellsCount == grid.get_cells_count(), info
+		self.grid = grid
+		self.startPos = tuple(start_pos)
+		self.endPos = tuple(end_pos)
+		self.start = grid.get_id(*start_pos)
+		self.end = grid.get_id(*end_pos)
+		self.algorithm = algorithm
+		self.onStateChange = on_state_change
+		self.planner = planner
+		if on_state_change is None:
+			self.change_state = ignore_state_change
+		self.arrays = arrays
+		self.arrays.reset()
+		self.fathers = arrays.fathers
+		self.expansionsCount = 0
+		self.steps = ALGORITHMS[algorithm](self)
+		self.searchIsDone = False
+		self.pathCells = None
+		self.currentlyConsideredPathIndex = None
+		self.pathIsDone = False
+
+	# "PRIVATE" METHODS (ARE USED ONLY BY OTHER METHODS OF THIS CLASS AND BY THE ALGORITHMS):
+	def change_state(self, cell, state):
+		if cell != self.start and cell != self.end:
+			self.onStateChange(cell, state)
+
+	def make_path_step(self):
+		if self.currentlyConsideredPathIndex is None:
+			self.currentlyConsideredPathIndex = len(self.pathCells) - 1
+		self.currentlyConsideredPathIndex -= 1
+		if self.currentlyConsideredPathIndex <= 0:
+			self.pathIsDone = True
+			return
+		self.change_state(self.pathCells[self.currentlyConsideredPathIndex], IN_PATH)
+
+	# ACCESSORS:
+	@property
+	def endFound(self):
+		return self.pathCells is not None
+
+	def is_done(self):
+		"""
+		RETURNS TRUE IF ANOTHER CALL OF make_step FUNCTION WOULDN'T CHANGE ANYTHING.
+		IN OTHER WORDS,
+		RETURNS TRUE IF PATH HAS BEEN FOUND OR IF PATH-FINDING PROCESS HAS FAILED, BECAUSE THERE IS NO PATH BETWEEN
+		START AND END NODE.
+		"""
+
+		if self.endFound:
+			return self.pathIsDone
+		return self.searchIsDone
+
+	def get_path_cells(self):
+		"""
+		RETURNS THE FOUND PATH AS A LIST OF CELL IDS FROM START TO END (BOTH INCLUDED),
+		OR PYTHONIC None IF THE END HASN'T BEEN FOUND (YET)
+		"""
+		return self.pathCells
+
+	def get_path(self):
+		"""
+		RETURNS THE FOUND PATH AS A LIST OF (COLUMN, ROW) POSITIONS FROM START TO END (BOTH INCLUDED),
+		OR PYTHONIC None IF THE END HASN'T BEEN FOUND (YET)
+		"""
+		if self.pathCells is None:
+			return None
+		return [self.grid.get_position(cell) for cell in self.pathCells]
+
+	# OTHER METHODS:
+	def make_step(self):
+		"""
+		MAKE ANOTHER STEP IN PATH-FINDING PROCESS
+		"""
+
+		if not self.searchIsDone:
+			try:
+				next(self.steps)
+			except StopIteration as stop:
+				self.searchIsDone = True
+				self.pathCells = stop.value
+		elif self.endFound and not self.pathIsDone:
+			self.make_path_step()
+
+	def finish_search(self):
+		"""
+		RUNS THE ALGORITHM TO THE END (WITHOUT COLORING THE PATH) AND RETURNS THE FOUND PATH AS A LIST OF CELL IDS,
+		OR PYTHONIC None IF THERE IS NO PATH
+		"""
+		if not self.searchIsDone:
+			steps = self.steps
+			try:
+				while True:
+					next(steps)
+			except StopIteration as stop:
+				self.pathCells = stop.value
+			self.searchIsDone = True
+		return self.pathCells
+
+
+class SearchResult:
+	def __init__(self, path, cost, expansions_count):
+		self.path = path
+		self.cost = cost
+		self.expansionsCount = expansions_count
+
+	def found(self):
+		"""
+		RETURNS TRUE IF THE PATH BETWEEN START AND END EXISTS
+		"""
+		return self.path is not None
+
+
+def path_cost(grid, path):
+	"""
+	RETURNS THE COST OF THE PATH GIVEN AS A LIST OF (COLUMN, ROW) POSITIONS.
+	THE WEIGHT OF A NODE IS PAID ON ENTERING IT, SO THE START NODE IS FREE.
+	"""
+	return sum(grid.get_weight(x, y) for x, y in path[1:])
+
+
+def solve(grid, start, end, algorithm='BFS'):
+	"""
+	RUNS THE WHOLE PATH-FINDING PROCESS AT ONCE AND RETURNS A SearchResult
+	"""
+
+	search = Search(grid, start, end, algorithm)
+	search.finish_search()
+	path = search.get_path()
+	cost = path_cost(grid, path) if path is not None else None
+	return SearchResult(path, cost, search.expansionsCount)
@@ -0,0 +1,73 @@
+"""
+SHARING ONE GRID BETWEEN PROCESSES WITHOUT COPYING IT.
+
+THE WEIGHTS AND THE ADJACENCY OF A GRID ARE PUBLISHED ONCE IN A BLOCK OF multiprocessing.shared_memory.
+OTHER PROCESSES GET ONLY A SMALL DESCRIPTOR (THE NAME OF THE BLOCK, SIZE, WEIGHT RANGE, START, END AND WHETHER
+THE WEIGHTS HAVE BEEN READ FROM A FILE) AND ATTACH TO THE BLOCK READ-ONLY, SO EVERY WORKER HOLDS ONLY ITS OWN STATES
+AND SEARCH ARRAYS, WHATEVER THE SIZE OF THE MAP:
+
+	with SharedGrid(grid) as shared:
+		executor = ProcessPoolExecutor(initializer=init, initargs=(shared.descriptor,))
+		...
+
+	def init(descriptor):
+		grid = attach_grid(descriptor)
+"""
+
+from multiprocessing import shared_memory
+
+from .grid import Grid
+
+# Blocks attached by this process, they have to stay open as long as their grids are used:
+attached_blocks = {}
+
+
+class SharedGrid:
+	"""
+	OWNER OF THE SHARED MEMORY BLOCK WITH THE WEIGHTS AND THE LINKS OF A GRID. THE BLOCK IS REMOVED BY close.
+	LATER CHANGES OF THE GRID AREN'T PUBLISHED, THE BLOCK IS A SNAPSHOT.
+	"""
+
+	def __init__(self, grid):
+		cells_count = grid.get_cells_count()
+		self.block = shared_memory.SharedMemory(create=True, size=max(2 * cells_count, 1))
+		self.block.buf[:cells_count] = grid.weights
+		self.block.buf[cells_count:2 * cells_count] = grid.links
+		start = grid.get_id(*grid.startPos) if grid.startPos is not None else -1
+		end = grid.get_id(*grid.endPos) if grid.endPos is not None else -1
+		self.descriptor = (
+			self.block.name, grid.columnsCount, grid.rowsCount, grid.minWeight, grid.maxWeight, start, end,
+			grid.is_loaded()
+		)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exception):
+		self.close()
+
+	def close(self):
+		self.block.close()
+		self.block.unlink()
+
+
+def attach_grid(descriptor):
+	"""
+	RETURNS A NEW Grid WHICH WEIGHTS AND LINKS ARE READ-ONLY VIEWS OF THE SHARED BLOCK DESCRIBED BY descriptor
+	(SharedGrid.descriptor). NOTHING IS COPIED, ONLY THE STATES OF THE GRID ARE ALLOCATED.
+	CHANGING WEIGHTS OF SUCH A GRID RAISES TypeError.
+	"""
+	name, columns_count, rows_count, min_weight, max_weight, start, end, loaded = descriptor
+	if name not in attached_blocks:
+		attached_blocks[name] = shared_memory.SharedMemory(name=name)
+	cells_count = columns_count * rows_count
+	buffer = attached_blocks[name].buf
+	weights = buffer[:cells_count].toreadonly()
+	links = buffer[cells_count:2 * cells_count].toreadonly()
+
+	grid = Grid(columns_count, rows_count, min_weight, max_weight, weights=weights, links=links)
+	if loaded:
+		grid.mark_loaded()
+	if start != -1 and end != -1:
+		grid.set_endpoints(grid.get_position(start), grid.get_position(end))
+	return grid
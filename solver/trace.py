@@ -0,0 +1,166 @@
+from array import array
+import struct
+import zlib
+
+from .search import Search
+
+TRACE_MAGIC = b'PFVT'
+# magic, columns count, rows count, start cell, end cell, weights checksum, algorithm, event size, events count:
+TRACE_HEADER = struct.Struct('<4sIIIII16sIQ')
+
+# every event is packed as: cell << 6 | previous state << 3 | new state
+STATE_BITS = 3
+STATE_MASK = (1 << STATE_BITS) - 1
+
+
+def weights_checksum(grid):
+	"""
+	RETURNS THE CRC32 OF THE GRID WEIGHTS, USED TO CHECK IF A TRACE HAS BEEN RECORDED ON THE SAME MAP
+	"""
+	return zlib.crc32(bytes(grid.weights))
+
+
+class Trace:
+	"""
+	COMPACT RECORD OF A WHOLE PATH-FINDING PROCESS.
+	EVERY EVENT (CELL ID, PREVIOUS STATE, NEW STATE) IS PACKED INTO A SINGLE UNSIGNED INTEGER OF AN array,
+	SO THE PROCESS CAN BE REPLAYED FORWARDS AND BACKWARDS WITHOUT RUNNING THE SEARCH AGAIN.
+	"""
+
+	def __init__(self, columns_count, rows_count, start, end, algorithm, checksum):
+		self.columnsCount = columns_count
+		self.rowsCount = rows_count
+		self.start = start
+		self.end = end
+		self.algorithm = algorithm
+		self.checksum = checksum
+		self.events = array('I' if columns_count * rows_count < 1 << (32 - 2 * STATE_BITS) else 'Q')
+
+	def __len__(self):
+		return len(self.events)
+
+	# Accessors:
+	def get_event(self, index):
+		"""
+		RETURNS THE EVENT WITH THE GIVEN INDEX AS A TUPLE (CELL ID, PREVIOUS STATE, NEW STATE)
+		"""
+		event = self.events[index]
+		return event >> 2 * STATE_BITS, event >> STATE_BITS & STATE_MASK, event & STATE_MASK
+
+	def matches(self, grid):
+		"""
+		RETURNS TRUE IF THE TRACE HAS BEEN RECORDED ON A GRID WITH THE SAME SIZE AND WEIGHTS
+		"""
+		return (
+			self.columnsCount == grid.columnsCount and self.rowsCount == grid.rowsCount and
+			self.checksum == weights_checksum(grid)
+		)
+
+	# Mutators:
+	def record(self, cell, previous_state, state):
+		self.events.append(cell << 2 * STATE_BITS | previous_state << STATE_BITS | state)
+
+	# Files:
+	def save(self, file_path):
+		with open(file_path, "wb") as file:
+			file.write(
+				TRACE_HEADER.pack(
+					TRACE_MAGIC, self.columnsCount, self.rowsCount, self.start, self.end, self.checksum,
+					self.algorithm.encode('ascii'), self.events.itemsize, len(self.events)
+				)
+			)
+			self.events.tofile(file)
+
+	@classmethod
+	def load(cls, file_path):
+		with open(file_path, "rb") as file:
+			header = TRACE_HEADER.unpack(file.read(TRACE_HEADER.size))
+			magic, columns_count, rows_count, start, end, checksum, algorithm, item_size, events_count = header
+			assert magic == TRACE_MAGIC, "ERROR: class Trace: load function: " + file_path + " is not a trace file"
+			trace = cls(columns_count, rows_count, start, end, algorithm.rstrip(b'\0').decode('ascii'), checksum)
+			assert trace.events.itemsize == item_size, "ERROR: class Trace: load function: unsupported event size"
+			trace.events.fromfile(file, events_count)
+		return trace
+
+
+def record_trace(grid, start_pos, end_pos, algorithm='BFS'):
+	"""
+	RUNS THE WHOLE PATH-FINDING PROCESS AT FULL SPEED (INCLUDING THE PATH RECONSTRUCTION) AND RETURNS ITS Trace
+	"""
+
+	start = grid.get_id(*start_pos)
+	end = grid.get_id(*end_pos)
+	trace = Trace(grid.columnsCount, grid.rowsCount, start, end, algorithm, weights_checksum(grid))
+	states = bytearray(grid.get_cells_count())
+	record = trace.record
+
+	def on_state_change(cell, state):
+		record(cell, states[cell], state)
+		states[cell] = state
+
+	search = Search(grid, start_pos, end_pos, algorithm, on_state_change)
+	while not search.is_done():
+		search.make_step()
+	return trace
+
+
+class TracePlayer:
+	"""
+	APPLIES EVENTS OF A Trace TO A BYTE ARRAY OF STATES (E.G. Grid.states), FORWARDS OR BACKWARDS.
+	position IS THE NUMBER OF CURRENTLY APPLIED EVENTS.
+	on_state_change (IF GIVEN) IS CALLED WITH THE CELL ID OF EVERY CHANGED CELL.
+	"""
+
+	def __init__(self, trace, states, on_state_change=None):
+		self.trace = trace
+		self.states = states
+		self.onStateChange = on_state_change
+		self.position = 0
+
+	def is_at_end(self):
+		return self.position == len(self.trace)
+
+	def is_at_beginning(self):
+		return self.position == 0
+
+	def step_forward(self, events_count=1):
+		"""
+		APPLIES AT MOST events_count NEXT EVENTS, RETURNS THE NUMBER OF APPLIED EVENTS
+		"""
+		events = self.trace.events
+		stop = min(len(events), self.position + events_count)
+		for index in range(self.position, stop):
+			event = events[index]
+			cell = event >> 2 * STATE_BITS
+			self.states[cell] = event & STATE_MASK
+			if self.onStateChange is not None:
+				self.onStateChange(cell)
+		applied = stop - self.position
+		self.position = stop
+		return applied
+
+	def step_backward(self, events_count=1):
+		"""
+		UNDOES AT MOST events_count PREVIOUS EVENTS, RETURNS THE NUMBER OF UNDONE EVENTS
+		"""
+		events = self.trace.events
+		stop = max(0, self.position - events_count)
+		for index in range(self.position - 1, stop - 1, -1):
+			event = events[index]
+			cell = event >> 2 * STATE_BITS
+			self.states[cell] = event >> STATE_BITS & STATE_MASK
+			if self.onStateChange is not None:
+				self.onStateChange(cell)
+		undone = self.position - stop
+		self.position = stop
+		return undone
+
+	def seek(self, position):
+		"""
+		MOVES TO THE GIVEN POSITION (THE NUMBER OF APPLIED EVENTS)
+		"""
+		position = max(0, min(len(self.trace), position))
+		if position > self.position:
+			self.step_forward(position - self.position)
+		else:
+			self.step_backward(self.position - position)
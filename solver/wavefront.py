@@ -0,0 +1,102 @@
+"""
+LEVEL-SYNCHRONOUS (WAVEFRONT) BFS ON NUMPY ARRAYS.
+
+THE WHOLE FRONTIER IS EXPANDED AT ONCE: FOR EVERY DIRECTION THE FRONTIER IS SHIFTED BY THE CELL ID OFFSET OF THAT DIRECTION,
+KEEPING ONLY CELLS WHICH ARE LINKED IN THAT DIRECTION (SEE Grid.links) AND HAVEN'T BEEN REACHED YET.
+THE COST OF A LEVEL IS PROPORTIONAL TO THE SIZE OF ITS FRONTIER, SO THE FULL DISTANCE FIELD OF A GRID WITH MILLIONS
+OF CELLS IS COMPUTED WITHOUT A PYTHON LOOP OVER NODES.
+
+THE MODULE REQUIRES NUMPY, SO IT ISN'T IMPORTED BY THE solver PACKAGE ITSELF.
+"""
+
+import numpy as np
+
+from .grid import CLOSED
+from .grid import IN_QUEUE
+from .grid import LINK_DOWN
+from .grid import LINK_LEFT
+from .grid import LINK_RIGHT
+from .grid import LINK_UP
+from .search import reconstruct_path
+
+
+def get_directions(grid):
+	"""
+	RETURNS (LINK BIT, CELL ID OFFSET) PAIRS IN THE ORDER: UP, LEFT, DOWN, RIGHT
+	"""
+	return (LINK_UP, -grid.columnsCount), (LINK_LEFT, -1), (LINK_DOWN, grid.columnsCount), (LINK_RIGHT, 1)
+
+
+def levels(grid, source):
+	"""
+	GENERATOR OF THE WAVEFRONT BFS FROM THE source CELL.
+	YIELDS (FRONTIER, DISTANCES, PARENTS) FOR EVERY LEVEL, STARTING WITH THE LEVEL 0 (ONLY THE SOURCE).
+	FRONTIER IS A NUMPY ARRAY OF CELL IDS, DISTANCES AND PARENTS ARE FLAT int32 ARRAYS (-1 MEANS NOT REACHED / NO PARENT),
+	WHICH ARE FILLED IN PLACE LEVEL BY LEVEL.
+	"""
+	links = np.frombuffer(bytes(grid.links), dtype=np.uint8)
+	distances = np.full(grid.get_cells_count(), -1, dtype=np.int32)
+	parents = np.full(grid.get_cells_count(), -1, dtype=np.int32)
+	directions = get_directions(grid)
+
+	distances[source] = 0
+	frontier = np.array([source], dtype=np.int64)
+	level = 0
+
+	while frontier.size:
+		yield frontier, distances, parents
+		level += 1
+		frontier_links = links[frontier]
+		reached = []
+		for bit, offset in directions:
+			sources = frontier[(frontier_links & bit) != 0]
+			targets = sources + offset
+			new = distances[targets] < 0
+			sources, targets = sources[new], targets[new]
+
+			# EVERY TARGET APPEARS ONLY ONCE PER DIRECTION, SO MARKING IT HERE ALSO REMOVES IT FROM THE NEXT DIRECTIONS:
+			distances[targets] = level
+			parents[targets] = sources
+			reached.append(targets)
+		frontier = np.concatenate(reached)
+
+
+def distance_field(grid, source_pos):
+	"""
+	RETURNS (DISTANCES, PARENTS) FROM THE NODE AT source_pos TO ALL NODES OF THE GRID AS int32 ARRAYS OF SHAPE
+	(rowsCount, columnsCount). DISTANCES ARE NUMBERS OF MOVES (WEIGHTS ARE IGNORED, AS IN BFS), PARENTS ARE CELL IDS
+	OF THE PREVIOUS NODES ON THE SHORTEST PATHS. BOTH ARE -1 FOR UNREACHABLE NODES.
+	"""
+	distances = parents = None
+	for _, distances, parents in levels(grid, grid.get_id(*source_pos)):
+		pass
+	shape = grid.rowsCount, grid.columnsCount
+	return distances.reshape(shape), parents.reshape(shape)
+
+
+def wavefront(search):
+	"""
+	STEP ENGINE FOR Search: EXPANDS THE WHOLE FRONTIER IN ONE STEP, SO THE VISUALIZER ANIMATES THE SEARCH LEVEL BY LEVEL
+	"""
+	change_state = search.change_state
+	previous_frontier = ()
+
+	for frontier, distances, parents in levels(search.grid, search.start):
+		for cell in previous_frontier:
+			change_state(cell, CLOSED)
+
+		if distances[search.end] >= 0:
+			fathers = search.fathers
+			cell = search.end
+			while cell != search.start:
+				fathers[cell] = parents[cell]
+				cell = int(parents[cell])
+			return reconstruct_path(fathers, search.start, search.end)
+
+		search.expansionsCount += len(frontier)
+		previous_frontier = frontier.tolist()
+		for cell in previous_frontier:
+			change_state(cell, IN_QUEUE)
+		yield
+
+	return None